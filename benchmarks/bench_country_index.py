@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Benchmark country inference over synthetic email addresses.
+
+Compares the substring scan that assign_countries.py used to run against
+the compiled DomainSuffixIndex in CountryClassifier, first with the
+organizations in config/ and then with 1,000 extra organization rules to show how each
+approach scales with the size of the registry.
+
+Usage:
+    python benchmarks/bench_country_index.py [N_EMAILS]
+"""
+
+import json
+import random
+import sys
+import time
+from pathlib import Path
+
+from newsletter_uploader.countries import CountryClassifier
+
+CONFIG_PATH = Path(__file__).parent.parent / "config" / "domain-country-mapping.json"
+ORGANIZATIONS_PATH = Path(__file__).parent.parent / "config" / "organizations.json"
+
+
+def substring_infer_country(email, tags, mappings):
+    """The previous per-member inference, kept as the baseline."""
+    domain = email.split('@')[1].lower() if '@' in email else ''
+
+    if tags:
+        tag_names = [t.lower() for t in tags]
+        for tag in mappings['tags']['us']:
+            if tag.lower() in ' '.join(tag_names):
+                return 'United States of America', f'Tag: {tag}'
+
+    if any(pattern in domain for pattern in ['.uk', '.ac.uk', '.gov.uk', '.co.uk', '.org.uk']):
+        return 'United Kingdom', 'UK domain'
+
+    if domain.endswith('.edu') or domain.endswith('.gov'):
+        return 'United States of America', 'US domain (.edu/.gov)'
+
+    if domain.endswith('.us'):
+        return 'United States of America', 'US domain (.us)'
+
+    for org in mappings['uk_organizations']:
+        if org in domain:
+            return 'United Kingdom', f'UK org: {org}'
+
+    for org in mappings['us_organizations']:
+        if org in domain:
+            return 'United States of America', f'US org: {org}'
+
+    return None, 'Unknown (generic domain)'
+
+
+def synthetic_emails(n, mappings, seed=0):
+    """Generate addresses over a realistic mix of domains."""
+    rng = random.Random(seed)
+    orgs = mappings['uk_organizations'] + mappings['us_organizations']
+    generic = ['gmail.com', 'yahoo.com', 'outlook.com', 'hotmail.co.uk', 'proton.me']
+    # Long tail of distinct generic domains, as in a real audience
+    generic += [f'company{i}.com' for i in range(5000)]
+    uk = ['ox.ac.uk', 'hmt.gov.uk', 'ifs.org.uk', 'parliament.uk']
+    us = ['senate.gov', 'mit.edu', 'state.ny.us']
+    pools = [(generic, 0.7), (orgs, 0.1), (uk, 0.1), (us, 0.1)]
+
+    emails = []
+    for i in range(n):
+        roll = rng.random()
+        for pool, weight in pools:
+            if roll < weight:
+                break
+            roll -= weight
+        domain = rng.choice(pool)
+        if pool is orgs:
+            roll = rng.random()
+            if roll < 0.2:
+                domain = f'dept.{domain}'
+            elif roll < 0.25:
+                # Contains an organization without being one (suburban.org)
+                domain = f'sub{domain}'
+        emails.append(f'user{i}@{domain}')
+    return emails
+
+
+def bench(label, fn, emails):
+    start = time.perf_counter()
+    for email in emails:
+        fn(email)
+    elapsed = time.perf_counter() - start
+    print(f'{label:28} {elapsed:7.2f}s  {len(emails) / elapsed:>12,.0f} emails/s')
+    return elapsed
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    with open(CONFIG_PATH) as f:
+        mappings = json.load(f)
+    # The baseline took per-country organization lists
+    with open(ORGANIZATIONS_PATH) as f:
+        organizations = json.load(f)['organizations']
+    for key in ('uk', 'us'):
+        mappings[f'{key}_organizations'] = [
+            org['domain'] for org in organizations if org.get('country') == key
+        ]
+
+    emails = synthetic_emails(n, mappings)
+    compare(emails, mappings)
+
+    extra = [f'org{i}.org' for i in range(1000)]
+    print(f'\nWith {len(extra):,} extra organization rules')
+    compare(emails, dict(mappings, us_organizations=mappings['us_organizations'] + extra))
+
+
+def compare(emails, mappings):
+    start = time.perf_counter()
+    classifier = CountryClassifier(mappings)
+    print(f'Compiled {len(classifier.index)} domain rules in '
+          f'{(time.perf_counter() - start) * 1000:.2f}ms')
+    print(f'Classifying {len(emails):,} synthetic emails')
+
+    baseline = bench('substring scan', lambda e: substring_infer_country(e, [], mappings), emails)
+    indexed = bench('suffix index', classifier.classify, emails)
+    print(f'Speedup: {baseline / indexed:.1f}x')
+
+    # The index only disagrees where substring matching was wrong
+    differences = {}
+    for email in emails[:100_000]:
+        old = substring_infer_country(email, [], mappings)[0]
+        new = classifier.classify(email)[0]
+        if old != new:
+            domain = email.split('@')[1]
+            differences[domain] = (old, new)
+    print(f'Domains classified differently: {len(differences)}')
+    for domain, (old, new) in sorted(differences.items())[:5]:
+        print(f'  {domain:30} {old} -> {new}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Benchmark the memory held by fetched members.
+
+Builds synthetic members endpoint pages shaped like Mailchimp's (nested
+merge_fields, location, stats, tags and _links), decodes them page by page
+as the client does, and keeps either every decoded dict (the old
+all_members list) or a MemberRecord per member. Memory is measured with
+tracemalloc.
+
+Usage:
+    python benchmarks/bench_member_records.py [N_MEMBERS]
+"""
+
+import json
+import random
+import sys
+import time
+import tracemalloc
+
+from newsletter_uploader.records import iter_records
+
+PAGE_SIZE = 1000
+
+
+def synthetic_pages(n, seed=0):
+    """Encode members as members endpoint response bodies."""
+    rng = random.Random(seed)
+    domains = ['gmail.com', 'yahoo.com', 'urban.org', 'ox.ac.uk', 'senate.gov']
+    domains += [f'company{i}.com' for i in range(2000)]
+    regions = ['DC', 'VA', 'MD', 'CA', 'NY', 'ENG', 'SCT', '']
+    countries = ['', 'United States of America', 'United Kingdom']
+    tags = ['Policy', 'Arnold Ventures SALTernative', 'UK', 'Researchers']
+
+    pages = []
+    for start in range(0, n, PAGE_SIZE):
+        members = []
+        for i in range(start, min(start + PAGE_SIZE, n)):
+            member_id = f'{i:032x}'
+            members.append({
+                'id': member_id,
+                'email_address': f'user{i}@{rng.choice(domains)}',
+                'unique_email_id': f'{i:010x}',
+                'status': 'subscribed',
+                'merge_fields': {
+                    'FNAME': f'First{i % 500}',
+                    'LNAME': f'Last{i % 800}',
+                    'COUNTRY': rng.choice(countries),
+                    'ADDRESS': '',
+                    'PHONE': '',
+                },
+                'stats': {'avg_open_rate': rng.random(), 'avg_click_rate': rng.random()},
+                'location': {
+                    'latitude': rng.uniform(-90, 90),
+                    'longitude': rng.uniform(-180, 180),
+                    'gmtoff': 0,
+                    'dstoff': 0,
+                    'country_code': rng.choice(['US', 'GB', '']),
+                    'timezone': 'America/New_York',
+                    'region': rng.choice(regions),
+                    'city': rng.choice(['Washington', 'London', 'Arlington', '']),
+                    'zip': '',
+                },
+                'timestamp_opt': '2024-01-01T00:00:00+00:00',
+                'last_changed': '2024-06-01T00:00:00+00:00',
+                'tags_count': 1,
+                'tags': [{'id': 1, 'name': rng.choice(tags)}],
+                'list_id': '71ed1f89d8',
+                '_links': [
+                    {'rel': 'self', 'href': f'https://us5.api.mailchimp.com/3.0/lists/x/members/{member_id}'},
+                    {'rel': 'parent', 'href': 'https://us5.api.mailchimp.com/3.0/lists/x/members'},
+                ],
+            })
+        pages.append(json.dumps({'members': members}))
+    return pages
+
+
+def decoded_members(pages):
+    """Decode pages one at a time, as the client does."""
+    for page in pages:
+        yield from json.loads(page)['members']
+
+
+def measure(label, build, pages):
+    tracemalloc.start()
+    start = time.perf_counter()
+    kept = build(decoded_members(pages))
+    elapsed = time.perf_counter() - start
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f'{label:16} retained {current / 2**20:8.1f} MiB   '
+          f'peak {peak / 2**20:8.1f} MiB   {elapsed:6.2f}s')
+    del kept
+    return current
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 50_000
+    pages = synthetic_pages(n)
+    print(f'Keeping {n:,} members ({len(pages)} pages)')
+
+    as_dicts = measure('dicts', list, pages)
+    as_records = measure('MemberRecord', lambda members: list(iter_records(members)), pages)
+    print(f'Records retain {as_dicts / as_records:.1f}x less memory '
+          f'({(as_dicts - as_records) / n:,.0f} bytes saved per member)')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+Benchmark offline recipient counts for every audience.
+
+Writes a snapshot of synthetic members with a mix of UK, US and missing
+COUNTRY values and statuses, then times count_recipients, which evaluates
+each audience's segment conditions against the snapshot.
+
+Usage:
+    python benchmarks/bench_segments.py [N_MEMBERS]
+"""
+
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from newsletter_uploader.segments import count_recipients
+from newsletter_uploader.snapshot import MemberSnapshot, write_snapshot
+
+
+def synthetic_members(n, seed=0):
+    rng = random.Random(seed)
+    countries = ['', '', 'United States of America', 'United Kingdom', 'Canada']
+    statuses = ['subscribed'] * 8 + ['unsubscribed', 'cleaned']
+    for i in range(n):
+        yield {
+            'id': f'{i:032x}',
+            'email_address': f'user{i}@company{rng.randrange(5000)}.com',
+            'status': rng.choice(statuses),
+            'merge_fields': {'FNAME': f'First{i % 500}', 'COUNTRY': rng.choice(countries)},
+            'location': {'region': rng.choice(['DC', 'VA', 'ENG', '']), 'country_code': ''},
+            'tags': [],
+        }
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    with tempfile.TemporaryDirectory() as directory:
+        path = Path(directory) / 'snapshot'
+        write_snapshot(synthetic_members(n), path)
+
+        with MemberSnapshot(path) as snapshot:
+            start = time.perf_counter()
+            counts = count_recipients(snapshot)
+            elapsed = time.perf_counter() - start
+
+    print(f'Counted recipients for {n:,} members in {elapsed * 1000:.1f} ms')
+    for audience, count in counts.items():
+        print(f'  {audience.value.upper():<4} {count:>9,}')
+
+
+if __name__ == '__main__':
+    main()
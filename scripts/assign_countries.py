@@ -2,66 +2,79 @@
 """
 Assign countries to Mailchimp subscribers based on email domains and tags.
 
-Uses domain-country-mapping.json for organization-specific mappings.
+Uses config/organizations.json for organization domains and
+config/domain-country-mapping.json for tags.
+Organization domains match whole labels (urban.org matches
+research.urban.org but not suburban.org) and the most specific rule wins.
+Domain classifications are cached between runs (in $NEWSLETTER_CACHE_DIR,
+default ~/.cache/newsletter-uploader) until either file changes.
+
+Pass --dry-run to only write the plan of changes to assign_countries.plan.json
+(or $MAILCHIMP_PLAN) for review, without sending any writes; rerun with
+--apply-plan to apply the reviewed plan.
+
+Every planned update and its outcome is journaled to
+assign_countries.journal (or $MAILCHIMP_JOURNAL). If a run is interrupted,
+rerun with --resume to send only the updates that have not succeeded,
+without re-fetching the audience.
+
+A snapshot reused through $MAILCHIMP_SNAPSHOT must be at most
+$MAILCHIMP_SNAPSHOT_MAX_AGE hours old (default 1), so the plan is not based
+on COUNTRY values that have changed since; rebuild it with
+build_snapshot.py otherwise.
+
+Pass --batch to send all updates as one /batches submission instead of
+one request per subscriber. Without it, updates are sent concurrently over
+the client's connection pool.
 """
 
-import json
 import os
 import sys
-import requests
+from datetime import timedelta
 from pathlib import Path
 
+from newsletter_uploader.batches import run_batch
+from newsletter_uploader.classification import open_domain_classifier
+from newsletter_uploader.executor import MemberWriteExecutor, format_progress
+from newsletter_uploader.journal import WriteJournal
+from newsletter_uploader.mailchimp_client import MailchimpClient
+from newsletter_uploader.planner import (
+    MemberChange,
+    Plan,
+    apply_changes,
+    change_operations,
+)
+from newsletter_uploader.reports import CountryAssignmentReport, ReportEngine
+from newsletter_uploader.snapshot import load_snapshot
+from newsletter_uploader.store import iter_list_members
 
-def load_mappings():
-    """Load domain-country mappings from config file."""
-    config_path = Path(__file__).parent / "config" / "domain-country-mapping.json"
-    with open(config_path) as f:
-        return json.load(f)
 
+CONFIG_PATH = Path(__file__).parent.parent / "config" / "domain-country-mapping.json"
+ORGANIZATIONS_PATH = Path(__file__).parent.parent / "config" / "organizations.json"
 
-def infer_country(email, tags, mappings):
-    """
-    Infer country from email domain and tags.
+# Oldest reused snapshot to plan writes from
+MAX_SNAPSHOT_AGE = timedelta(hours=float(os.getenv("MAILCHIMP_SNAPSHOT_MAX_AGE", "1")))
 
-    Args:
-        email: Email address
-        tags: List of tag names
-        mappings: Domain-country mapping configuration
 
-    Returns:
-        Tuple of (country, reason) or (None, reason) if can't determine
-    """
-    domain = email.split('@')[1].lower() if '@' in email else ''
+def plan_updates(client, classifier):
+    """Plan COUNTRY for subscribers that do not have one yet."""
+    print("Loading subscribed members...")
+    snapshot = load_snapshot(
+        lambda: iter_list_members(client, os.getenv("MAILCHIMP_MEMBER_STORE")),
+        os.getenv("MAILCHIMP_SNAPSHOT"),
+        max_age=MAX_SNAPSHOT_AGE,
+    )
+    print(f"Found {snapshot.count(status='subscribed')} subscribed members\n")
 
-    # Check tags first
-    if tags:
-        tag_names = [t.lower() for t in tags]
-        for tag in mappings['tags']['us']:
-            if tag.lower() in ' '.join(tag_names):
-                return 'United States of America', f'Tag: {tag}'
+    # Only members without a country are visited
+    report = CountryAssignmentReport(classifier)
+    ReportEngine([report]).run(snapshot)
+    snapshot.close()
 
-    # Clear UK domain patterns
-    if any(pattern in domain for pattern in ['.uk', '.ac.uk', '.gov.uk', '.co.uk', '.org.uk']):
-        return 'United Kingdom', 'UK domain'
+    # Show summary and examples
+    print('\n'.join(report.summary()))
 
-    # Clear US domain patterns
-    if domain.endswith('.edu') or domain.endswith('.gov'):
-        return 'United States of America', 'US domain (.edu/.gov)'
-
-    if domain.endswith('.us'):
-        return 'United States of America', 'US domain (.us)'
-
-    # Check UK organizations (non-obvious TLDs)
-    for org in mappings['uk_organizations']:
-        if org in domain:
-            return 'United Kingdom', f'UK org: {org}'
-
-    # Check US organizations (non-obvious TLDs)
-    for org in mappings['us_organizations']:
-        if org in domain:
-            return 'United States of America', f'US org: {org}'
-
-    return None, 'Unknown (generic domain)'
+    return report.plan(client.list_id)
 
 
 def main():
@@ -70,77 +83,41 @@ def main():
         print("Error: MAILCHIMP_API_KEY not set")
         return 1
 
-    BASE_URL = f"https://{API_KEY.split('-')[-1]}.api.mailchimp.com/3.0"
     LIST_ID = "71ed1f89d8"
 
-    # Load mappings
-    mappings = load_mappings()
-
-    print("Fetching all subscribers...")
-    offset = 0
-    all_members = []
-
-    while True:
-        response = requests.get(
-            f"{BASE_URL}/lists/{LIST_ID}/members?count=1000&offset={offset}",
-            auth=("anystring", API_KEY)
-        )
-
-        if response.status_code != 200:
-            break
-
-        data = response.json()
-        members = data.get("members", [])
-
-        if not members:
-            break
-
-        all_members.extend(members)
-
-        if len(members) < 1000:
-            break
-        offset += 1000
-
-    print(f"Found {len(all_members)} total members\n")
-
-    # Analyze what needs updating
-    needs_update = []
-    for member in all_members:
-        if member['status'] != 'subscribed':
-            continue
-
-        current_country = member.get('merge_fields', {}).get('COUNTRY', '').strip()
-        if current_country:
-            continue  # Already has country
-
-        tags = [t['name'] for t in member.get('tags', [])]
-        inferred_country, reason = infer_country(member['email_address'], tags, mappings)
-
-        if inferred_country:
-            needs_update.append({
-                'id': member['id'],
-                'email': member['email_address'],
-                'country': inferred_country,
-                'reason': reason
-            })
+    client = MailchimpClient(api_key=API_KEY, list_id=LIST_ID)
+    journal = WriteJournal(os.getenv("MAILCHIMP_JOURNAL", "assign_countries.journal"))
+    plan_path = os.getenv("MAILCHIMP_PLAN", "assign_countries.plan.json")
 
-    # Show summary
-    uk_updates = [u for u in needs_update if 'United Kingdom' in u['country']]
-    us_updates = [u for u in needs_update if 'United States' in u['country']]
-
-    print(f"Can assign country to {len(needs_update)} subscribers:\n")
-    print(f"  UK: {len(uk_updates)}")
-    print(f"  US: {len(us_updates)}")
-    print(f"  Unassigned: {len([m for m in all_members if m['status'] == 'subscribed']) - len(needs_update) - len([m for m in all_members if m['status'] == 'subscribed' and m.get('merge_fields', {}).get('COUNTRY', '').strip()])}")
-
-    # Show examples
-    print(f"\nUK examples:")
-    for u in uk_updates[:5]:
-        print(f"  {u['email']:45} | {u['reason']}")
-
-    print(f"\nUS examples:")
-    for u in us_updates[:5]:
-        print(f"  {u['email']:45} | {u['reason']}")
+    if '--resume' in sys.argv:
+        if not journal.exists():
+            print(f"Error: no journal at {journal.path} to resume")
+            return 1
+        summary = journal.load()
+        changes = [MemberChange.from_dict(item) for item in journal.pending()]
+        print(f"Resuming job from {journal.created}")
+        print(f"  Succeeded: {summary.succeeded}/{summary.planned}")
+        print(f"  Remaining: {len(changes)} ({summary.failed} previously failed)")
+    elif '--apply-plan' in sys.argv:
+        plan = Plan.load(plan_path)
+        if plan.list_id != LIST_ID:
+            print(f"Error: {plan_path} was planned for list {plan.list_id}")
+            return 1
+        changes = plan.changes
+        print(f"Loaded {len(changes)} changes from {plan_path} (planned {plan.created})")
+    else:
+        try:
+            with open_domain_classifier(CONFIG_PATH, ORGANIZATIONS_PATH) as classifier:
+                plan = plan_updates(client, classifier)
+        except ValueError as e:
+            print(f"Error: {e}")
+            return 1
+        changes = plan.changes
+        if '--dry-run' in sys.argv:
+            plan.save(plan_path)
+            print(f"\nDry run: plan written to {plan_path}, nothing was sent.")
+            print("Review it, then rerun with --apply-plan to apply it.")
+            return 0
 
     # Ask for confirmation
     print(f"\n{'='*70}")
@@ -148,7 +125,7 @@ def main():
     # Check for --yes flag
     if '--yes' not in sys.argv:
         try:
-            response = input(f"Update {len(needs_update)} subscribers? (yes/no): ")
+            response = input(f"Update {len(changes)} subscribers? (yes/no): ")
             if response.lower() != 'yes':
                 print("Cancelled.")
                 return 0
@@ -156,37 +133,57 @@ def main():
             print("\nError: Interactive input not available. Use --yes flag to confirm.")
             return 1
     else:
-        print(f"Auto-confirming update of {len(needs_update)} subscribers (--yes flag)")
+        print(f"Auto-confirming update of {len(changes)} subscribers (--yes flag)")
+
+    if '--resume' not in sys.argv:
+        journal.begin(change.to_dict() for change in changes)
+    print(f"Journaling to {journal.path} (rerun with --resume if interrupted)")
 
     # Perform updates
     print("\nUpdating subscribers...")
     success = 0
     failed = 0
 
-    for update in needs_update:
-        update_response = requests.patch(
-            f"{BASE_URL}/lists/{LIST_ID}/members/{update['id']}",
-            auth=("anystring", API_KEY),
-            json={
-                "merge_fields": {
-                    "COUNTRY": update['country']
-                }
-            }
-        )
-
-        if update_response.status_code == 200:
-            success += 1
-            if success % 50 == 0:
-                print(f"  Updated {success}/{len(needs_update)}...")
-        else:
-            failed += 1
-            print(f"  Failed: {update['email']}")
+    if '--batch' in sys.argv:
+        emails = {change.id: change.email for change in changes}
+
+        def show_progress(batch):
+            print(f"  Batch {batch['status']}: {batch['finished_operations']}/{batch['total_operations']}")
+
+        operations = change_operations(LIST_ID, changes)
+        for result in run_batch(client, operations, on_progress=show_progress):
+            journal.record(result.operation_id, result.ok, result.error)
+            if result.ok:
+                success += 1
+            else:
+                failed += 1
+                print(f"  Failed: {emails[result.operation_id]} ({result.error})")
+    else:
+        def record(result):
+            journal.record(result.item.id, result.ok, str(result.error or ''))
+
+        def show_progress(progress):
+            print(f"  Progress: {format_progress(progress)}")
+
+        executor = MemberWriteExecutor(on_progress=show_progress, progress_interval=5.0)
+        for result in apply_changes(client, changes, executor, on_result=record):
+            if result.ok:
+                success += 1
+            else:
+                failed += 1
+                print(f"  Failed: {result.item.email} ({result.error})")
+    journal.close()
+
+    uk_updates = [c for c in changes if c.merge_fields['COUNTRY'] == 'United Kingdom']
+    us_updates = [c for c in changes if 'United States' in c.merge_fields['COUNTRY']]
 
     print(f"\n✅ Complete!")
     print(f"   Success: {success}")
     print(f"   Failed: {failed}")
     print(f"\n   UK subscribers: {len(uk_updates)}")
     print(f"   US subscribers: {len(us_updates)}")
+    if failed:
+        print(f"\n   Rerun with --resume to retry the failures")
 
     return 0
 
@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+"""
+Build a columnar member snapshot for the extraction scripts.
+
+Writes subscribed members to the directory named by MAILCHIMP_SNAPSHOT
+(or the first argument). Scripts run with the same MAILCHIMP_SNAPSHOT
+reuse it instead of fetching the audience again; rerun this script to
+refresh it.
+"""
+
+import os
+import sys
+
+from newsletter_uploader.mailchimp_client import MailchimpClient
+from newsletter_uploader.snapshot import write_snapshot
+from newsletter_uploader.store import iter_list_members
+
+
+def main():
+    API_KEY = os.getenv("MAILCHIMP_API_KEY")
+    if not API_KEY:
+        print("Error: MAILCHIMP_API_KEY not set")
+        return 1
+
+    LIST_ID = "71ed1f89d8"
+
+    path = sys.argv[1] if len(sys.argv) > 1 else os.getenv("MAILCHIMP_SNAPSHOT")
+    if not path:
+        print("Error: pass a snapshot directory or set MAILCHIMP_SNAPSHOT")
+        return 1
+
+    client = MailchimpClient(api_key=API_KEY, list_id=LIST_ID)
+
+    print("Fetching subscribed members...")
+    rows = write_snapshot(
+        iter_list_members(client, os.getenv("MAILCHIMP_MEMBER_STORE")), path
+    )
+
+    print(f"\n✅ Wrote snapshot of {rows} members to {path}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
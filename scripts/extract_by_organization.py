@@ -4,48 +4,27 @@ Extract subscribers grouped by organization (email domain).
 
 Shows organization (domain) and individual location data.
 Useful for finding DC-based organizations and their employees.
+DC-based organizations are listed in config/organizations.json (marked
+"dc"); subdomains match their organization.
+Rows are written to the CSV as they are produced; pass --gzip or --zstd
+(needs the zstandard package) to compress it.
+Run scripts/run_reports.py to produce this alongside the other reports
+from a single scan.
 """
 
 import os
-import requests
-import csv
-from datetime import datetime
-from collections import defaultdict
-
-
-# Known DC-based think tanks and organizations (add more as needed)
-DC_ORGANIZATIONS = {
-    # Think tanks
-    'americanprogress.org': 'Center for American Progress',
-    'aei.org': 'American Enterprise Institute',
-    'brookings.edu': 'Brookings Institution',
-    'cato.org': 'Cato Institute',
-    'cbpp.org': 'Center on Budget and Policy Priorities',
-    'cepr.net': 'Center for Economic and Policy Research',
-    'heritage.org': 'Heritage Foundation',
-    'urban.org': 'Urban Institute',
-    'taxfoundation.org': 'Tax Foundation',
-    'americanactionforum.org': 'American Action Forum',
-    'thirdway.org': 'Third Way',
-    'newamerica.org': 'New America',
-    'americanprogress.org': 'Center for American Progress',
-    'progressivepolicy.org': 'Progressive Policy Institute',
-    'niskanencenter.org': 'Niskanen Center',
-    'crfb.org': 'Committee for a Responsible Federal Budget',
-    'itep.org': 'Institute on Taxation and Economic Policy',
-    # Government
-    'treasury.gov': 'U.S. Department of the Treasury',
-    'irs.gov': 'Internal Revenue Service',
-    'cbo.gov': 'Congressional Budget Office',
-    'gao.gov': 'Government Accountability Office',
-    'frb.gov': 'Federal Reserve Board',
-    'house.gov': 'U.S. House of Representatives',
-    'senate.gov': 'U.S. Senate',
-    # Universities with DC presence
-    'georgetown.edu': 'Georgetown University',
-    'gwu.edu': 'George Washington University',
-    'american.edu': 'American University',
-}
+import sys
+from pathlib import Path
+
+from newsletter_uploader.classification import open_domain_classifier
+from newsletter_uploader.mailchimp_client import MailchimpClient
+from newsletter_uploader.reports import OrganizationReport, ReportEngine
+from newsletter_uploader.snapshot import load_snapshot
+from newsletter_uploader.store import iter_list_members
+
+
+CONFIG_PATH = Path(__file__).parent.parent / "config" / "domain-country-mapping.json"
+ORGANIZATIONS_PATH = Path(__file__).parent.parent / "config" / "organizations.json"
 
 
 def main():
@@ -54,109 +33,32 @@ def main():
         print("Error: MAILCHIMP_API_KEY not set")
         return 1
 
-    BASE_URL = f"https://{API_KEY.split('-')[-1]}.api.mailchimp.com/3.0"
     LIST_ID = "71ed1f89d8"
 
-    print("Fetching all subscribers...")
-    offset = 0
-    all_members = []
-
-    while True:
-        response = requests.get(
-            f"{BASE_URL}/lists/{LIST_ID}/members?count=1000&offset={offset}",
-            auth=("anystring", API_KEY)
-        )
-
-        if response.status_code != 200:
-            print(f"Error: {response.status_code}")
-            print(response.text)
-            break
-
-        data = response.json()
-        members = data.get("members", [])
-
-        if not members:
-            break
-
-        all_members.extend(members)
-
-        if len(members) < 1000:
-            break
-        offset += 1000
+    client = MailchimpClient(api_key=API_KEY, list_id=LIST_ID)
+    compression = 'gzip' if '--gzip' in sys.argv else 'zstd' if '--zstd' in sys.argv else None
 
-    print(f"Found {len(all_members)} total members\n")
+    print("Loading subscribed members...")
+    snapshot = load_snapshot(
+        lambda: iter_list_members(client, os.getenv("MAILCHIMP_MEMBER_STORE")),
+        os.getenv("MAILCHIMP_SNAPSHOT"),
+    )
+    print(f"Found {len(snapshot)} members (snapshot from {snapshot.created})\n")
 
-    # Group by organization (domain)
-    org_subscribers = defaultdict(list)
-
-    for member in all_members:
-        if member['status'] != 'subscribed':
-            continue
-
-        email = member['email_address']
-        domain = email.split('@')[-1].lower()
-
-        location = member.get('location', {})
-
-        subscriber_info = {
-            'email': email,
-            'name': f"{member.get('merge_fields', {}).get('FNAME', '')} {member.get('merge_fields', {}).get('LNAME', '')}".strip(),
-            'country_code': location.get('country_code', ''),
-            'region': location.get('region', '').upper(),
-            'country': member.get('merge_fields', {}).get('COUNTRY', ''),
-        }
-
-        org_subscribers[domain].append(subscriber_info)
-
-    # Filter for DC-based organizations
-    dc_org_subscribers = []
-
-    for domain, subscribers in org_subscribers.items():
-        if domain in DC_ORGANIZATIONS:
-            org_name = DC_ORGANIZATIONS[domain]
-            for sub in subscribers:
-                sub['organization'] = org_name
-                sub['org_domain'] = domain
-                dc_org_subscribers.append(sub)
-
-    # Sort by organization, then by name
-    dc_org_subscribers.sort(key=lambda x: (x['organization'], x['name']))
+    # Filter for DC-based organizations with a scan over the domain column.
+    # Each distinct domain is classified once, and cached between runs.
+    with open_domain_classifier(CONFIG_PATH, ORGANIZATIONS_PATH) as classifier:
+        report = OrganizationReport(classifier)
+        engine = ReportEngine([report])
+        written = engine.export_csvs(snapshot, compression=compression)
+    snapshot.close()
 
     # Display results
-    print(f"Found {len(dc_org_subscribers)} subscribers from {len(set(s['organization'] for s in dc_org_subscribers))} DC-based organizations\n")
-
-    if dc_org_subscribers:
-        # Group by org for display
-        current_org = None
-        for sub in dc_org_subscribers:
-            if sub['organization'] != current_org:
-                current_org = sub['organization']
-                print(f"\n{current_org} ({sub['org_domain']}):")
-
-            location_str = f"{sub['region'] or sub['country_code'] or 'unknown location'}"
-            print(f"  {sub['email']:45} | {sub['name']:30} | {location_str}")
-
-        # Export to CSV
-        timestamp = datetime.now().strftime('%Y-%m-%d')
-        filename = f"dc_org_subscribers_{timestamp}.csv"
-
-        with open(filename, 'w', newline='') as f:
-            writer = csv.DictWriter(f, fieldnames=['organization', 'org_domain', 'email', 'name', 'country', 'country_code', 'region'])
-            writer.writeheader()
-            writer.writerows(dc_org_subscribers)
-
-        print(f"\n✅ Exported {len(dc_org_subscribers)} subscribers from DC orgs to {filename}")
-
-        # Summary by org
-        print("\nSummary by organization:")
-        org_counts = defaultdict(int)
-        for sub in dc_org_subscribers:
-            org_counts[sub['organization']] += 1
-
-        for org in sorted(org_counts.keys()):
-            print(f"  {org:50} {org_counts[org]:3} subscribers")
-    else:
-        print("No subscribers from DC-based organizations found.")
+    print('\n'.join(report.summary()))
+
+    # Export to CSV
+    for report, filename in written:
+        print(f"\n✅ Exported {report.count} subscribers from DC orgs to {filename}")
 
     return 0
 
@@ -3,12 +3,19 @@
 Extract subscribers based in Washington DC.
 
 Uses Mailchimp's predicted location data to find DC-based subscribers.
+Rows are written to the CSV as they are produced; pass --gzip or --zstd
+(needs the zstandard package) to compress it.
+Run scripts/run_reports.py to produce this alongside the other reports
+from a single scan.
 """
 
 import os
-import requests
-import csv
-from datetime import datetime
+import sys
+
+from newsletter_uploader.mailchimp_client import MailchimpClient
+from newsletter_uploader.reports import DCSubscribersReport, ReportEngine
+from newsletter_uploader.snapshot import load_snapshot
+from newsletter_uploader.store import iter_list_members
 
 
 def main():
@@ -17,80 +24,30 @@ def main():
         print("Error: MAILCHIMP_API_KEY not set")
         return 1
 
-    BASE_URL = f"https://{API_KEY.split('-')[-1]}.api.mailchimp.com/3.0"
     LIST_ID = "71ed1f89d8"
 
-    print("Fetching all subscribers...")
-    offset = 0
-    all_members = []
-
-    while True:
-        response = requests.get(
-            f"{BASE_URL}/lists/{LIST_ID}/members?count=1000&offset={offset}",
-            auth=("anystring", API_KEY)
-        )
-
-        if response.status_code != 200:
-            print(f"Error: {response.status_code}")
-            print(response.text)
-            break
-
-        data = response.json()
-        members = data.get("members", [])
-
-        if not members:
-            break
-
-        all_members.extend(members)
-
-        if len(members) < 1000:
-            break
-        offset += 1000
+    client = MailchimpClient(api_key=API_KEY, list_id=LIST_ID)
+    compression = 'gzip' if '--gzip' in sys.argv else 'zstd' if '--zstd' in sys.argv else None
 
-    print(f"Found {len(all_members)} total members\n")
+    print("Loading subscribed members...")
+    snapshot = load_snapshot(
+        lambda: iter_list_members(client, os.getenv("MAILCHIMP_MEMBER_STORE")),
+        os.getenv("MAILCHIMP_SNAPSHOT"),
+    )
+    print(f"Found {len(snapshot)} members (snapshot from {snapshot.created})\n")
 
-    # Filter for DC-based subscribers
-    dc_subscribers = []
-
-    for member in all_members:
-        if member['status'] != 'subscribed':
-            continue
-
-        location = member.get('location', {})
-        region = location.get('region', '').upper()
-
-        # Check for DC in various formats
-        if region in ['DC', 'D.C.', 'DISTRICT OF COLUMBIA']:
-            dc_subscribers.append({
-                'email': member['email_address'],
-                'name': f"{member.get('merge_fields', {}).get('FNAME', '')} {member.get('merge_fields', {}).get('LNAME', '')}".strip(),
-                'country': member.get('merge_fields', {}).get('COUNTRY', ''),
-                'region': location.get('region', ''),
-                'city': location.get('city', ''),
-                'zip': location.get('zip', ''),
-                'subscribed_date': member.get('timestamp_opt', '')
-            })
+    # Check for DC in various formats with a scan over the region column
+    report = DCSubscribersReport()
+    engine = ReportEngine([report])
+    written = engine.export_csvs(snapshot, compression=compression)
+    snapshot.close()
 
     # Display results
-    print(f"Found {len(dc_subscribers)} DC-based subscribers\n")
-
-    if dc_subscribers:
-        print("Sample subscribers:")
-        for sub in dc_subscribers[:10]:
-            print(f"  {sub['email']:45} | {sub['name']:30} | {sub['city']}")
-
-        # Export to CSV
-        timestamp = datetime.now().strftime('%Y-%m-%d')
-        filename = f"dc_subscribers_{timestamp}.csv"
-
-        with open(filename, 'w', newline='') as f:
-            writer = csv.DictWriter(f, fieldnames=['email', 'name', 'country', 'region', 'city', 'zip', 'subscribed_date'])
-            writer.writeheader()
-            writer.writerows(dc_subscribers)
+    print('\n'.join(report.summary()))
 
-        print(f"\n✅ Exported {len(dc_subscribers)} DC subscribers to {filename}")
-    else:
-        print("No DC-based subscribers found.")
+    # Export to CSV
+    for report, filename in written:
+        print(f"\n✅ Exported {report.count} DC subscribers to {filename}")
 
     return 0
 
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Run several subscriber reports from a single scan of the audience.
+
+Produces the same CSVs as extract_dc_subscribers.py,
+extract_by_organization.py and extract_dmv_subscribers.py, plus the
+assign_countries.py dry run, but loads the audience once and feeds every
+report in the same pass.
+
+Usage:
+    python scripts/run_reports.py [dc] [orgs] [dmv] [countries] [--gzip|--zstd]
+
+With no report names every report runs. Rows are streamed to the CSVs as
+they are produced, so memory stays bounded for any audience size; pass
+--gzip or --zstd (needs the zstandard package) to compress them. The countries report also writes its
+plan to assign_countries.plan.json (or $MAILCHIMP_PLAN), ready for
+assign_countries.py --apply-plan. Because that plan is applied as written,
+the countries report refuses a reused snapshot older than
+$MAILCHIMP_SNAPSHOT_MAX_AGE hours (default 1), like assign_countries.py.
+"""
+
+import os
+import sys
+from datetime import timedelta
+from pathlib import Path
+
+from newsletter_uploader.classification import open_domain_classifier
+from newsletter_uploader.mailchimp_client import MailchimpClient
+from newsletter_uploader.reports import (
+    CountryAssignmentReport,
+    DCSubscribersReport,
+    DMVReport,
+    OrganizationReport,
+    ReportEngine,
+)
+from newsletter_uploader.snapshot import load_snapshot
+from newsletter_uploader.store import iter_list_members
+
+CONFIG_PATH = Path(__file__).parent.parent / "config" / "domain-country-mapping.json"
+ORGANIZATIONS_PATH = Path(__file__).parent.parent / "config" / "organizations.json"
+
+REPORTS = ['dc', 'orgs', 'dmv', 'countries']
+
+# Oldest reused snapshot to plan writes from
+MAX_SNAPSHOT_AGE = timedelta(hours=float(os.getenv("MAILCHIMP_SNAPSHOT_MAX_AGE", "1")))
+
+
+def main():
+    API_KEY = os.getenv("MAILCHIMP_API_KEY")
+    if not API_KEY:
+        print("Error: MAILCHIMP_API_KEY not set")
+        return 1
+
+    LIST_ID = "71ed1f89d8"
+
+    selected = [arg for arg in sys.argv[1:] if not arg.startswith('--')] or REPORTS
+    compression = 'gzip' if '--gzip' in sys.argv else 'zstd' if '--zstd' in sys.argv else None
+    unknown = [name for name in selected if name not in REPORTS]
+    if unknown:
+        print(f"Error: unknown reports {', '.join(unknown)} (choose from {', '.join(REPORTS)})")
+        return 1
+
+    client = MailchimpClient(api_key=API_KEY, list_id=LIST_ID)
+
+    print("Loading subscribed members...")
+    try:
+        snapshot = load_snapshot(
+            lambda: iter_list_members(client, os.getenv("MAILCHIMP_MEMBER_STORE")),
+            os.getenv("MAILCHIMP_SNAPSHOT"),
+            # The countries plan can be applied, so it needs a fresh snapshot
+            max_age=MAX_SNAPSHOT_AGE if 'countries' in selected else None,
+        )
+    except ValueError as e:
+        print(f"Error: {e}")
+        return 1
+    print(f"Found {len(snapshot)} members (snapshot from {snapshot.created})\n")
+
+    # Every report shares one classifier over the organization registry
+    classifier = open_domain_classifier(CONFIG_PATH, ORGANIZATIONS_PATH)
+    reports = []
+    if 'dc' in selected:
+        reports.append(DCSubscribersReport())
+    if 'orgs' in selected:
+        reports.append(OrganizationReport(classifier))
+    if 'dmv' in selected:
+        reports.append(DMVReport(classifier))
+    if 'countries' in selected:
+        reports.append(CountryAssignmentReport(classifier))
+
+    # One pass over the snapshot feeds every report
+    engine = ReportEngine(reports)
+    written = engine.export_csvs(snapshot, compression=compression)
+    snapshot.close()
+    classifier.save()
+
+    for report in reports:
+        print(f"{'='*70}")
+        print(f"{report.name}\n")
+        print('\n'.join(report.summary()))
+        print()
+
+    print(f"{'='*70}")
+    for report, filename in written:
+        print(f"✅ Exported {report.count} rows to {filename}")
+
+    for report in reports:
+        if isinstance(report, CountryAssignmentReport):
+            plan_path = os.getenv("MAILCHIMP_PLAN", "assign_countries.plan.json")
+            report.plan(LIST_ID).save(plan_path)
+            print(f"✅ Wrote country plan to {plan_path} (apply with assign_countries.py --apply-plan)")
+
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
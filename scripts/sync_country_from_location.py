@@ -3,12 +3,42 @@
 Sync COUNTRY merge field from Mailchimp's predicted location data.
 
 Uses location.country_code to set the COUNTRY merge field.
+
+Pass --dry-run to only write the plan of changes to
+sync_country_from_location.plan.json (or $MAILCHIMP_PLAN) for review,
+without sending any writes; rerun with --apply-plan to apply the reviewed
+plan.
+
+Every planned update and its outcome is journaled to
+sync_country_from_location.journal (or $MAILCHIMP_JOURNAL). If a run is
+interrupted, rerun with --resume to send only the updates that have not
+succeeded, without re-fetching the audience.
+
+Pass --batch to send all updates as one /batches submission instead of
+one request per subscriber. Without it, updates are sent concurrently over
+the client's connection pool; pass --async to schedule them as coroutines
+on the asyncio client rather than on a thread pool.
 """
 
+import asyncio
 import os
 import sys
-import requests
-import hashlib
+
+from newsletter_uploader.async_client import AsyncMailchimpClient
+from newsletter_uploader.batches import run_batch
+from newsletter_uploader.executor import MemberWriteExecutor, format_progress
+from newsletter_uploader.journal import WriteJournal
+from newsletter_uploader.mailchimp_client import MailchimpClient
+from newsletter_uploader.planner import (
+    MemberChange,
+    Plan,
+    apply_changes,
+    apply_changes_async,
+    build_plan,
+    change_operations,
+    location_country_source,
+)
+from newsletter_uploader.store import iter_list_members
 
 
 # Map country codes to Mailchimp COUNTRY field values
@@ -42,95 +72,91 @@ COUNTRY_CODE_MAP = {
 }
 
 
-def main():
-    API_KEY = os.getenv("MAILCHIMP_API_KEY")
-    if not API_KEY:
-        print("Error: MAILCHIMP_API_KEY not set")
-        return 1
-
-    BASE_URL = f"https://{API_KEY.split('-')[-1]}.api.mailchimp.com/3.0"
-    LIST_ID = "71ed1f89d8"
+def plan_updates(client):
+    """Plan COUNTRY from predicted location for subscribers without one."""
+    print("Fetching subscribed members...")
+    total_members = 0
 
-    print("Fetching all subscribers...")
-    offset = 0
-    all_members = []
+    def count(members):
+        nonlocal total_members
+        for member in members:
+            total_members += 1
+            yield member
 
-    while True:
-        response = requests.get(
-            f"{BASE_URL}/lists/{LIST_ID}/members?count=1000&offset={offset}",
-            auth=("anystring", API_KEY)
-        )
+    # Plan as pages arrive
+    members = iter_list_members(client, os.getenv("MAILCHIMP_MEMBER_STORE"))
+    plan = build_plan(
+        client.list_id, count(members), [location_country_source(COUNTRY_CODE_MAP)]
+    )
 
-        if response.status_code != 200:
-            break
+    print(f"Found {total_members} subscribed members\n")
 
-        data = response.json()
-        members = data.get("members", [])
-
-        if not members:
-            break
-
-        all_members.extend(members)
-
-        if len(members) < 1000:
-            break
-        offset += 1000
-
-    print(f"Found {len(all_members)} total members\n")
-
-    # Analyze what needs syncing
-    needs_update = []
+    # Show summary
+    uk_updates = [c for c in plan.changes if c.merge_fields['COUNTRY'] == COUNTRY_CODE_MAP['GB']]
+    us_updates = [c for c in plan.changes if c.merge_fields['COUNTRY'] == COUNTRY_CODE_MAP['US']]
+    other_count = len(plan.changes) - len(uk_updates) - len(us_updates)
 
-    for member in all_members:
-        if member['status'] != 'subscribed':
-            continue
+    print(f"Can sync {len(plan.changes)} subscribers from predicted location:\n")
+    print(f"  UK (GB): {len(uk_updates)}")
+    print(f"  US: {len(us_updates)}")
+    print(f"  Other: {other_count}")
 
-        current_country = member.get('merge_fields', {}).get('COUNTRY', '').strip()
-        location = member.get('location', {})
-        country_code = location.get('country_code', '')
+    print(f"\nUK examples:")
+    for c in uk_updates[:10]:
+        print(f"  {c.email:45} | {c.reason} → {c.merge_fields['COUNTRY']}")
 
-        # Skip if already has country set
-        if current_country:
-            continue
+    print(f"\nUS examples:")
+    for c in us_updates[:5]:
+        print(f"  {c.email:45} | {c.reason} → {c.merge_fields['COUNTRY']}")
 
-        # Skip if no location data
-        if not country_code:
-            continue
+    return plan
 
-        # Map country code to full name
-        country_name = COUNTRY_CODE_MAP.get(country_code)
-        if country_name:
-            needs_update.append({
-                'id': member['id'],
-                'email': member['email_address'],
-                'country_code': country_code,
-                'country_name': country_name
-            })
 
-    # Show summary
-    uk_updates = [u for u in needs_update if u['country_code'] == 'GB']
-    us_updates = [u for u in needs_update if u['country_code'] == 'US']
-    other_updates = [u for u in needs_update if u['country_code'] not in ['GB', 'US']]
+def main():
+    API_KEY = os.getenv("MAILCHIMP_API_KEY")
+    if not API_KEY:
+        print("Error: MAILCHIMP_API_KEY not set")
+        return 1
 
-    print(f"Can sync {len(needs_update)} subscribers from predicted location:\n")
-    print(f"  UK (GB): {len(uk_updates)}")
-    print(f"  US: {len(us_updates)}")
-    print(f"  Other: {len(other_updates)}")
+    LIST_ID = "71ed1f89d8"
 
-    print(f"\nUK examples:")
-    for u in uk_updates[:10]:
-        print(f"  {u['email']:45} | {u['country_code']} → {u['country_name']}")
+    client = MailchimpClient(api_key=API_KEY, list_id=LIST_ID)
+    journal = WriteJournal(
+        os.getenv("MAILCHIMP_JOURNAL", "sync_country_from_location.journal")
+    )
+    plan_path = os.getenv("MAILCHIMP_PLAN", "sync_country_from_location.plan.json")
 
-    print(f"\nUS examples:")
-    for u in us_updates[:5]:
-        print(f"  {u['email']:45} | {u['country_code']} → {u['country_name']}")
+    if '--resume' in sys.argv:
+        if not journal.exists():
+            print(f"Error: no journal at {journal.path} to resume")
+            return 1
+        summary = journal.load()
+        changes = [MemberChange.from_dict(item) for item in journal.pending()]
+        print(f"Resuming job from {journal.created}")
+        print(f"  Succeeded: {summary.succeeded}/{summary.planned}")
+        print(f"  Remaining: {len(changes)} ({summary.failed} previously failed)")
+    elif '--apply-plan' in sys.argv:
+        plan = Plan.load(plan_path)
+        if plan.list_id != LIST_ID:
+            print(f"Error: {plan_path} was planned for list {plan.list_id}")
+            return 1
+        changes = plan.changes
+        print(f"Loaded {len(changes)} changes from {plan_path} (planned {plan.created})")
+    else:
+        plan = plan_updates(client)
+        changes = plan.changes
+        if '--dry-run' in sys.argv:
+            plan.save(plan_path)
+            print(f"\nDry run: plan written to {plan_path}, nothing was sent.")
+            print("Review it, then rerun with --apply-plan to apply it.")
+            return 0
 
     # Ask for confirmation
     print(f"\n{'='*70}")
 
     if '--yes' not in sys.argv:
         try:
-            response = input(f"Update {len(needs_update)} subscribers? (yes/no): ")
+            response = input(f"Update {len(changes)} subscribers? (yes/no): ")
             if response.lower() != 'yes':
                 print("Cancelled.")
                 return 0
@@ -138,38 +164,66 @@ def main():
             print("\nUse --yes flag to auto-confirm")
             return 1
     else:
-        print(f"Auto-confirming {len(needs_update)} updates (--yes flag)")
+        print(f"Auto-confirming {len(changes)} updates (--yes flag)")
+
+    if '--resume' not in sys.argv:
+        journal.begin(change.to_dict() for change in changes)
+    print(f"Journaling to {journal.path} (rerun with --resume if interrupted)")
 
     # Perform updates
     print("\nSyncing COUNTRY from predicted location...")
     success = 0
     failed = 0
 
-    for i, update in enumerate(needs_update, 1):
-        update_response = requests.patch(
-            f"{BASE_URL}/lists/{LIST_ID}/members/{update['id']}",
-            auth=("anystring", API_KEY),
-            json={
-                "merge_fields": {
-                    "COUNTRY": update['country_name']
-                }
-            }
-        )
-
-        if update_response.status_code == 200:
-            success += 1
-            if success % 50 == 0:
-                print(f"  Progress: {success}/{len(needs_update)}...")
+    if '--batch' in sys.argv:
+        emails = {change.id: change.email for change in changes}
+
+        def show_progress(batch):
+            print(f"  Batch {batch['status']}: {batch['finished_operations']}/{batch['total_operations']}")
+
+        operations = change_operations(LIST_ID, changes)
+        for result in run_batch(client, operations, on_progress=show_progress):
+            journal.record(result.operation_id, result.ok, result.error)
+            if result.ok:
+                success += 1
+            else:
+                failed += 1
+                print(f"  ✗ Failed: {emails[result.operation_id]} ({result.error})")
+    else:
+        def record(result):
+            journal.record(result.item.id, result.ok, str(result.error or ''))
+
+        if '--async' in sys.argv:
+            async def apply_all():
+                async with AsyncMailchimpClient(API_KEY, LIST_ID, client=client) as async_client:
+                    return await apply_changes_async(async_client, changes, on_result=record)
+
+            results = asyncio.run(apply_all())
         else:
-            failed += 1
-            print(f"  ✗ Failed: {update['email']}")
+            def show_progress(progress):
+                print(f"  Progress: {format_progress(progress)}")
+
+            executor = MemberWriteExecutor(on_progress=show_progress, progress_interval=5.0)
+            results = apply_changes(client, changes, executor, on_result=record)
+        for result in results:
+            if result.ok:
+                success += 1
+            else:
+                failed += 1
+                print(f"  ✗ Failed: {result.item.email} ({result.error})")
+    journal.close()
+
+    uk_count = sum(c.merge_fields['COUNTRY'] == COUNTRY_CODE_MAP['GB'] for c in changes)
+    us_count = sum(c.merge_fields['COUNTRY'] == COUNTRY_CODE_MAP['US'] for c in changes)
 
     print(f"\n✅ Complete!")
     print(f"   Success: {success}")
     print(f"   Failed: {failed}")
-    print(f"\n   UK: {len(uk_updates)}")
-    print(f"   US: {len(us_updates)}")
-    print(f"   Other: {len(other_updates)}")
+    print(f"\n   UK: {uk_count}")
+    print(f"   US: {us_count}")
+    print(f"   Other: {len(changes) - uk_count - us_count}")
+    if failed:
+        print(f"\n   Rerun with --resume to retry the failures")
 
     return 0
 
@@ -0,0 +1,132 @@
+"""Asyncio Mailchimp client for high-concurrency workloads."""
+
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional
+
+from .mailchimp_client import DEFAULT_POOL_SIZE, MAX_PAGE_SIZE, MailchimpClient
+
+
+async def gather_bounded(
+    awaitables: Iterable[Awaitable], limit: int, return_exceptions: bool = False
+) -> List[Any]:
+    """
+    Await many awaitables with at most ``limit`` running at once.
+
+    Args:
+        awaitables: Coroutines or futures to await
+        limit: Maximum number awaited concurrently
+        return_exceptions: Return exceptions as results instead of raising
+
+    Returns:
+        Results in the same order as the awaitables
+    """
+    semaphore = asyncio.Semaphore(limit)
+
+    async def bounded(awaitable: Awaitable) -> Any:
+        async with semaphore:
+            return await awaitable
+
+    return await asyncio.gather(
+        *(bounded(awaitable) for awaitable in awaitables),
+        return_exceptions=return_exceptions,
+    )
+
+
+class AsyncMailchimpClient:
+    """
+    Asyncio variant of MailchimpClient.
+
+    Calls run on a worker pool sized to the connection limit and share the
+    wrapped client's pooled session and request governor, so any number of
+    coroutines can be scheduled while Mailchimp sees at most ``pool_size``
+    concurrent connections.
+    """
+
+    def __init__(
+        self,
+        api_key: str,
+        list_id: str,
+        pool_size: Optional[int] = None,
+        client: Optional[MailchimpClient] = None,
+        **client_kwargs,
+    ):
+        """
+        Initialize async Mailchimp client.
+
+        Args:
+            api_key: Mailchimp API key (format: key-datacenter)
+            list_id: Mailchimp list/audience ID
+            pool_size: Maximum number of concurrent requests (defaults to
+                the wrapped client's concurrency limit, or DEFAULT_POOL_SIZE
+                for a new client)
+            client: Existing synchronous client to wrap (optional). It stays
+                open on close, as it belongs to the caller.
+            **client_kwargs: Extra arguments for the wrapped MailchimpClient
+        """
+        if client is None:
+            pool_size = pool_size or DEFAULT_POOL_SIZE
+            client = MailchimpClient(
+                api_key=api_key, list_id=list_id, pool_size=pool_size, **client_kwargs
+            )
+            self._owns_client = True
+        else:
+            pool_size = pool_size or client.governor.max_concurrency
+            self._owns_client = False
+        self.client = client
+        self.pool_size = pool_size
+        self._executor = ThreadPoolExecutor(
+            max_workers=pool_size, thread_name_prefix="mailchimp"
+        )
+
+    async def _run(self, func: Callable, *args, **kwargs) -> Any:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._executor, functools.partial(func, *args, **kwargs)
+        )
+
+    async def create_campaign(self, *args, **kwargs) -> Dict:
+        """Create a new campaign. See MailchimpClient.create_campaign."""
+        return await self._run(self.client.create_campaign, *args, **kwargs)
+
+    async def upload_content(self, campaign_id: str, html_content: str) -> None:
+        """Upload HTML content to a campaign. See MailchimpClient.upload_content."""
+        await self._run(self.client.upload_content, campaign_id, html_content)
+
+    async def update_campaign(self, campaign_id: str, **settings) -> Dict:
+        """Update campaign settings. See MailchimpClient.update_campaign."""
+        return await self._run(self.client.update_campaign, campaign_id, **settings)
+
+    async def get_campaign(self, campaign_id: str) -> Dict:
+        """Get campaign details."""
+        return await self._run(self.client._get_campaign, campaign_id)
+
+    async def list_members(
+        self, count: int = MAX_PAGE_SIZE, offset: int = 0, **filters
+    ) -> Dict:
+        """Get one page of list members. See MailchimpClient.list_members."""
+        return await self._run(
+            self.client.list_members, count=count, offset=offset, **filters
+        )
+
+    async def update_member(self, member_id: str, data: Dict) -> Dict:
+        """Update a list member. See MailchimpClient.update_member."""
+        return await self._run(self.client.update_member, member_id, data)
+
+    async def close(self) -> None:
+        """Shut down the worker pool and close the client if it created it."""
+        # Waiting for running calls would block the event loop, so wait on
+        # the loop's default executor instead
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(
+            None, functools.partial(self._executor.shutdown, wait=True)
+        )
+        if self._owns_client:
+            self.client.close()
+
+    async def __aenter__(self) -> "AsyncMailchimpClient":
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback) -> None:
+        await self.close()
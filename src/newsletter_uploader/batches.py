@@ -0,0 +1,193 @@
+"""Bulk operations through Mailchimp's /batches endpoint."""
+
+import json
+import tarfile
+import time
+from typing import Callable, Dict, Iterator, List, NamedTuple, Optional
+
+import requests
+
+from .mailchimp_client import MailchimpClient
+
+FINISHED = "finished"
+
+
+class BatchOperation(NamedTuple):
+    """One API call to run inside a batch."""
+
+    method: str
+    path: str
+    operation_id: str
+    body: Optional[Dict] = None
+
+    def to_dict(self) -> Dict:
+        """Serialize in the format the /batches endpoint expects."""
+        operation = {
+            "method": self.method,
+            "path": self.path,
+            "operation_id": self.operation_id,
+        }
+        if self.body is not None:
+            operation["body"] = json.dumps(self.body)
+        return operation
+
+
+class BatchResult(NamedTuple):
+    """Outcome of one operation from a finished batch."""
+
+    operation_id: str
+    status_code: int
+    response: Optional[Dict]
+
+    @property
+    def ok(self) -> bool:
+        """Whether the operation succeeded."""
+        return 200 <= self.status_code < 300
+
+    @property
+    def error(self) -> str:
+        """Mailchimp's error detail for a failed operation."""
+        if self.ok or not self.response:
+            return ""
+        return self.response.get("detail") or self.response.get("title", "")
+
+
+def member_update_operation(
+    list_id: str, member_id: str, data: Dict, operation_id: Optional[str] = None
+) -> BatchOperation:
+    """
+    Build a batch operation that PATCHes one list member.
+
+    Args:
+        list_id: Mailchimp list/audience ID
+        member_id: Subscriber hash
+        data: Member fields to update (e.g. {"merge_fields": {...}})
+        operation_id: Identifier echoed back in the results (defaults to
+            the member ID)
+
+    Returns:
+        Batch operation
+    """
+    return BatchOperation(
+        method="PATCH",
+        path=f"/lists/{list_id}/members/{member_id}",
+        operation_id=operation_id or member_id,
+        body=data,
+    )
+
+
+def wait_for_batch(
+    client: MailchimpClient,
+    batch_id: str,
+    poll_interval: float = 5.0,
+    timeout: Optional[float] = None,
+    on_progress: Optional[Callable[[Dict], None]] = None,
+    sleep: Callable[[float], None] = time.sleep,
+) -> Dict:
+    """
+    Poll a batch until it has finished.
+
+    Args:
+        client: Mailchimp client
+        batch_id: Batch ID from MailchimpClient.start_batch
+        poll_interval: Seconds between status checks
+        timeout: Give up after this many seconds (optional)
+        on_progress: Called with the batch data after each check
+        sleep: Sleep function (injectable for tests)
+
+    Returns:
+        Finished batch data, including response_body_url
+
+    Raises:
+        TimeoutError: If the batch does not finish within the timeout
+    """
+    waited = 0.0
+    while True:
+        batch = client.get_batch(batch_id)
+        if on_progress is not None:
+            on_progress(batch)
+        if batch["status"] == FINISHED:
+            return batch
+        if timeout is not None and waited >= timeout:
+            raise TimeoutError(
+                f"Batch {batch_id} still {batch['status']} after {waited:.0f}s"
+            )
+        sleep(poll_interval)
+        waited += poll_interval
+
+
+def iter_batch_results(
+    response_body_url: str, timeout: Optional[float] = None
+) -> Iterator[BatchResult]:
+    """
+    Stream per-operation results out of a finished batch's archive.
+
+    The archive is read as it downloads, one result file at a time, so the
+    whole archive is never held in memory.
+
+    Args:
+        response_body_url: Archive URL from the finished batch
+        timeout: Download timeout in seconds
+
+    Yields:
+        One result per operation
+    """
+    # The archive is served from pre-signed storage, so no API auth is sent
+    with requests.get(response_body_url, stream=True, timeout=timeout) as response:
+        response.raise_for_status()
+        with tarfile.open(fileobj=response.raw, mode="r|gz") as archive:
+            for entry in archive:
+                if not entry.isfile() or not entry.name.endswith(".json"):
+                    continue
+                for result in json.load(archive.extractfile(entry)):
+                    yield _parse_result(result)
+
+
+def _parse_result(result: Dict) -> BatchResult:
+    body = result.get("response")
+    try:
+        response = json.loads(body) if body else None
+    except ValueError:
+        response = {"detail": body}
+    return BatchResult(
+        operation_id=result.get("operation_id", ""),
+        status_code=result["status_code"],
+        response=response,
+    )
+
+
+def run_batch(
+    client: MailchimpClient,
+    operations: List[BatchOperation],
+    poll_interval: float = 5.0,
+    timeout: Optional[float] = None,
+    on_progress: Optional[Callable[[Dict], None]] = None,
+    sleep: Callable[[float], None] = time.sleep,
+) -> Iterator[BatchResult]:
+    """
+    Submit operations as one batch, wait for it and stream the results.
+
+    Args:
+        client: Mailchimp client
+        operations: Operations to run
+        poll_interval: Seconds between status checks
+        timeout: Give up waiting after this many seconds (optional)
+        on_progress: Called with the batch data after each status check
+        sleep: Sleep function (injectable for tests)
+
+    Yields:
+        One result per operation
+    """
+    if not operations:
+        return
+
+    batch = client.start_batch([operation.to_dict() for operation in operations])
+    finished = wait_for_batch(
+        client,
+        batch["id"],
+        poll_interval=poll_interval,
+        timeout=timeout,
+        on_progress=on_progress,
+        sleep=sleep,
+    )
+    yield from iter_batch_results(finished["response_body_url"], timeout=client.timeout)
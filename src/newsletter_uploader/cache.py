@@ -0,0 +1,208 @@
+"""Bounded LRU caches, optionally persisted between runs."""
+
+import hashlib
+import json
+import os
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Hashable, Iterator, Optional, Tuple, Union
+
+DEFAULT_MAX_SIZE = 100_000
+
+CACHE_VERSION = 1
+
+
+def default_cache_dir() -> Path:
+    """
+    Directory for caches kept between runs.
+
+    Uses NEWSLETTER_CACHE_DIR if set, otherwise newsletter-uploader under
+    XDG_CACHE_HOME (default ~/.cache).
+
+    Returns:
+        Cache directory (not created)
+    """
+    configured = os.getenv("NEWSLETTER_CACHE_DIR")
+    if configured:
+        return Path(configured)
+    base = os.getenv("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(base) / "newsletter-uploader"
+
+
+def config_hash(config: Any) -> str:
+    """
+    Fingerprint JSON-serializable configuration.
+
+    Args:
+        config: Configuration the cached values were derived from
+
+    Returns:
+        Hex digest that changes whenever the configuration does
+    """
+    encoded = json.dumps(config, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+class LRUCache:
+    """Mapping that evicts the least recently used entry beyond max_size."""
+
+    def __init__(self, max_size: int = DEFAULT_MAX_SIZE):
+        """
+        Initialize cache.
+
+        Args:
+            max_size: Most entries kept
+
+        Raises:
+            ValueError: If max_size is not positive
+        """
+        if max_size < 1:
+            raise ValueError("max_size must be at least 1")
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[Hashable, Any]" = OrderedDict()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """
+        Look up an entry, marking it as recently used.
+
+        Args:
+            key: Cache key
+            default: Returned when the key is not cached
+
+        Returns:
+            Cached value or default
+        """
+        try:
+            value = self._entries[key]
+        except KeyError:
+            self.misses += 1
+            return default
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def put(self, key: Hashable, value: Any) -> None:
+        """
+        Store an entry, evicting the least recently used if full.
+
+        Args:
+            key: Cache key
+            value: Value to cache
+        """
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def items(self) -> Iterator[Tuple[Hashable, Any]]:
+        """Entries from least to most recently used."""
+        return iter(self._entries.items())
+
+    def clear(self) -> None:
+        """Remove every entry."""
+        self._entries.clear()
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class PersistentLRUCache(LRUCache):
+    """
+    LRU cache saved to a JSON file between runs.
+
+    The file records a fingerprint of the configuration its values were
+    derived from (see config_hash). Entries saved under a different
+    fingerprint are discarded on load, so changing the configuration
+    invalidates the cache without any manual step. Keys must be strings and
+    values JSON-serializable.
+    """
+
+    def __init__(
+        self,
+        path: Union[str, Path],
+        fingerprint: str,
+        max_size: int = DEFAULT_MAX_SIZE,
+    ):
+        """
+        Open a cache file, loading entries saved under the same fingerprint.
+
+        Args:
+            path: Cache file (created on save)
+            fingerprint: Fingerprint of the configuration
+            max_size: Most entries kept
+        """
+        super().__init__(max_size)
+        self.path = Path(path)
+        self.fingerprint = fingerprint
+        self._dirty = False
+        self._load()
+
+    def _load(self) -> None:
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            # Missing or corrupt caches are simply rebuilt
+            return
+        if (
+            data.get("version") != CACHE_VERSION
+            or data.get("fingerprint") != self.fingerprint
+        ):
+            self._dirty = True
+            return
+        for key, value in data["entries"]:
+            super().put(key, value)
+
+    def put(self, key: str, value: Any) -> None:
+        """Store an entry. See LRUCache.put."""
+        super().put(key, value)
+        self._dirty = True
+
+    def save(self) -> None:
+        """Write the cache if it changed since it was loaded."""
+        if not self._dirty:
+            return
+        data: Dict[str, Any] = {
+            "version": CACHE_VERSION,
+            "fingerprint": self.fingerprint,
+            "entries": [[key, value] for key, value in self.items()],
+        }
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        staging = self.path.with_name(f".{self.path.name}.tmp")
+        staging.write_text(json.dumps(data), encoding="utf-8")
+        os.replace(staging, self.path)
+        self._dirty = False
+
+    def __enter__(self) -> "PersistentLRUCache":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.save()
+
+
+def open_cache(
+    name: str,
+    config: Any,
+    cache_dir: Optional[Union[str, Path]] = None,
+    max_size: int = DEFAULT_MAX_SIZE,
+) -> PersistentLRUCache:
+    """
+    Open a named persistent cache tied to a configuration.
+
+    Args:
+        name: Cache file name within the cache directory
+        config: JSON-serializable configuration the values derive from
+        cache_dir: Directory for the cache (defaults to default_cache_dir())
+        max_size: Most entries kept
+
+    Returns:
+        Persistent cache
+    """
+    cache_dir = Path(cache_dir) if cache_dir is not None else default_cache_dir()
+    return PersistentLRUCache(
+        cache_dir / f"{name}.json", config_hash(config), max_size=max_size
+    )
@@ -0,0 +1,142 @@
+"""Per-domain subscriber classification, memoized across members and runs."""
+
+import json
+from pathlib import Path
+from typing import Iterable, NamedTuple, Optional, Tuple, Union
+
+from .cache import DEFAULT_MAX_SIZE, LRUCache, PersistentLRUCache, open_cache
+from .countries import TLD_RULES, CountryClassifier
+from .domains import email_domain
+from .organizations import OrganizationRegistry, load_organizations
+
+CACHE_NAME = "domain-classifications"
+
+
+class DomainClassification(NamedTuple):
+    """What a subscriber's email domain says about them."""
+
+    country: Optional[str]
+    reason: str
+    organization: str
+    dmv: bool
+
+
+class DomainClassifier:
+    """
+    Classify email domains by country and DC-area organization.
+
+    Most subscribers share a small number of domains, so each domain is
+    classified once and the result cached. With a PersistentLRUCache the
+    results also carry over to later runs until the configuration changes.
+    """
+
+    def __init__(
+        self,
+        countries: CountryClassifier,
+        organizations: OrganizationRegistry,
+        cache: Optional[LRUCache] = None,
+    ):
+        """
+        Initialize classifier.
+
+        Args:
+            countries: Compiled country rules
+            organizations: Known organizations
+            cache: Cache of classifications by domain (defaults to an
+                in-memory LRU cache)
+        """
+        self.countries = countries
+        self.organizations = organizations
+        self.cache = cache if cache is not None else LRUCache()
+
+    def classify(self, domain: str) -> DomainClassification:
+        """
+        Classify a domain.
+
+        Args:
+            domain: Lowercased domain (see email_domain)
+
+        Returns:
+            Classification
+        """
+        cached = self.cache.get(domain)
+        if cached is not None:
+            return DomainClassification(*cached)
+
+        country, reason = self.countries.classify_domain(domain)
+        organization = self.organizations.lookup(domain)
+        classification = DomainClassification(
+            country=country,
+            reason=reason,
+            organization=organization.name if organization is not None else "",
+            dmv=organization is not None and organization.dc,
+        )
+        self.cache.put(domain, tuple(classification))
+        return classification
+
+    def infer_country(
+        self, email: str, tags: Iterable[str] = ()
+    ) -> Tuple[Optional[str], str]:
+        """
+        Infer a member's country from tags, then their cached domain.
+
+        Args:
+            email: Email address
+            tags: Tag names
+
+        Returns:
+            Tuple of (country, reason), or (None, reason) if undetermined
+        """
+        by_tag = self.countries.classify_tags(tags)
+        if by_tag is not None:
+            return by_tag
+        classification = self.classify(email_domain(email))
+        return classification.country, classification.reason
+
+    def save(self) -> None:
+        """Persist the cache, if it is persistent."""
+        if isinstance(self.cache, PersistentLRUCache):
+            self.cache.save()
+
+    def __enter__(self) -> "DomainClassifier":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.save()
+
+
+def open_domain_classifier(
+    mapping_path: Union[str, Path],
+    organizations_path: Union[str, Path],
+    cache_dir: Optional[Union[str, Path]] = None,
+    max_size: int = DEFAULT_MAX_SIZE,
+) -> DomainClassifier:
+    """
+    Build a classifier whose cache persists between runs.
+
+    The cache is keyed to the mapping file's contents, the built-in TLD
+    rules and the organization registry, so editing any of them
+    invalidates it.
+
+    Args:
+        mapping_path: domain-country-mapping.json
+        organizations_path: organizations.json (see load_organizations)
+        cache_dir: Cache directory (defaults to default_cache_dir())
+        max_size: Most domains kept in the cache
+
+    Returns:
+        Classifier (use as a context manager to save the cache)
+    """
+    with open(mapping_path, encoding="utf-8") as f:
+        mappings = json.load(f)
+    organizations = load_organizations(organizations_path, cache_dir=cache_dir)
+    config = {
+        "mappings": mappings,
+        "tld_rules": TLD_RULES,
+        "organizations": organizations.fingerprint,
+    }
+    return DomainClassifier(
+        CountryClassifier(mappings, organizations.country_rules()),
+        organizations,
+        open_cache(CACHE_NAME, config, cache_dir=cache_dir, max_size=max_size),
+    )
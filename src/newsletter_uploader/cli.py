@@ -2,12 +2,16 @@
 
 import sys
 from pathlib import Path
+from typing import List
 
 import click
 
 from .audience import AudienceType
 from .mailchimp_client import MailchimpClient
-from .uploader import NewsletterUploader
+from .manifest import DEFAULT_MAX_WORKERS, EditionResult, load_manifest, upload_manifest
+from .segments import count_recipients
+from .snapshot import HEADER_FILE, MemberSnapshot
+from .uploader import NewsletterUploader, open_campaign_cache
 
 
 @click.command()
@@ -38,7 +42,30 @@ from .uploader import NewsletterUploader
     "--campaign-id",
     help="Update existing campaign instead of creating new one",
 )
-def main(html_file, audience, subject, preview, title, api_key, list_id, campaign_id):
+@click.option(
+    "--snapshot",
+    envvar="MAILCHIMP_SNAPSHOT",
+    type=click.Path(path_type=Path),
+    help="Member snapshot to preview recipient counts from "
+    "(or set MAILCHIMP_SNAPSHOT env var)",
+)
+@click.option(
+    "--force",
+    is_flag=True,
+    help="Re-send the HTML even if unchanged since the last upload",
+)
+def main(
+    html_file,
+    audience,
+    subject,
+    preview,
+    title,
+    api_key,
+    list_id,
+    campaign_id,
+    snapshot,
+    force,
+):
     """
     Upload newsletter HTML to Mailchimp as a draft campaign.
 
@@ -93,7 +120,7 @@ def main(html_file, audience, subject, preview, title, api_key, list_id, campaig
     try:
         # Initialize client and uploader
         client = MailchimpClient(api_key=api_key, list_id=list_id)
-        uploader = NewsletterUploader(client)
+        uploader = NewsletterUploader(client, campaign_cache=open_campaign_cache())
 
         # Upload newsletter
         click.echo("Reading HTML file...")
@@ -109,13 +136,22 @@ def main(html_file, audience, subject, preview, title, api_key, list_id, campaig
                 subject=subject,
                 preview_text=preview,
                 title=title,
+                force=force,
             )
+            if not result.get("content_uploaded", True):
+                click.echo(
+                    "✓ Content unchanged since last upload, skipped "
+                    "(pass --force to re-send)"
+                )
             click.echo(f"✓ Campaign updated (ID: {campaign_id})")
             success_message = "✅ DRAFT CAMPAIGN UPDATED SUCCESSFULLY"
         else:
+            audience_type = AudienceType(audience)
+            if snapshot:
+                preview_recipients(snapshot, audience_type)
+
             # Create new campaign
             click.echo("\nCreating campaign...")
-            audience_type = AudienceType(audience)
             result = uploader.upload(
                 html_file=html_file,
                 audience=audience_type,
@@ -139,12 +175,8 @@ def main(html_file, audience, subject, preview, title, api_key, list_id, campaig
             click.echo(f"Audience: {audience.upper()}")
         click.echo(f"Subject: {subject}")
 
-        # Extract datacenter from API key for URL
-        datacenter = api_key.split("-")[-1]
         click.echo("\n🔗 Edit in Mailchimp:")
-        click.echo(
-            f"   https://{datacenter}.admin.mailchimp.com/campaigns/edit?id={web_id}"
-        )
+        click.echo(f"   {edit_url(api_key, web_id)}")
         click.echo(
             "\n⚠️  This is a DRAFT - not sent yet. Review and send from Mailchimp."
         )
@@ -157,5 +189,170 @@ def main(html_file, audience, subject, preview, title, api_key, list_id, campaig
         sys.exit(1)
 
 
+def preview_recipients(path: Path, selected: AudienceType) -> None:
+    """
+    Print how many subscribers each audience would reach.
+
+    Counts come from a local member snapshot (see scripts/build_snapshot.py),
+    so they are as fresh as the snapshot.
+
+    Args:
+        path: Snapshot directory
+        selected: Audience the campaign is being created for
+    """
+    if not (path / HEADER_FILE).exists():
+        click.echo(f"\n⚠️  No snapshot at {path}; skipping recipient preview")
+        return
+    with MemberSnapshot(path) as member_snapshot:
+        counts = count_recipients(member_snapshot)
+        click.echo(f"\nExpected recipients (snapshot from {member_snapshot.created}):")
+    for audience_type, count in counts.items():
+        marker = "  ← this campaign" if audience_type == selected else ""
+        click.echo(f"   {audience_type.value.upper():<4} {count:>8,}{marker}")
+
+
+def edit_url(api_key: str, web_id) -> str:
+    """
+    Link to a campaign in the Mailchimp editor.
+
+    Args:
+        api_key: Mailchimp API key (its suffix is the datacenter)
+        web_id: Campaign web ID
+
+    Returns:
+        Editor URL
+    """
+    datacenter = api_key.split("-")[-1]
+    return f"https://{datacenter}.admin.mailchimp.com/campaigns/edit?id={web_id}"
+
+
+def format_results(results: List[EditionResult]) -> List[str]:
+    """
+    Lay out manifest results as a table.
+
+    Args:
+        results: Results in manifest order
+
+    Returns:
+        Table lines, header first
+    """
+    header = ("File", "Audience", "Action", "Campaign ID", "Web ID", "Status")
+    rows = []
+    for result in results:
+        entry = result.entry
+        if not result.ok:
+            status = (
+                "❌ failed" if result.campaign_id is None else "❌ failed (draft kept)"
+            )
+        elif result.action == "update" and not result.content_uploaded:
+            status = "✅ settings only (content unchanged)"
+        else:
+            status = "✅ ok"
+        rows.append(
+            (
+                entry.html_file.name,
+                entry.audience.value.upper() if entry.audience else "-",
+                result.action,
+                result.campaign_id or "-",
+                str(result.web_id) if result.web_id is not None else "-",
+                status,
+            )
+        )
+    widths = [max(len(row[i]) for row in [header, *rows]) for i in range(5)]
+    return [
+        "  ".join([*map(str.ljust, row[:5], widths), row[5]]) for row in [header, *rows]
+    ]
+
+
+@click.command()
+@click.argument("manifest", type=click.Path(exists=True, path_type=Path))
+@click.option(
+    "--api-key",
+    envvar="MAILCHIMP_API_KEY",
+    help="Mailchimp API key (or set MAILCHIMP_API_KEY env var)",
+)
+@click.option(
+    "--list-id",
+    envvar="MAILCHIMP_LIST_ID",
+    default="71ed1f89d8",
+    help="Mailchimp list ID (or set MAILCHIMP_LIST_ID env var)",
+)
+@click.option(
+    "--force",
+    is_flag=True,
+    help="Re-send the HTML of updated campaigns even if unchanged",
+)
+@click.option(
+    "--max-workers",
+    type=click.IntRange(min=1),
+    default=DEFAULT_MAX_WORKERS,
+    show_default=True,
+    help="Most editions uploaded at the same time",
+)
+def upload_editions(manifest, api_key, list_id, force, max_workers):
+    """
+    Upload every edition listed in a manifest as Mailchimp drafts.
+
+    The manifest (JSON, or YAML with PyYAML installed) lists each edition's
+    file, subject and preview, with an audience for new campaigns or the
+    campaign_id of a draft to update. Editions are uploaded concurrently;
+    a failed edition is reported without stopping the others.
+
+    \b
+    Example manifest (editions/2026-01-20.json):
+      {"editions": [
+        {"file": "2026-01-20-uk.html", "audience": "uk",
+         "subject": "UK update", "preview": "Latest UK analysis"},
+        {"file": "2026-01-20-us.html", "audience": "us",
+         "subject": "US update", "preview": "Latest US analysis"}
+      ]}
+
+    \b
+      upload-newsletters editions/2026-01-20.json
+    """
+    if not api_key:
+        click.echo(
+            "Error: MAILCHIMP_API_KEY not found. "
+            "Set it via --api-key or environment variable.",
+            err=True,
+        )
+        sys.exit(1)
+
+    try:
+        entries = load_manifest(manifest)
+    except (ValueError, ImportError) as e:
+        click.echo(f"❌ Error in {manifest}: {e}", err=True)
+        sys.exit(1)
+
+    click.echo(f"📧 Uploading {len(entries)} editions from {manifest}")
+    click.echo()
+
+    with MailchimpClient(api_key=api_key, list_id=list_id) as client:
+        uploader = NewsletterUploader(client, campaign_cache=open_campaign_cache())
+        results = upload_manifest(
+            uploader, entries, force=force, max_workers=max_workers
+        )
+
+    for line in format_results(results):
+        click.echo(line)
+
+    failures = [result for result in results if not result.ok]
+    succeeded = [result for result in results if result.ok]
+    if succeeded:
+        click.echo("\n🔗 Edit in Mailchimp:")
+        for result in succeeded:
+            click.echo(
+                f"   {result.entry.html_file.name}: "
+                f"{edit_url(api_key, result.web_id)}"
+            )
+    if failures:
+        click.echo(f"\n❌ {len(failures)} of {len(results)} editions failed:", err=True)
+        for result in failures:
+            click.echo(f"   {result.entry.html_file.name}: {result.error}", err=True)
+        sys.exit(1)
+
+    click.echo("\n⚠️  These are DRAFTS - not sent yet. Review and send from Mailchimp.")
+
+
 if __name__ == "__main__":
     main()
@@ -0,0 +1,118 @@
+"""Bulk contact imports through the list batch-subscribe endpoint."""
+
+import csv
+from itertools import islice
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Union
+
+from .mailchimp_client import MailchimpClient
+
+# Most members the batch-subscribe endpoint accepts per request
+MAX_BATCH_SUBSCRIBE = 500
+
+
+class ImportResult(NamedTuple):
+    """Outcome of importing one chunk of contacts."""
+
+    submitted: int
+    created: int
+    updated: int
+    errors: List[Dict]
+
+
+def read_contacts(
+    csv_path: Union[str, Path],
+    merge_fields: Optional[Dict[str, str]] = None,
+    columns: Optional[Dict[str, str]] = None,
+    email_column: str = "email",
+    status: str = "subscribed",
+) -> Iterator[Dict]:
+    """
+    Stream contacts from a CSV file as list members.
+
+    Rows are read one at a time, so files of any size use constant memory.
+    Rows without an email address are skipped. The status is sent as
+    status_if_new, so members already in the list keep their status and an
+    import never resubscribes someone who unsubscribed or was cleaned.
+
+    Args:
+        csv_path: CSV file with a header row
+        merge_fields: Merge fields set on every contact (e.g. COUNTRY)
+        columns: CSV column to merge field mapping (e.g. first_name -> FNAME);
+            empty values are left out so existing data is not blanked
+        email_column: CSV column holding the email address
+        status: Status of contacts new to the list
+
+    Yields:
+        Member dicts for the batch-subscribe endpoint
+    """
+    merge_fields = merge_fields or {}
+    columns = columns or {}
+    with open(csv_path, newline="", encoding="utf-8") as f:
+        for row in csv.DictReader(f):
+            email = (row.get(email_column) or "").strip()
+            if not email:
+                continue
+            fields = dict(merge_fields)
+            for column, field in columns.items():
+                value = (row.get(column) or "").strip()
+                if value:
+                    fields[field] = value
+            yield {
+                "email_address": email,
+                "status_if_new": status,
+                "merge_fields": fields,
+            }
+
+
+def chunked(items: Iterable, size: int) -> Iterator[List]:
+    """
+    Split an iterable into lists of at most ``size`` items.
+
+    Args:
+        items: Items to split
+        size: Maximum chunk size
+
+    Yields:
+        Consecutive chunks
+    """
+    iterator = iter(items)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def import_contacts(
+    client: MailchimpClient,
+    contacts: Iterable[Dict],
+    chunk_size: int = MAX_BATCH_SUBSCRIBE,
+    update_existing: bool = True,
+) -> Iterator[ImportResult]:
+    """
+    Upsert contacts into the list, one batch-subscribe request per chunk.
+
+    Args:
+        client: Mailchimp client
+        contacts: Member dicts (see read_contacts)
+        chunk_size: Contacts per request (at most 500)
+        update_existing: Update contacts that are already in the list
+
+    Yields:
+        One result per chunk, including per-email errors
+
+    Raises:
+        ValueError: If chunk_size exceeds the endpoint's limit
+    """
+    if not 0 < chunk_size <= MAX_BATCH_SUBSCRIBE:
+        raise ValueError(f"chunk_size must be between 1 and {MAX_BATCH_SUBSCRIBE}")
+
+    for chunk in chunked(contacts, chunk_size):
+        response = client.batch_subscribe(chunk, update_existing=update_existing)
+        yield ImportResult(
+            submitted=len(chunk),
+            created=response.get("total_created", 0),
+            updated=response.get("total_updated", 0),
+            errors=response.get("errors", []),
+        )
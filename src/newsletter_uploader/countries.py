@@ -0,0 +1,195 @@
+"""Infer subscriber countries from email domains and tags."""
+
+import json
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Tuple, Union
+
+from .domains import DomainSuffixIndex, email_domain
+
+UNITED_KINGDOM = "United Kingdom"
+UNITED_STATES = "United States of America"
+
+# Country-specific top-level and public suffixes: (suffix, country, reason)
+TLD_RULES = (
+    ("uk", UNITED_KINGDOM, "UK domain"),
+    ("edu", UNITED_STATES, "US domain (.edu/.gov)"),
+    ("gov", UNITED_STATES, "US domain (.edu/.gov)"),
+    ("us", UNITED_STATES, "US domain (.us)"),
+)
+
+# Keys of the mapping's tags section
+TAG_COUNTRIES = {"us": UNITED_STATES, "uk": UNITED_KINGDOM}
+
+UNKNOWN_REASON = "Unknown (generic domain)"
+
+
+def normalize_tag(tag: str) -> str:
+    """
+    Normalize a tag name for matching.
+
+    Args:
+        tag: Tag name
+
+    Returns:
+        Case-folded name with runs of whitespace collapsed
+    """
+    return " ".join(tag.split()).casefold()
+
+
+class TagMatcher:
+    """
+    Exact-match lookup from tag names to values, built once.
+
+    Matching a member is one set lookup per tag they have, however many
+    tags are configured. Tags match whole names (ignoring case and extra
+    whitespace), never across tag boundaries. When several of a member's
+    tags match, the rule added first wins.
+    """
+
+    def __init__(self, rules: Iterable[Tuple[str, str]] = ()):
+        """
+        Initialize matcher.
+
+        Args:
+            rules: (tag name, value) pairs in priority order
+        """
+        self._rules: Dict[str, Tuple[int, str, str]] = {}
+        for tag, value in rules:
+            self.add(tag, value)
+
+    def add(self, tag: str, value: str) -> None:
+        """
+        Add a rule with lower priority than those already added.
+
+        Args:
+            tag: Tag name
+            value: Value for members with the tag
+        """
+        self._rules.setdefault(normalize_tag(tag), (len(self._rules), tag, value))
+
+    def match(self, tags: Iterable[str]) -> Optional[Tuple[str, str]]:
+        """
+        Find the highest-priority rule matching any of a member's tags.
+
+        Args:
+            tags: The member's tag names
+
+        Returns:
+            (value, configured tag name), or None if no tag matches
+        """
+        best = None
+        for tag in tags:
+            rule = self._rules.get(normalize_tag(tag))
+            if rule is not None and (best is None or rule < best):
+                best = rule
+        if best is None:
+            return None
+        return best[2], best[1]
+
+    def __len__(self) -> int:
+        return len(self._rules)
+
+
+class CountryClassifier:
+    """
+    Country rules compiled from a domain-country mapping.
+
+    Organization domains (usually from OrganizationRegistry.country_rules)
+    and country TLDs go into one DomainSuffixIndex, so classifying an
+    address is a single walk over its domain labels and the most specific
+    rule wins (e.g. "brookings.edu" over "edu"). Rules match whole labels
+    only, so "urban.org" does not match "suburban.org".
+    """
+
+    def __init__(self, mappings: Dict, rules: Iterable[Tuple[str, str, str]] = ()):
+        """
+        Compile mapping rules.
+
+        Args:
+            mappings: Parsed domain-country-mapping.json, with a tags
+                section mapping "us"/"uk" to tag names (and optionally
+                legacy uk_organizations and us_organizations lists)
+            rules: Further (domain, country, reason) rules, e.g. from
+                OrganizationRegistry.country_rules
+
+        Raises:
+            ValueError: If the tags section names an unknown country
+        """
+        self.index: DomainSuffixIndex[Tuple[str, str]] = DomainSuffixIndex()
+        for suffix, country, reason in TLD_RULES:
+            self.index.add(suffix, (country, reason))
+        for org in mappings.get("uk_organizations", []):
+            self.index.add(org, (UNITED_KINGDOM, f"UK org: {org}"))
+        for org in mappings.get("us_organizations", []):
+            self.index.add(org, (UNITED_STATES, f"US org: {org}"))
+        for domain, country, reason in rules:
+            self.index.add(domain, (country, reason))
+
+        self.tags = TagMatcher()
+        for key, tags in mappings.get("tags", {}).items():
+            if key not in TAG_COUNTRIES:
+                raise ValueError(f"Unknown country in tags mapping: {key!r}")
+            for tag in tags:
+                self.tags.add(tag, TAG_COUNTRIES[key])
+
+    @classmethod
+    def from_file(cls, path: Union[str, Path]) -> "CountryClassifier":
+        """
+        Compile rules from a mapping file.
+
+        Args:
+            path: domain-country-mapping.json
+
+        Returns:
+            Classifier
+        """
+        with open(path, encoding="utf-8") as f:
+            return cls(json.load(f))
+
+    def classify(
+        self, email: str, tags: Iterable[str] = ()
+    ) -> Tuple[Optional[str], str]:
+        """
+        Infer a country from an email domain and tags.
+
+        Tags are checked first, then the most specific domain rule.
+
+        Args:
+            email: Email address
+            tags: Tag names
+
+        Returns:
+            Tuple of (country, reason), or (None, reason) if undetermined
+        """
+        return self.classify_tags(tags) or self.classify_domain(email_domain(email))
+
+    def classify_tags(self, tags: Iterable[str]) -> Optional[Tuple[str, str]]:
+        """
+        Infer a country from tags alone.
+
+        Args:
+            tags: Tag names
+
+        Returns:
+            Tuple of (country, reason), or None if no tag rule matches
+        """
+        match = self.tags.match(tags)
+        if match is None:
+            return None
+        country, tag = match
+        return country, f"Tag: {tag}"
+
+    def classify_domain(self, domain: str) -> Tuple[Optional[str], str]:
+        """
+        Infer a country from a domain alone.
+
+        Args:
+            domain: Lowercased domain (see email_domain)
+
+        Returns:
+            Tuple of (country, reason), or (None, reason) if undetermined
+        """
+        match = self.index.lookup(domain)
+        if match is None:
+            return None, UNKNOWN_REASON
+        return match[1]
@@ -0,0 +1,94 @@
+"""Reverse-label suffix index for matching email domains against rules."""
+
+from typing import Any, Dict, Generic, Iterable, Optional, Tuple, TypeVar
+
+T = TypeVar("T")
+
+# Key under which a trie node stores (suffix, value) for the suffix ending
+# there.
+# Labels are strings, so it cannot clash with a child.
+_VALUE = None
+
+
+def email_domain(email: str) -> str:
+    """
+    Extract the lowercased domain from an email address.
+
+    Args:
+        email: Email address
+
+    Returns:
+        Domain, or an empty string if the address has none
+    """
+    return email.rpartition("@")[2].lower() if "@" in email else ""
+
+
+class DomainSuffixIndex(Generic[T]):
+    """
+    Trie of domain suffixes keyed by labels from right to left.
+
+    A suffix matches a domain only on whole labels, so "urban.org" matches
+    "urban.org" and "research.urban.org" but not "suburban.org". Lookups
+    walk the domain's labels once, however many suffixes are indexed, and
+    return the most specific (longest) matching suffix.
+    """
+
+    def __init__(self, rules: Optional[Iterable[Tuple[str, T]]] = None):
+        """
+        Initialize index.
+
+        Args:
+            rules: Optional (suffix, value) pairs to add
+        """
+        self._root: Dict[Optional[str], Any] = {}
+        self._size = 0
+        for suffix, value in rules or ():
+            self.add(suffix, value)
+
+    def add(self, suffix: str, value: T) -> None:
+        """
+        Map a domain suffix to a value, replacing any previous value.
+
+        Args:
+            suffix: Domain or public suffix (e.g. "gov.uk", "urban.org");
+                leading dots are ignored
+            value: Value returned for domains under the suffix
+
+        Raises:
+            ValueError: If the suffix is empty
+        """
+        labels = suffix.lower().strip(".").split(".")
+        if not all(labels):
+            raise ValueError(f"Invalid domain suffix: {suffix!r}")
+
+        node = self._root
+        for label in reversed(labels):
+            node = node.setdefault(label, {})
+        if _VALUE not in node:
+            self._size += 1
+        node[_VALUE] = (".".join(labels), value)
+
+    def lookup(self, domain: str) -> Optional[Tuple[str, T]]:
+        """
+        Find the most specific suffix matching a domain.
+
+        Args:
+            domain: Lowercased domain (see email_domain)
+
+        Returns:
+            (matched suffix, value), or None if no suffix matches
+        """
+        node = self._root
+        match = None
+        for label in reversed(domain.split(".")):
+            node = node.get(label)
+            if node is None:
+                break
+            match = node.get(_VALUE, match)
+        return match
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __contains__(self, domain: str) -> bool:
+        return self.lookup(domain) is not None
@@ -0,0 +1,159 @@
+"""Bounded-concurrency executor for per-member write operations."""
+
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, Callable, List, NamedTuple, Optional, Sequence
+
+from .governor import DEFAULT_MAX_CONCURRENCY
+
+
+class WriteResult(NamedTuple):
+    """Outcome of one write operation."""
+
+    item: Any
+    ok: bool
+    value: Any = None
+    error: Optional[Exception] = None
+
+
+class Progress(NamedTuple):
+    """Snapshot of a running executor's throughput."""
+
+    done: int
+    total: int
+    succeeded: int
+    failed: int
+    elapsed: float
+
+    @property
+    def rate(self) -> float:
+        """Completed operations per second."""
+        return self.done / self.elapsed if self.elapsed > 0 else 0.0
+
+    @property
+    def eta(self) -> Optional[float]:
+        """Estimated seconds until all operations complete."""
+        if not self.rate:
+            return None
+        return (self.total - self.done) / self.rate
+
+
+def format_progress(progress: Progress) -> str:
+    """
+    Format progress for console output.
+
+    Args:
+        progress: Executor progress
+
+    Returns:
+        One-line summary with throughput and ETA
+    """
+    eta = "?" if progress.eta is None else f"{progress.eta:.0f}s"
+    return (
+        f"{progress.done}/{progress.total} "
+        f"({progress.failed} failed, {progress.rate:.1f}/s, ETA {eta})"
+    )
+
+
+class MemberWriteExecutor:
+    """
+    Run per-member write operations on a thread pool.
+
+    The pool defaults to Mailchimp's per-key connection limit, so every
+    worker can hold a pooled connection. Use it for small-to-medium runs
+    that need immediate per-member results; large backfills are better
+    sent through the /batches endpoint.
+    """
+
+    def __init__(
+        self,
+        max_workers: int = DEFAULT_MAX_CONCURRENCY,
+        on_progress: Optional[Callable[[Progress], None]] = None,
+        progress_interval: float = 1.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Initialize executor.
+
+        Args:
+            max_workers: Number of operations in flight at once
+            on_progress: Called with live progress while operations run
+                and once when all have finished
+            progress_interval: Minimum seconds between progress callbacks
+            clock: Monotonic clock (injectable for tests)
+        """
+        self.max_workers = max_workers
+        self.on_progress = on_progress
+        self.progress_interval = progress_interval
+        self._clock = clock
+
+    def run(
+        self,
+        operation: Callable[[Any], Any],
+        items: Sequence[Any],
+        on_result: Optional[Callable[[WriteResult], None]] = None,
+    ) -> List[WriteResult]:
+        """
+        Apply an operation to every item.
+
+        A failing item is recorded and does not stop the others.
+
+        Args:
+            operation: Function performing the write for one item
+            items: Items to process
+            on_result: Called with each result as soon as it completes
+                (from the calling thread, in completion order)
+
+        Returns:
+            Results in the same order as the items
+        """
+        results: List[Optional[WriteResult]] = [None] * len(items)
+        start = self._clock()
+        last_report = start
+        succeeded = failed = 0
+
+        def call(item: Any) -> WriteResult:
+            try:
+                return WriteResult(item=item, ok=True, value=operation(item))
+            except Exception as error:
+                return WriteResult(item=item, ok=False, error=error)
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            futures = {
+                pool.submit(call, item): index for index, item in enumerate(items)
+            }
+            try:
+                for future in as_completed(futures):
+                    result = future.result()
+                    results[futures[future]] = result
+                    if result.ok:
+                        succeeded += 1
+                    else:
+                        failed += 1
+                    if on_result is not None:
+                        on_result(result)
+
+                    now = self._clock()
+                    if now - last_report >= self.progress_interval:
+                        last_report = now
+                        self._report(succeeded, failed, len(items), now - start)
+            except BaseException:
+                # Let in-flight writes finish but drop those not yet started
+                for future in futures:
+                    future.cancel()
+                raise
+
+        self._report(succeeded, failed, len(items), self._clock() - start)
+        return results
+
+    def _report(self, succeeded: int, failed: int, total: int, elapsed: float) -> None:
+        if self.on_progress is not None:
+            self.on_progress(
+                Progress(
+                    done=succeeded + failed,
+                    total=total,
+                    succeeded=succeeded,
+                    failed=failed,
+                    elapsed=elapsed,
+                )
+            )
@@ -0,0 +1,192 @@
+"""Streaming CSV export with optional sorting and compression."""
+
+import csv
+import gzip
+import heapq
+import io
+import json
+import shutil
+import tempfile
+from pathlib import Path
+from typing import IO, Any, Callable, Dict, Iterable, Iterator, List, Optional, Union
+
+# Rows a sorted sink holds in memory before spilling a sorted run to disk
+DEFAULT_BUFFER_ROWS = 50_000
+
+COMPRESSIONS = {".gz": "gzip", ".zst": "zstd"}
+
+
+def compression_for(path: Union[str, Path]) -> Optional[str]:
+    """
+    Infer the compression of an output file from its suffix.
+
+    Args:
+        path: Output file (e.g. "members.csv.gz")
+
+    Returns:
+        "gzip", "zstd" or None for plain text
+    """
+    return COMPRESSIONS.get(Path(path).suffix)
+
+
+def open_output(path: Union[str, Path], compression: Optional[str] = None) -> IO[str]:
+    """
+    Open a text file for writing, optionally compressed.
+
+    Args:
+        path: Output file
+        compression: "gzip", "zstd" (needs the zstandard package) or None
+
+    Returns:
+        Text stream ready for csv.writer
+
+    Raises:
+        ValueError: If the compression is not supported
+        ImportError: If zstd is requested without zstandard installed
+    """
+    if compression is None:
+        return open(path, "w", newline="", encoding="utf-8")
+    if compression == "gzip":
+        return gzip.open(path, "wt", newline="", encoding="utf-8")
+    if compression == "zstd":
+        try:
+            import zstandard
+        except ImportError as error:
+            raise ImportError(
+                "zstd output requires the zstandard package "
+                "(pip install policyengine-newsletter-uploader[zstd])"
+            ) from error
+        return io.TextIOWrapper(
+            zstandard.ZstdCompressor().stream_writer(open(path, "wb")),
+            encoding="utf-8",
+            newline="",
+        )
+    raise ValueError(f"Unsupported compression: {compression!r}")
+
+
+class CSVSink:
+    """
+    Write rows to a CSV file as they are produced.
+
+    Unsorted rows go straight to the file. With a sort key, rows are
+    buffered up to buffer_rows; beyond that each full buffer is sorted and
+    spilled to a temporary run file, and the runs are merged into the
+    output on close. Memory therefore stays bounded by buffer_rows however
+    many rows are written, and the sort is stable.
+    """
+
+    def __init__(
+        self,
+        path: Union[str, Path],
+        fieldnames: Iterable[str],
+        sort_key: Optional[Callable[[Dict], Any]] = None,
+        compression: Optional[str] = None,
+        buffer_rows: int = DEFAULT_BUFFER_ROWS,
+    ):
+        """
+        Open a sink.
+
+        Args:
+            path: Output file
+            fieldnames: CSV columns, in order
+            sort_key: Key to sort rows by (rows are written in arrival order
+                without one). Must accept rows whose values have been
+                round-tripped through JSON.
+            compression: "gzip", "zstd" or None (defaults to the path's
+                suffix, see compression_for)
+            buffer_rows: Most rows held in memory while sorting
+
+        Raises:
+            ValueError: If buffer_rows is not positive
+        """
+        if buffer_rows < 1:
+            raise ValueError("buffer_rows must be at least 1")
+        self.path = Path(path)
+        self.fieldnames = list(fieldnames)
+        self.sort_key = sort_key
+        self.compression = compression or compression_for(path)
+        self.buffer_rows = buffer_rows
+        self.rows = 0
+        self.runs: List[Path] = []
+
+        self._buffer: List[Dict] = []
+        self._run_dir: Optional[str] = None
+        self._closed = False
+        # Opened up front so a bad path or compression fails before any work
+        self._file = open_output(self.path, self.compression)
+        self._writer = csv.DictWriter(self._file, fieldnames=self.fieldnames)
+        self._writer.writeheader()
+
+    def write(self, row: Dict) -> None:
+        """
+        Add a row.
+
+        Args:
+            row: Values by column name
+        """
+        self.rows += 1
+        if self.sort_key is None:
+            self._writer.writerow(row)
+            return
+        self._buffer.append(row)
+        if len(self._buffer) >= self.buffer_rows:
+            self._spill()
+
+    def write_rows(self, rows: Iterable[Dict]) -> None:
+        """Add several rows. See write."""
+        for row in rows:
+            self.write(row)
+
+    def _spill(self) -> None:
+        if self._run_dir is None:
+            self._run_dir = tempfile.mkdtemp(prefix="csv-sort-")
+        self._buffer.sort(key=self.sort_key)
+        run = Path(self._run_dir) / f"run-{len(self.runs)}.jsonl"
+        with open(run, "w", encoding="utf-8") as f:
+            for row in self._buffer:
+                f.write(json.dumps(row))
+                f.write("\n")
+        self.runs.append(run)
+        self._buffer = []
+
+    def _sorted_rows(self) -> Iterator[Dict]:
+        if not self.runs:
+            self._buffer.sort(key=self.sort_key)
+            return iter(self._buffer)
+        if self._buffer:
+            self._spill()
+        # Runs are merged in spill order, so equal keys keep arrival order
+        return heapq.merge(*map(_read_run, self.runs), key=self.sort_key)
+
+    def close(self) -> int:
+        """
+        Finish the file, merging sorted runs if there are any.
+
+        Returns:
+            Number of rows written
+        """
+        if self._closed:
+            return self.rows
+        self._closed = True
+        try:
+            if self.sort_key is not None:
+                self._writer.writerows(self._sorted_rows())
+                self._buffer = []
+        finally:
+            self._file.close()
+            if self._run_dir is not None:
+                shutil.rmtree(self._run_dir, ignore_errors=True)
+                self._run_dir = None
+        return self.rows
+
+    def __enter__(self) -> "CSVSink":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+
+def _read_run(path: Path) -> Iterator[Dict]:
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            yield json.loads(line)
@@ -0,0 +1,206 @@
+"""Rate-limit-aware request governor for the Mailchimp API."""
+
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Callable, Optional
+
+import requests
+
+# Mailchimp allows 10 simultaneous connections per API key
+DEFAULT_MAX_CONCURRENCY = 10
+DEFAULT_MAX_RETRIES = 5
+
+TOO_MANY_REQUESTS = 429
+
+
+class GovernorStats:
+    """Running totals of governed requests and the time they spent waiting."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.retries = 0
+        self.queue_wait = 0.0
+        self.backoff_wait = 0.0
+
+    @property
+    def total_wait(self) -> float:
+        """Seconds spent queued for a slot plus seconds spent backing off."""
+        return self.queue_wait + self.backoff_wait
+
+    def record_request(self, queue_wait: float) -> None:
+        with self._lock:
+            self.requests += 1
+            self.queue_wait += queue_wait
+
+    def record_retry(self, backoff_wait: float) -> None:
+        with self._lock:
+            self.retries += 1
+            self.backoff_wait += backoff_wait
+
+    def __repr__(self) -> str:
+        return (
+            f"GovernorStats(requests={self.requests}, retries={self.retries}, "
+            f"queue_wait={self.queue_wait:.2f}s, "
+            f"backoff_wait={self.backoff_wait:.2f}s)"
+        )
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    Parse a Retry-After header value.
+
+    Args:
+        value: Header value, either delay seconds or an HTTP date
+
+    Returns:
+        Seconds to wait, or None if the header is missing or invalid
+    """
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, retry_at.timestamp() - time.time())
+
+
+class RequestGovernor:
+    """
+    Cap in-flight requests and retry rate-limited or failed calls.
+
+    Calls beyond ``max_concurrency`` wait for a free slot. A 429 response
+    pauses every caller until the ``Retry-After`` delay has passed; 429 and
+    5xx responses are retried with jittered exponential backoff.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        max_retries: int = DEFAULT_MAX_RETRIES,
+        backoff_base: float = 1.0,
+        backoff_max: float = 60.0,
+        sleep: Callable[[float], None] = time.sleep,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Initialize request governor.
+
+        Args:
+            max_concurrency: Maximum number of requests in flight at once
+            max_retries: Maximum retries per call before giving up
+            backoff_base: Base delay in seconds for exponential backoff
+            backoff_max: Upper bound in seconds for computed backoff delays
+            sleep: Sleep function (injectable for tests)
+            clock: Monotonic clock (injectable for tests)
+        """
+        self.max_concurrency = max_concurrency
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.stats = GovernorStats()
+
+        self._sleep = sleep
+        self._clock = clock
+        self._condition = threading.Condition()
+        self._in_flight = 0
+        self._queued = 0
+        self._paused_until = 0.0
+
+    @property
+    def in_flight(self) -> int:
+        """Number of requests currently being sent."""
+        return self._in_flight
+
+    @property
+    def queued(self) -> int:
+        """Number of calls waiting for a free slot."""
+        return self._queued
+
+    def call(
+        self,
+        send: Callable[[], requests.Response],
+        retry_server_errors: bool = True,
+    ) -> requests.Response:
+        """
+        Send a request under the concurrency cap, retrying when throttled.
+
+        Args:
+            send: Function performing the request
+            retry_server_errors: Also retry 5xx responses. Disable for
+                non-idempotent requests that may have been applied.
+
+        Returns:
+            The final response, which may still be an error response once
+            retries are exhausted
+        """
+        attempt = 0
+        while True:
+            self._acquire()
+            try:
+                response = send()
+            finally:
+                self._release()
+
+            if attempt >= self.max_retries or not self._should_retry(
+                response, retry_server_errors
+            ):
+                return response
+
+            delay = self._backoff_delay(response, attempt)
+            # Release the connection of a streamed response before waiting,
+            # or a blocking pool runs out of connections for the retry
+            response.close()
+            if response.status_code == TOO_MANY_REQUESTS:
+                self._pause(delay)
+            self._sleep(delay)
+            self.stats.record_retry(delay)
+            attempt += 1
+
+    def _acquire(self) -> None:
+        start = self._clock()
+        with self._condition:
+            self._queued += 1
+            while True:
+                if self._in_flight < self.max_concurrency:
+                    remaining = self._paused_until - self._clock()
+                    if remaining <= 0:
+                        break
+                    self._condition.wait(remaining)
+                else:
+                    self._condition.wait()
+            self._queued -= 1
+            self._in_flight += 1
+        self.stats.record_request(self._clock() - start)
+
+    def _release(self) -> None:
+        with self._condition:
+            self._in_flight -= 1
+            self._condition.notify_all()
+
+    def _pause(self, delay: float) -> None:
+        with self._condition:
+            self._paused_until = max(self._paused_until, self._clock() + delay)
+
+    def _should_retry(
+        self, response: requests.Response, retry_server_errors: bool
+    ) -> bool:
+        if response.status_code == TOO_MANY_REQUESTS:
+            return True
+        return retry_server_errors and response.status_code >= 500
+
+    def _backoff_delay(self, response: requests.Response, attempt: int) -> float:
+        jitter = random.uniform(0, self.backoff_base)
+        retry_after = parse_retry_after(response.headers.get("Retry-After"))
+        if retry_after is not None:
+            return retry_after + jitter
+
+        # Full jitter: spread retries across the whole backoff window
+        window = min(self.backoff_max, self.backoff_base * 2**attempt)
+        return random.uniform(0, window)
@@ -0,0 +1,192 @@
+"""On-disk journal of planned member writes and their outcomes."""
+
+import json
+import os
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Iterable, List, NamedTuple, Optional, Union
+
+JOURNAL_VERSION = 1
+
+
+class JournalSummary(NamedTuple):
+    """Counts of planned and acknowledged operations."""
+
+    planned: int
+    succeeded: int
+    failed: int
+
+    @property
+    def pending(self) -> int:
+        """Operations that have not succeeded yet."""
+        return self.planned - self.succeeded
+
+
+class WriteJournal:
+    """
+    JSON-lines journal for a bulk member update job.
+
+    The first line is a header, followed by one line per planned operation.
+    Each outcome is appended as it is acknowledged, so after a crash the
+    journal shows exactly which operations still need sending. Failed
+    operations count as pending and are retried on resume.
+    """
+
+    def __init__(self, path: Union[str, Path], key: str = "id"):
+        """
+        Initialize journal.
+
+        Args:
+            path: Journal file
+            key: Item field that identifies an operation (e.g. the member ID)
+        """
+        self.path = Path(path)
+        self.key = key
+        self.created: Optional[str] = None
+        self._planned: Dict[str, Dict] = {}
+        self._outcomes: Dict[str, Optional[str]] = {}
+        self._file = None
+
+    def exists(self) -> bool:
+        """Whether a journal has been written at the path."""
+        return self.path.exists()
+
+    def begin(self, items: Iterable[Dict]) -> None:
+        """
+        Start a new job, replacing any previous journal.
+
+        Args:
+            items: Planned operations (dicts containing the key field)
+        """
+        self.close()
+        self.created = datetime.now(timezone.utc).isoformat(timespec="seconds")
+        self._planned = {}
+        self._outcomes = {}
+
+        # Write the plan next to the destination, then swap, so a crash
+        # never leaves a half-written plan behind
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        staging = self.path.with_name(f".{self.path.name}.tmp")
+        with open(staging, "w", encoding="utf-8") as f:
+            header = {
+                "version": JOURNAL_VERSION,
+                "key": self.key,
+                "created": self.created,
+            }
+            f.write(json.dumps(header) + "\n")
+            for item in items:
+                self._planned[item[self.key]] = item
+                f.write(json.dumps({"planned": item}) + "\n")
+        os.replace(staging, self.path)
+
+    def load(self) -> JournalSummary:
+        """
+        Read an existing journal.
+
+        Lines that cannot be decoded (e.g. torn by a crash mid-write) are
+        skipped; their operations are treated as unacknowledged.
+
+        Returns:
+            Summary of the journal's state
+
+        Raises:
+            FileNotFoundError: If there is no journal at the path
+            ValueError: If the journal was written in an unsupported format
+        """
+        self.close()
+        self._planned = {}
+        self._outcomes = {}
+
+        with open(self.path, encoding="utf-8") as f:
+            header = json.loads(f.readline())
+            if header.get("version") != JOURNAL_VERSION:
+                raise ValueError(
+                    f"Unsupported journal version: {header.get('version')}"
+                )
+            self.key = header["key"]
+            self.created = header["created"]
+
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue
+                if "planned" in entry:
+                    self._planned[entry["planned"][self.key]] = entry["planned"]
+                else:
+                    self._outcomes[entry["key"]] = entry.get("error")
+
+        return self.summary()
+
+    def record(self, key: str, ok: bool, error: Optional[str] = None) -> None:
+        """
+        Append an operation's outcome.
+
+        Each entry is flushed before returning, so it survives the process
+        being killed.
+
+        Args:
+            key: Identifier of the operation
+            ok: Whether the operation succeeded
+            error: Failure detail
+        """
+        if self._file is None:
+            self._file = self._open_for_append()
+        entry = {"key": key, "ok": ok}
+        if not ok:
+            entry["error"] = error or "failed"
+        self._file.write(json.dumps(entry) + "\n")
+        self._file.flush()
+        self._outcomes[key] = None if ok else entry["error"]
+
+    def _open_for_append(self):
+        torn = False
+        with open(self.path, "rb") as f:
+            if f.seek(0, os.SEEK_END) > 0:
+                f.seek(-1, os.SEEK_END)
+                torn = f.read(1) != b"\n"
+        f = open(self.path, "a", encoding="utf-8")
+        # Start a fresh line if the last write was torn
+        if torn:
+            f.write("\n")
+        return f
+
+    def pending(self) -> List[Dict]:
+        """
+        Planned operations that have not succeeded.
+
+        Returns:
+            Items in planned order
+        """
+        return [
+            item
+            for key, item in self._planned.items()
+            if key not in self._outcomes or self._outcomes[key] is not None
+        ]
+
+    def failures(self) -> Dict[str, str]:
+        """Error detail of the latest failed attempt, by operation key."""
+        return {
+            key: error for key, error in self._outcomes.items() if error is not None
+        }
+
+    def summary(self) -> JournalSummary:
+        """Count planned and acknowledged operations."""
+        failed = len(self.failures())
+        return JournalSummary(
+            planned=len(self._planned),
+            succeeded=len(self._outcomes) - failed,
+            failed=failed,
+        )
+
+    def close(self) -> None:
+        """Close the journal file."""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def __enter__(self) -> "WriteJournal":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
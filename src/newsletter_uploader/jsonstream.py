@@ -0,0 +1,117 @@
+"""Incremental decoding of large JSON arrays from a stream of chunks."""
+
+import codecs
+import json
+from typing import Any, Iterable, Iterator, Union
+
+_WHITESPACE = " \t\n\r"
+
+_decoder = json.JSONDecoder()
+
+
+class _Buffer:
+    """Decoded text from a chunk stream, consumed from the front."""
+
+    def __init__(self, chunks: Iterable[Union[bytes, str]]):
+        self._chunks = iter(chunks)
+        self._utf8 = codecs.getincrementaldecoder("utf-8")()
+        self.text = ""
+        self.pos = 0
+        self.eof = False
+
+    def fill(self) -> bool:
+        """Append the next chunk, returning False at the end of the stream."""
+        if self.eof:
+            return False
+        # Drop consumed text so the buffer only holds the current value
+        self.text = self.text[self.pos :]
+        self.pos = 0
+        for chunk in self._chunks:
+            if isinstance(chunk, bytes):
+                chunk = self._utf8.decode(chunk)
+            if chunk:
+                self.text += chunk
+                return True
+        self.text += self._utf8.decode(b"", final=True)
+        self.eof = True
+        return False
+
+    def peek(self) -> str:
+        """Next non-whitespace character, or "" at the end of the stream."""
+        while True:
+            while self.pos < len(self.text) and self.text[self.pos] in _WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.text):
+                return self.text[self.pos]
+            if not self.fill():
+                return ""
+
+    def expect(self, characters: str) -> str:
+        """Consume the next non-whitespace character, which must be one of these."""
+        character = self.peek()
+        if not character or character not in characters:
+            raise ValueError(
+                f"Expected one of {characters!r} at offset {self.pos}, "
+                f"found {character or 'end of input'!r}"
+            )
+        self.pos += 1
+        return character
+
+    def value(self) -> Any:
+        """Decode the next complete JSON value, reading more as needed."""
+        self.peek()
+        while True:
+            try:
+                value, end = _decoder.raw_decode(self.text, self.pos)
+            except json.JSONDecodeError:
+                if self.fill():
+                    continue
+                raise
+            # A number ending at the buffer's end may continue in the next chunk
+            if end == len(self.text) and self.fill():
+                continue
+            self.pos = end
+            return value
+
+
+def iter_array(chunks: Iterable[Union[bytes, str]], key: str) -> Iterator[Any]:
+    """
+    Yield the items of an array in a top-level JSON object as they arrive.
+
+    Only one item is decoded at a time, so memory is bounded by the largest
+    item rather than the whole document, and callers can start on the
+    first item while the rest is still being received. Other keys in the
+    object are decoded and discarded.
+
+    Args:
+        chunks: The document as bytes (UTF-8) or text chunks, e.g.
+            response.iter_content()
+        key: Key of the array to stream (e.g. "members")
+
+    Yields:
+        Decoded array items, in order
+
+    Raises:
+        ValueError: If the document is not valid JSON, is not an object,
+            or the key does not hold an array
+    """
+    buffer = _Buffer(chunks)
+    buffer.expect("{")
+    if buffer.peek() == "}":
+        return
+    while True:
+        name = buffer.value()
+        buffer.expect(":")
+        if name != key:
+            buffer.value()
+        else:
+            buffer.expect("[")
+            if buffer.peek() == "]":
+                buffer.pos += 1
+            else:
+                while True:
+                    yield buffer.value()
+                    if buffer.expect(",]") == "]":
+                        break
+        if buffer.expect(",}") == "}":
+            return
@@ -1,28 +1,201 @@
 """Mailchimp API client for campaign management."""
 
-from typing import Dict, Optional
+import functools
+import hashlib
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, Iterable, Iterator, List, Optional
 
 import requests
+from requests.adapters import HTTPAdapter
+
+from .governor import DEFAULT_MAX_CONCURRENCY, GovernorStats, RequestGovernor
+from .jsonstream import iter_array
+
+DEFAULT_POOL_SIZE = DEFAULT_MAX_CONCURRENCY
+DEFAULT_TIMEOUT = 30.0
+
+# Largest page size the members endpoint accepts
+MAX_PAGE_SIZE = 1000
+
+# Bytes read at a time when decoding streamed members pages
+STREAM_CHUNK_SIZE = 64 * 1024
+
+# Member fields read by the audience scripts
+MEMBER_FIELDS = (
+    "id",
+    "email_address",
+    "status",
+    "merge_fields.FNAME",
+    "merge_fields.LNAME",
+    "merge_fields.COUNTRY",
+    "location",
+    "tags",
+    "timestamp_opt",
+)
+
+
+def member_fields_param(fields: Iterable[str]) -> str:
+    """
+    Build a fields/exclude_fields query value for the members endpoint.
+
+    Args:
+        fields: Member-level field paths (e.g. "merge_fields.COUNTRY")
+
+    Returns:
+        Comma-separated paths qualified with the "members." prefix
+    """
+    return ",".join(
+        field if field.startswith("members.") else f"members.{field}"
+        for field in fields
+    )
+
+
+def subscriber_hash(email: str) -> str:
+    """
+    Get the Mailchimp subscriber hash for an email address.
+
+    Args:
+        email: Subscriber email address
+
+    Returns:
+        MD5 hex digest of the lowercased email address
+    """
+    return hashlib.md5(email.lower().encode()).hexdigest()
+
+
+class MailchimpAPIError(Exception):
+    """Raised when the Mailchimp API returns an unsuccessful response."""
+
+    def __init__(self, action: str, response: requests.Response):
+        """
+        Initialize API error.
+
+        Args:
+            action: Description of the failed operation (e.g. "creating campaign")
+            response: The unsuccessful response
+        """
+        self.status_code = response.status_code
+        self.text = response.text
+        super().__init__(f"Error {action}: {self.status_code}\n{self.text}")
+
+
+def _discard_response(pending: "Future[requests.Response]") -> None:
+    # Release a prefetched streamed response that will not be read. Its
+    # failure (API error, timeout, reset connection) no longer matters and
+    # must not replace an exception already propagating.
+    try:
+        pending.result().close()
+    except Exception:
+        pass
 
 
 class MailchimpClient:
     """Client for interacting with Mailchimp API."""
 
-    def __init__(self, api_key: str, list_id: str):
+    def __init__(
+        self,
+        api_key: str,
+        list_id: str,
+        pool_size: int = DEFAULT_POOL_SIZE,
+        timeout: float = DEFAULT_TIMEOUT,
+        keep_alive: bool = True,
+        governor: Optional[RequestGovernor] = None,
+    ):
         """
         Initialize Mailchimp client.
 
+        All requests share one HTTP session, so connections to the
+        datacenter are reused instead of re-handshaking on every call.
+
         Args:
             api_key: Mailchimp API key (format: key-datacenter)
             list_id: Mailchimp list/audience ID
+            pool_size: Maximum number of pooled connections to keep open
+            timeout: Per-request timeout in seconds
+            keep_alive: Reuse connections between requests
+            governor: Request governor (defaults to one capped at pool_size)
         """
         self.api_key = api_key
         self.list_id = list_id
+        self.timeout = timeout
 
         # Extract datacenter from API key (e.g., "us5" from "key-us5")
         datacenter = api_key.split("-")[-1]
         self.base_url = f"https://{datacenter}.api.mailchimp.com/3.0"
 
+        self.session = self._build_session(pool_size, keep_alive)
+        self.governor = governor or RequestGovernor(max_concurrency=pool_size)
+
+    def _build_session(self, pool_size: int, keep_alive: bool) -> requests.Session:
+        """
+        Build the pooled session shared by all requests.
+
+        Args:
+            pool_size: Maximum number of pooled connections
+            keep_alive: Reuse connections between requests
+
+        Returns:
+            Session with auth and connection pool configured
+        """
+        session = requests.Session()
+        session.auth = ("anystring", self.api_key)
+        if not keep_alive:
+            session.headers["Connection"] = "close"
+
+        # Block rather than open extra connections beyond the pool size
+        adapter = HTTPAdapter(
+            pool_connections=1, pool_maxsize=pool_size, pool_block=True
+        )
+        session.mount("https://", adapter)
+        return session
+
+    @property
+    def stats(self) -> GovernorStats:
+        """Request counts and time spent queued or backing off."""
+        return self.governor.stats
+
+    def close(self) -> None:
+        """Close pooled connections."""
+        self.session.close()
+
+    def __enter__(self) -> "MailchimpClient":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+    def _request(
+        self, method: str, path: str, action: str, expected: int = 200, **kwargs
+    ):
+        """
+        Send a request through the pooled session.
+
+        Args:
+            method: HTTP method
+            path: API path relative to the base URL
+            action: Description used in error messages (e.g. "creating campaign")
+            expected: Status code of a successful response
+            **kwargs: Extra arguments passed to requests
+
+        Returns:
+            Response object
+
+        Raises:
+            MailchimpAPIError: If the response is not successful after retries
+        """
+        kwargs.setdefault("timeout", self.timeout)
+        url = f"{self.base_url}{path}"
+        response = self.governor.call(
+            lambda: self.session.request(method, url, **kwargs),
+            # A failed POST may already have been applied, so only retry 429s
+            retry_server_errors=method != "POST",
+        )
+
+        if response.status_code != expected:
+            raise MailchimpAPIError(action, response)
+
+        return response
+
     def create_campaign(
         self,
         subject: str,
@@ -47,7 +220,7 @@ class MailchimpClient:
             Campaign data from Mailchimp API
 
         Raises:
-            Exception: If campaign creation fails
+            MailchimpAPIError: If campaign creation fails
         """
         campaign_data = {
             "type": "regular",
@@ -67,17 +240,10 @@ class MailchimpClient:
         if segment_opts:
             campaign_data["recipients"]["segment_opts"] = segment_opts
 
-        response = requests.post(
-            f"{self.base_url}/campaigns",
-            auth=("anystring", self.api_key),
-            json=campaign_data,
+        response = self._request(
+            "POST", "/campaigns", "creating campaign", json=campaign_data
         )
 
-        if response.status_code != 200:
-            raise Exception(
-                f"Error creating campaign: {response.status_code}\n{response.text}"
-            )
-
         return response.json()
 
     def upload_content(self, campaign_id: str, html_content: str) -> None:
@@ -89,19 +255,15 @@ class MailchimpClient:
             html_content: HTML content to upload
 
         Raises:
-            Exception: If content upload fails
+            MailchimpAPIError: If content upload fails
         """
-        response = requests.put(
-            f"{self.base_url}/campaigns/{campaign_id}/content",
-            auth=("anystring", self.api_key),
+        self._request(
+            "PUT",
+            f"/campaigns/{campaign_id}/content",
+            "uploading content",
             json={"html": html_content},
         )
 
-        if response.status_code != 200:
-            raise Exception(
-                f"Error uploading content: {response.status_code}\n{response.text}"
-            )
-
     def update_campaign(
         self,
         campaign_id: str,
@@ -124,7 +286,7 @@ class MailchimpClient:
             Updated campaign data from Mailchimp API
 
         Raises:
-            Exception: If campaign update fails
+            MailchimpAPIError: If campaign update fails
         """
         settings = {}
         if subject is not None:
@@ -140,17 +302,13 @@ class MailchimpClient:
         if settings:
             update_data["settings"] = settings
 
-        response = requests.patch(
-            f"{self.base_url}/campaigns/{campaign_id}",
-            auth=("anystring", self.api_key),
+        response = self._request(
+            "PATCH",
+            f"/campaigns/{campaign_id}",
+            "updating campaign",
             json=update_data,
         )
 
-        if response.status_code != 200:
-            raise Exception(
-                f"Error updating campaign: {response.status_code}\n{response.text}"
-            )
-
         return response.json()
 
     def _get_campaign(self, campaign_id: str) -> Dict:
@@ -164,16 +322,399 @@ class MailchimpClient:
             Campaign data from Mailchimp API
 
         Raises:
-            Exception: If request fails
+            MailchimpAPIError: If request fails
+        """
+        response = self._request("GET", f"/campaigns/{campaign_id}", "getting campaign")
+
+        return response.json()
+
+    def list_members(
+        self,
+        count: int = MAX_PAGE_SIZE,
+        offset: int = 0,
+        status: Optional[str] = None,
+        fields: Optional[Iterable[str]] = None,
+        exclude_fields: Optional[Iterable[str]] = None,
+        since_last_changed: Optional[str] = None,
+    ) -> Dict:
         """
-        response = requests.get(
-            f"{self.base_url}/campaigns/{campaign_id}",
-            auth=("anystring", self.api_key),
+        Get one page of list members.
+
+        Filtering and projection happen server-side, so only the requested
+        members and fields are sent over the wire.
+
+        Args:
+            count: Number of members to return (at most 1000)
+            offset: Number of members to skip
+            status: Only return members with this status (e.g. "subscribed")
+            fields: Member fields to return (e.g. MEMBER_FIELDS)
+            exclude_fields: Member fields to leave out (e.g. ["_links"])
+            since_last_changed: Only return members changed after this
+                ISO 8601 timestamp
+
+        Returns:
+            Members page from Mailchimp API
+
+        Raises:
+            MailchimpAPIError: If request fails
+        """
+        response = self._request(
+            "GET",
+            f"/lists/{self.list_id}/members",
+            "listing members",
+            params=self._member_params(
+                count, offset, status, fields, exclude_fields, since_last_changed
+            ),
+        )
+
+        return response.json()
+
+    def _member_params(
+        self,
+        count: int,
+        offset: int,
+        status: Optional[str],
+        fields: Optional[Iterable[str]],
+        exclude_fields: Optional[Iterable[str]],
+        since_last_changed: Optional[str],
+    ) -> Dict:
+        params = {"count": count, "offset": offset}
+        if status is not None:
+            params["status"] = status
+        if fields is not None:
+            params["fields"] = member_fields_param(fields)
+        if exclude_fields is not None:
+            params["exclude_fields"] = member_fields_param(exclude_fields)
+        if since_last_changed is not None:
+            params["since_last_changed"] = since_last_changed
+        return params
+
+    def _open_member_page(
+        self,
+        count: int,
+        offset: int,
+        status: Optional[str] = None,
+        fields: Optional[Iterable[str]] = None,
+        exclude_fields: Optional[Iterable[str]] = None,
+        since_last_changed: Optional[str] = None,
+    ) -> requests.Response:
+        """Send a members request, leaving the body unread."""
+        return self._request(
+            "GET",
+            f"/lists/{self.list_id}/members",
+            "listing members",
+            params=self._member_params(
+                count, offset, status, fields, exclude_fields, since_last_changed
+            ),
+            stream=True,
         )
 
-        if response.status_code != 200:
-            raise Exception(
-                f"Error getting campaign: {response.status_code}\n{response.text}"
+    @staticmethod
+    def _decode_members(response: requests.Response) -> Iterator[Dict]:
+        """Decode a streamed members page one member at a time."""
+        try:
+            chunks = response.iter_content(chunk_size=STREAM_CHUNK_SIZE)
+            yield from iter_array(chunks, "members")
+        finally:
+            response.close()
+
+    def stream_members(
+        self,
+        count: int = MAX_PAGE_SIZE,
+        offset: int = 0,
+        status: Optional[str] = None,
+        fields: Optional[Iterable[str]] = None,
+        exclude_fields: Optional[Iterable[str]] = None,
+        since_last_changed: Optional[str] = None,
+    ) -> Iterator[Dict]:
+        """
+        Get one page of list members, decoding them as the body arrives.
+
+        Unlike list_members, the page is never decoded as a whole: each
+        member is yielded as soon as its bytes have been received, so
+        parsing overlaps the transfer and only one member's JSON is held at
+        a time.
+
+        Args:
+            count: Number of members to return (at most 1000)
+            offset: Number of members to skip
+            status: Only return members with this status (e.g. "subscribed")
+            fields: Member fields to return (e.g. MEMBER_FIELDS)
+            exclude_fields: Member fields to leave out (e.g. ["_links"])
+            since_last_changed: Only return members changed after this
+                ISO 8601 timestamp
+
+        Yields:
+            Member dicts from Mailchimp API
+
+        Raises:
+            MailchimpAPIError: If request fails
+        """
+        response = self._open_member_page(
+            count, offset, status, fields, exclude_fields, since_last_changed
+        )
+        yield from self._decode_members(response)
+
+    def iter_member_pages(
+        self,
+        page_size: int = MAX_PAGE_SIZE,
+        prefetch: bool = True,
+        status: Optional[str] = None,
+        fields: Optional[Iterable[str]] = None,
+        exclude_fields: Optional[Iterable[str]] = None,
+        since_last_changed: Optional[str] = None,
+    ) -> Iterator[List[Dict]]:
+        """
+        Iterate over all list members one page at a time.
+
+        While the caller processes a page, the next one is fetched in the
+        background so network time overlaps with processing.
+
+        Args:
+            page_size: Members per request (at most 1000)
+            prefetch: Fetch the next page while the current one is processed
+            status: Only return members with this status (e.g. "subscribed")
+            fields: Member fields to return (e.g. MEMBER_FIELDS)
+            exclude_fields: Member fields to leave out (e.g. ["_links"])
+            since_last_changed: Only return members changed after this
+                ISO 8601 timestamp
+
+        Yields:
+            Lists of member dicts from Mailchimp API
+
+        Raises:
+            MailchimpAPIError: If a page request fails
+        """
+        fetch = functools.partial(
+            self.list_members,
+            page_size,
+            status=status,
+            fields=fields,
+            exclude_fields=exclude_fields,
+            since_last_changed=since_last_changed,
+        )
+
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            offset = 0
+            pending = executor.submit(fetch, offset=offset)
+            while pending is not None:
+                members = pending.result().get("members", [])
+
+                # A short page is the last one
+                has_more = len(members) == page_size
+                offset += page_size
+                pending = None
+                if has_more and prefetch:
+                    pending = executor.submit(fetch, offset=offset)
+
+                if members:
+                    yield members
+
+                if has_more and not prefetch:
+                    pending = executor.submit(fetch, offset=offset)
+
+    def iter_members(
+        self,
+        page_size: int = MAX_PAGE_SIZE,
+        prefetch: bool = True,
+        status: Optional[str] = None,
+        fields: Optional[Iterable[str]] = None,
+        exclude_fields: Optional[Iterable[str]] = None,
+        since_last_changed: Optional[str] = None,
+        stream: bool = False,
+    ) -> Iterator[Dict]:
+        """
+        Iterate over all list members without loading the whole list.
+
+        Args:
+            page_size: Members per request (at most 1000)
+            prefetch: Fetch the next page while the current one is processed
+            status: Only return members with this status (e.g. "subscribed")
+            fields: Member fields to return (e.g. MEMBER_FIELDS)
+            exclude_fields: Member fields to leave out (e.g. ["_links"])
+            since_last_changed: Only return members changed after this
+                ISO 8601 timestamp
+            stream: Decode each page incrementally as it arrives (see
+                stream_members) instead of all at once
+
+        Yields:
+            Member dicts from Mailchimp API
+
+        Raises:
+            MailchimpAPIError: If a page request fails
+        """
+        if stream:
+            yield from self._iter_streamed_members(
+                page_size,
+                prefetch,
+                status=status,
+                fields=fields,
+                exclude_fields=exclude_fields,
+                since_last_changed=since_last_changed,
             )
+            return
+
+        pages = self.iter_member_pages(
+            page_size=page_size,
+            prefetch=prefetch,
+            status=status,
+            fields=fields,
+            exclude_fields=exclude_fields,
+            since_last_changed=since_last_changed,
+        )
+        for page in pages:
+            yield from page
+
+    def _iter_streamed_members(
+        self, page_size: int, prefetch: bool, **filters
+    ) -> Iterator[Dict]:
+        open_page = functools.partial(self._open_member_page, page_size, **filters)
+
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            offset = 0
+            pending = executor.submit(open_page, offset=offset)
+            try:
+                while pending is not None:
+                    response = pending.result()
+                    offset += page_size
+
+                    # Page size is only known once the body has been read,
+                    # so the next page is requested speculatively and
+                    # discarded if this page turns out to be the last
+                    pending = (
+                        executor.submit(open_page, offset=offset) if prefetch else None
+                    )
+
+                    received = 0
+                    for member in self._decode_members(response):
+                        received += 1
+                        yield member
+
+                    if received < page_size:
+                        break
+                    if pending is None:
+                        pending = executor.submit(open_page, offset=offset)
+            finally:
+                if pending is not None:
+                    _discard_response(pending)
+
+    def update_member(self, member_id: str, data: Dict) -> Dict:
+        """
+        Update a list member.
+
+        Args:
+            member_id: Subscriber hash (see subscriber_hash) or email address
+            data: Member fields to update (e.g. {"merge_fields": {...}})
+
+        Returns:
+            Updated member data from Mailchimp API
+
+        Raises:
+            MailchimpAPIError: If member update fails
+        """
+        if "@" in member_id:
+            member_id = subscriber_hash(member_id)
+
+        response = self._request(
+            "PATCH",
+            f"/lists/{self.list_id}/members/{member_id}",
+            "updating member",
+            json=data,
+        )
+
+        return response.json()
+
+    def update_member_tags(
+        self,
+        member_id: str,
+        add: Iterable[str] = (),
+        remove: Iterable[str] = (),
+    ) -> None:
+        """
+        Add and remove tags on a list member.
+
+        Args:
+            member_id: Subscriber hash (see subscriber_hash) or email address
+            add: Tag names to add
+            remove: Tag names to remove
+
+        Raises:
+            MailchimpAPIError: If the tag update fails
+        """
+        if "@" in member_id:
+            member_id = subscriber_hash(member_id)
+
+        tags = [{"name": name, "status": "active"} for name in add]
+        tags += [{"name": name, "status": "inactive"} for name in remove]
+
+        self._request(
+            "POST",
+            f"/lists/{self.list_id}/members/{member_id}/tags",
+            "updating member tags",
+            expected=204,
+            json={"tags": tags},
+        )
+
+    def batch_subscribe(
+        self, members: List[Dict], update_existing: bool = True
+    ) -> Dict:
+        """
+        Add or update up to 500 list members in one request.
+
+        Args:
+            members: Member dicts with email_address, merge_fields and
+                status_if_new (status would also change existing members')
+            update_existing: Update members that are already in the list
+
+        Returns:
+            Totals and per-email errors from Mailchimp API (the created and
+            updated member objects are not requested)
+
+        Raises:
+            MailchimpAPIError: If the request fails as a whole
+        """
+        response = self._request(
+            "POST",
+            f"/lists/{self.list_id}",
+            "batch subscribing members",
+            params={"fields": "total_created,total_updated,error_count,errors"},
+            json={"members": members, "update_existing": update_existing},
+        )
+
+        return response.json()
+
+    def start_batch(self, operations: List[Dict]) -> Dict:
+        """
+        Submit operations to run as a single batch.
+
+        Args:
+            operations: Operations in /batches format (see batches.BatchOperation)
+
+        Returns:
+            Batch data from Mailchimp API, including its ID
+
+        Raises:
+            MailchimpAPIError: If the batch is rejected
+        """
+        response = self._request(
+            "POST", "/batches", "starting batch", json={"operations": operations}
+        )
+
+        return response.json()
+
+    def get_batch(self, batch_id: str) -> Dict:
+        """
+        Get batch status.
+
+        Args:
+            batch_id: Batch ID from start_batch
+
+        Returns:
+            Batch data from Mailchimp API
+
+        Raises:
+            MailchimpAPIError: If request fails
+        """
+        response = self._request("GET", f"/batches/{batch_id}", "getting batch")
 
         return response.json()
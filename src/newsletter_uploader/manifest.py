@@ -0,0 +1,209 @@
+"""Manifests of several editions uploaded together."""
+
+import json
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional, Union
+
+from .audience import AudienceType
+from .uploader import CampaignContentError, NewsletterUploader
+
+# Editions uploaded at the same time
+DEFAULT_MAX_WORKERS = 4
+
+REQUIRED_KEYS = ("file", "subject", "preview")
+OPTIONAL_KEYS = ("audience", "title", "campaign_id")
+
+
+class ManifestEntry(NamedTuple):
+    """One edition to create or update."""
+
+    html_file: Path
+    subject: str
+    preview: str
+    audience: Optional[AudienceType] = None
+    title: Optional[str] = None
+    campaign_id: Optional[str] = None
+
+
+class EditionResult(NamedTuple):
+    """Outcome of uploading one manifest entry."""
+
+    entry: ManifestEntry
+    campaign_id: Optional[str] = None
+    web_id: Optional[int] = None
+    content_uploaded: bool = False
+    error: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        """Whether the edition was uploaded."""
+        return self.error is None
+
+    @property
+    def action(self) -> str:
+        """Either "update" (entries with a campaign ID) or "create"."""
+        return "update" if self.entry.campaign_id else "create"
+
+
+def _parse_entry(index: int, entry: Dict, base_dir: Path) -> ManifestEntry:
+    if not isinstance(entry, dict):
+        raise ValueError(f"Edition {index}: expected an object")
+    missing = [key for key in REQUIRED_KEYS if not entry.get(key)]
+    if missing:
+        raise ValueError(f"Edition {index}: missing {', '.join(missing)}")
+    unknown = sorted(set(entry) - set(REQUIRED_KEYS) - set(OPTIONAL_KEYS))
+    if unknown:
+        raise ValueError(f"Edition {index}: unknown keys {', '.join(unknown)}")
+
+    campaign_id = entry.get("campaign_id")
+    audience = entry.get("audience")
+    if audience is None and not campaign_id:
+        raise ValueError(f"Edition {index}: audience is required for new campaigns")
+    try:
+        audience_type = AudienceType(str(audience).lower()) if audience else None
+    except ValueError:
+        raise ValueError(
+            f"Edition {index}: unknown audience {audience!r} "
+            f"(choose from {', '.join(a.value for a in AudienceType)})"
+        ) from None
+
+    return ManifestEntry(
+        html_file=base_dir / entry["file"],
+        subject=entry["subject"],
+        preview=entry["preview"],
+        audience=audience_type,
+        title=entry.get("title"),
+        campaign_id=str(campaign_id) if campaign_id else None,
+    )
+
+
+def load_manifest(path: Union[str, Path]) -> List[ManifestEntry]:
+    """
+    Read a manifest file.
+
+    The manifest is JSON, or YAML for .yaml/.yml files (needs PyYAML), with
+    an editions list. Each edition gives a file (relative to the manifest),
+    subject and preview, plus an audience for new campaigns or the
+    campaign_id of a draft to update, and an optional title:
+
+        {"editions": [
+            {"file": "2026-01-20-uk.html", "audience": "uk",
+             "subject": "...", "preview": "..."},
+            {"file": "2026-01-20-us.html", "campaign_id": "abc123",
+             "subject": "...", "preview": "..."}
+        ]}
+
+    Args:
+        path: Manifest file
+
+    Returns:
+        Entries in manifest order
+
+    Raises:
+        ValueError: If the manifest is malformed
+        ImportError: If a YAML manifest is read without PyYAML installed
+    """
+    path = Path(path)
+    text = path.read_text(encoding="utf-8")
+    if path.suffix in (".yaml", ".yml"):
+        try:
+            import yaml
+        except ImportError as error:
+            raise ImportError(
+                "YAML manifests require the PyYAML package "
+                "(pip install policyengine-newsletter-uploader[yaml])"
+            ) from error
+        data = yaml.safe_load(text)
+    else:
+        data = json.loads(text)
+
+    editions = data.get("editions") if isinstance(data, dict) else None
+    if not isinstance(editions, list) or not editions:
+        raise ValueError("Manifest must contain a non-empty editions list")
+    entries = [
+        _parse_entry(index, entry, path.parent)
+        for index, entry in enumerate(editions, start=1)
+    ]
+
+    campaign_ids = [entry.campaign_id for entry in entries if entry.campaign_id]
+    duplicates = sorted({c for c in campaign_ids if campaign_ids.count(c) > 1})
+    if duplicates:
+        raise ValueError(f"Campaigns listed more than once: {', '.join(duplicates)}")
+    return entries
+
+
+def upload_entry(
+    uploader: NewsletterUploader, entry: ManifestEntry, force: bool = False
+) -> EditionResult:
+    """
+    Create or update the campaign for one entry.
+
+    Failures are returned rather than raised, so one bad edition does not
+    stop the others. A new campaign that was created before its content
+    failed keeps its campaign ID in the result, so it can be updated.
+
+    Args:
+        uploader: Uploader to send the edition with
+        entry: Manifest entry
+        force: Re-send unchanged HTML when updating
+
+    Returns:
+        Result, with error set if the upload failed
+    """
+    try:
+        if entry.campaign_id:
+            result = uploader.update(
+                campaign_id=entry.campaign_id,
+                html_file=entry.html_file,
+                subject=entry.subject,
+                preview_text=entry.preview,
+                title=entry.title,
+                force=force,
+            )
+        else:
+            result = uploader.upload(
+                html_file=entry.html_file,
+                audience=entry.audience,
+                subject=entry.subject,
+                preview_text=entry.preview,
+                title=entry.title,
+            )
+    except CampaignContentError as error:
+        # The draft exists, so report it rather than leave it orphaned
+        return EditionResult(
+            entry, campaign_id=error.campaign_id, web_id=error.web_id, error=str(error)
+        )
+    except Exception as error:
+        return EditionResult(entry, campaign_id=entry.campaign_id, error=str(error))
+    return EditionResult(
+        entry,
+        campaign_id=result["campaign_id"],
+        web_id=result["web_id"],
+        content_uploaded=result.get("content_uploaded", True),
+    )
+
+
+def upload_manifest(
+    uploader: NewsletterUploader,
+    entries: List[ManifestEntry],
+    force: bool = False,
+    max_workers: int = DEFAULT_MAX_WORKERS,
+) -> List[EditionResult]:
+    """
+    Upload every manifest entry concurrently through one uploader.
+
+    Args:
+        uploader: Uploader shared by every entry (and so one client and
+            connection pool)
+        entries: Manifest entries
+        force: Re-send unchanged HTML when updating
+        max_workers: Most editions uploaded at the same time
+
+    Returns:
+        One result per entry, in manifest order
+    """
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return list(
+            executor.map(lambda entry: upload_entry(uploader, entry, force), entries)
+        )
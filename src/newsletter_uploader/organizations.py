@@ -0,0 +1,236 @@
+"""Registry of known organizations, compiled once and reused between runs."""
+
+import hashlib
+import json
+import os
+import pickle
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple, Union
+
+from . import __version__, domains
+from .cache import default_cache_dir
+from .countries import TAG_COUNTRIES
+from .domains import DomainSuffixIndex
+
+
+class Organization(NamedTuple):
+    """An organization and what its email domain says about subscribers."""
+
+    domain: str
+    name: str
+    country: Optional[str]
+    dc: bool
+
+
+class OrganizationRegistry:
+    """
+    Organizations indexed by email domain.
+
+    Domains go into a DomainSuffixIndex, so subdomains match their
+    organization without being listed (e.g. "warren.senate.gov" is the
+    Senate) and a more specific entry wins where one is listed (e.g.
+    "finance.senate.gov").
+    """
+
+    def __init__(self, organizations: Iterable[Organization], fingerprint: str = ""):
+        """
+        Index organizations.
+
+        Args:
+            organizations: Organizations to register
+            fingerprint: Hash of the source they were compiled from
+
+        Raises:
+            ValueError: If a domain is registered twice
+        """
+        self.fingerprint = fingerprint
+        self.index: DomainSuffixIndex[Organization] = DomainSuffixIndex()
+        self._organizations: List[Organization] = []
+        for organization in organizations:
+            match = self.index.lookup(organization.domain)
+            if match is not None and match[0] == organization.domain:
+                raise ValueError(
+                    f"Duplicate organization domain: {organization.domain}"
+                )
+            self.index.add(organization.domain, organization)
+            self._organizations.append(organization)
+
+    @classmethod
+    def from_config(cls, config: Dict, fingerprint: str = "") -> "OrganizationRegistry":
+        """
+        Compile a parsed organizations.json.
+
+        Args:
+            config: Parsed file, with an organizations list of objects with
+                domain, name, optional country ("us"/"uk") and optional dc
+            fingerprint: Hash of the source file
+
+        Returns:
+            Registry
+
+        Raises:
+            ValueError: If an entry names an unknown country or a domain is
+                registered twice
+        """
+        organizations = []
+        for entry in config.get("organizations", []):
+            country = entry.get("country")
+            if country is not None and country not in TAG_COUNTRIES:
+                raise ValueError(f"Unknown country for {entry['domain']}: {country!r}")
+            organizations.append(
+                Organization(
+                    domain=entry["domain"].lower(),
+                    name=entry["name"],
+                    country=TAG_COUNTRIES.get(country),
+                    dc=bool(entry.get("dc", False)),
+                )
+            )
+        return cls(organizations, fingerprint)
+
+    def lookup(self, domain: str) -> Optional[Organization]:
+        """
+        Find the organization for a domain or any of its parent domains.
+
+        Args:
+            domain: Lowercased domain (see email_domain)
+
+        Returns:
+            Most specific matching organization, or None
+        """
+        match = self.index.lookup(domain)
+        return match[1] if match is not None else None
+
+    def country_rules(self) -> Iterator[Tuple[str, str, str]]:
+        """
+        Country rules for organizations with a known country.
+
+        Returns:
+            Iterator of (domain, country, reason) in registry order
+        """
+        labels = {country: key.upper() for key, country in TAG_COUNTRIES.items()}
+        for organization in self._organizations:
+            if organization.country is not None:
+                yield (
+                    organization.domain,
+                    organization.country,
+                    f"{labels[organization.country]} org: {organization.domain}",
+                )
+
+    def __iter__(self) -> Iterator[Organization]:
+        return iter(self._organizations)
+
+    def __len__(self) -> int:
+        return len(self._organizations)
+
+
+# Registries loaded by this process, by resolved path:
+# ((mtime_ns, size), registry)
+_LOADED: Dict[Path, Tuple[Tuple[int, int], OrganizationRegistry]] = {}
+
+
+@lru_cache(maxsize=None)
+def _code_fingerprint() -> str:
+    # Pickles hold instances of the classes below, so a compiled registry is
+    # only reused by the package version and code that wrote it
+    digest = hashlib.sha256(__version__.encode("utf-8"))
+    for module_path in (__file__, domains.__file__):
+        digest.update(Path(module_path).read_bytes())
+    return digest.hexdigest()
+
+
+def _compiled_path(path: Path, cache_dir: Optional[Union[str, Path]]) -> Path:
+    cache_dir = Path(cache_dir) if cache_dir is not None else default_cache_dir()
+    key = hashlib.sha256(str(path).encode("utf-8")).hexdigest()[:16]
+    return cache_dir / f"organizations-{key}.pickle"
+
+
+def _read_header(compiled_path: Path) -> Optional[Dict]:
+    # The JSON header line is checked before anything is unpickled, so a
+    # pickle written by other code or for another source is never loaded
+    try:
+        with open(compiled_path, "rb") as f:
+            header = json.loads(f.readline())
+    except Exception:
+        return None
+    if not isinstance(header, dict) or header.get("code") != _code_fingerprint():
+        return None
+    return header
+
+
+def _read_registry(compiled_path: Path) -> Optional[OrganizationRegistry]:
+    try:
+        with open(compiled_path, "rb") as f:
+            f.readline()
+            return pickle.load(f)
+    except Exception:
+        # Corrupt artifacts are simply rebuilt
+        return None
+
+
+def _write_compiled(
+    compiled_path: Path, stamp: Tuple[int, int], registry: OrganizationRegistry
+) -> None:
+    header = {
+        "code": _code_fingerprint(),
+        "stamp": list(stamp),
+        "fingerprint": registry.fingerprint,
+    }
+    compiled_path.parent.mkdir(parents=True, exist_ok=True)
+    staging = compiled_path.with_name(f".{compiled_path.name}.tmp")
+    with open(staging, "wb") as f:
+        f.write(json.dumps(header).encode("utf-8") + b"\n")
+        pickle.dump(registry, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(staging, compiled_path)
+
+
+def load_organizations(
+    path: Union[str, Path], cache_dir: Optional[Union[str, Path]] = None
+) -> OrganizationRegistry:
+    """
+    Load a registry, reusing the compiled index while the file is unchanged.
+
+    The compiled registry is kept in memory for the rest of the process and
+    pickled to the cache directory for later runs, after a JSON header
+    recording the code and source it was compiled from. The header is
+    checked before unpickling: pickles written by another package version,
+    or before organizations.py or domains.py were edited, are ignored. A
+    matching modification time and size is trusted without reading the
+    source; otherwise the source is hashed, and only recompiled if its
+    contents changed.
+
+    Args:
+        path: organizations.json
+        cache_dir: Directory for the compiled registry (defaults to
+            default_cache_dir())
+
+    Returns:
+        Registry
+    """
+    path = Path(path).resolve()
+    stat = path.stat()
+    stamp = (stat.st_mtime_ns, stat.st_size)
+
+    loaded = _LOADED.get(path)
+    if loaded is not None and loaded[0] == stamp:
+        return loaded[1]
+
+    compiled_path = _compiled_path(path, cache_dir)
+    header = _read_header(compiled_path)
+    registry = None
+    if header is not None and tuple(header.get("stamp", ())) == stamp:
+        registry = _read_registry(compiled_path)
+    if registry is None:
+        source = path.read_bytes()
+        fingerprint = hashlib.sha256(source).hexdigest()
+        if header is not None and header.get("fingerprint") == fingerprint:
+            # Touched but not edited
+            registry = _read_registry(compiled_path)
+        if registry is None:
+            registry = OrganizationRegistry.from_config(
+                json.loads(source.decode("utf-8")), fingerprint
+            )
+        _write_compiled(compiled_path, stamp, registry)
+
+    _LOADED[path] = (stamp, registry)
+    return registry
@@ -0,0 +1,374 @@
+"""Plan merge field updates by diffing desired state against members."""
+
+import json
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import (
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
+
+from .async_client import AsyncMailchimpClient, gather_bounded
+from .batches import BatchOperation, member_update_operation
+from .contacts import read_contacts
+from .executor import MemberWriteExecutor, WriteResult
+from .mailchimp_client import MailchimpClient
+
+PLAN_VERSION = 1
+
+# Desired merge field values for a member, and why
+Desired = Tuple[Dict[str, str], str]
+
+# Maps a member dict to its desired merge fields, or None to leave it alone
+Source = Callable[[Dict], Optional[Desired]]
+
+
+class MemberChange(NamedTuple):
+    """Merge field values to write to one member."""
+
+    id: str
+    email: str
+    merge_fields: Dict[str, str]
+    previous: Dict[str, str]
+    reason: str
+
+    @property
+    def body(self) -> Dict:
+        """PATCH body for the members endpoint."""
+        return {"merge_fields": self.merge_fields}
+
+    def to_dict(self) -> Dict:
+        """Serialize for plan and journal files."""
+        return self._asdict()
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "MemberChange":
+        """Deserialize from plan and journal files."""
+        return cls(**data)
+
+
+class Plan(NamedTuple):
+    """A reviewable set of member changes for one list."""
+
+    list_id: str
+    changes: List[MemberChange]
+    created: str
+
+    def save(self, path: Union[str, Path]) -> None:
+        """
+        Write the plan as indented JSON for review.
+
+        Args:
+            path: Plan file
+        """
+        data = {
+            "version": PLAN_VERSION,
+            "list_id": self.list_id,
+            "created": self.created,
+            "changes": [change.to_dict() for change in self.changes],
+        }
+        Path(path).write_text(json.dumps(data, indent=2) + "\n", encoding="utf-8")
+
+    @classmethod
+    def load(cls, path: Union[str, Path]) -> "Plan":
+        """
+        Read a plan file.
+
+        Args:
+            path: Plan file written by Plan.save
+
+        Returns:
+            Plan
+
+        Raises:
+            ValueError: If the plan was written in an unsupported format
+        """
+        data = json.loads(Path(path).read_text(encoding="utf-8"))
+        if data.get("version") != PLAN_VERSION:
+            raise ValueError(f"Unsupported plan version: {data.get('version')}")
+        return cls(
+            list_id=data["list_id"],
+            changes=[MemberChange.from_dict(change) for change in data["changes"]],
+            created=data["created"],
+        )
+
+    def counts(self, field: str) -> Dict[str, int]:
+        """
+        Count changes by the value they write to a field.
+
+        Args:
+            field: Merge field name (e.g. COUNTRY)
+
+        Returns:
+            Mapping from value to number of members, most common first
+        """
+        counts: Dict[str, int] = {}
+        for change in self.changes:
+            if field in change.merge_fields:
+                value = change.merge_fields[field]
+                counts[value] = counts.get(value, 0) + 1
+        return dict(sorted(counts.items(), key=lambda item: -item[1]))
+
+
+def domain_rule_source(
+    rule: Callable[[str, List[str]], Tuple[Optional[str], str]],
+    field: str = "COUNTRY",
+) -> Source:
+    """
+    Desired state from a rule over email domains and tags.
+
+    The rule is evaluated once per distinct domain and tag combination, so
+    it must not depend on anything else about the address.
+
+    Args:
+        rule: Function of (email, tag names) returning (value, reason), with
+            a value of None when the rule cannot decide
+        field: Merge field the rule sets
+
+    Returns:
+        Source for plan_changes
+    """
+    cache: Dict[Tuple, Tuple[Optional[str], str]] = {}
+
+    def source(member: Dict) -> Optional[Desired]:
+        email = member["email_address"]
+        tags = sorted(tag["name"] for tag in member.get("tags", []))
+        key = (email.split("@")[-1].lower(), tuple(tags))
+        if key not in cache:
+            cache[key] = rule(email, tags)
+        value, reason = cache[key]
+        if not value:
+            return None
+        return {field: value}, reason
+
+    return source
+
+
+def location_country_source(
+    country_names: Dict[str, str], field: str = "COUNTRY"
+) -> Source:
+    """
+    Desired state from Mailchimp's predicted location.
+
+    Args:
+        country_names: ISO country code to merge field value
+            (e.g. {"GB": "United Kingdom"})
+        field: Merge field to set
+
+    Returns:
+        Source for plan_changes
+    """
+
+    def source(member: Dict) -> Optional[Desired]:
+        country_code = (member.get("location") or {}).get("country_code", "")
+        value = country_names.get(country_code)
+        if not value:
+            return None
+        return {field: value}, f"Location: {country_code}"
+
+    return source
+
+
+def csv_source(
+    csv_path: Union[str, Path],
+    columns: Dict[str, str],
+    email_column: str = "email",
+) -> Source:
+    """
+    Desired state from a CSV file keyed by email address.
+
+    Args:
+        csv_path: CSV file with a header row
+        columns: CSV column to merge field mapping (e.g. country -> COUNTRY);
+            empty values are ignored
+        email_column: CSV column holding the email address
+
+    Returns:
+        Source for plan_changes
+    """
+    desired = {
+        contact["email_address"].lower(): contact["merge_fields"]
+        for contact in read_contacts(
+            csv_path, columns=columns, email_column=email_column
+        )
+        if contact["merge_fields"]
+    }
+    reason = f"CSV: {Path(csv_path).name}"
+
+    def source(member: Dict) -> Optional[Desired]:
+        fields = desired.get(member["email_address"].lower())
+        if not fields:
+            return None
+        return fields, reason
+
+    return source
+
+
+def plan_changes(
+    members: Iterable[Dict],
+    sources: Sequence[Source],
+    overwrite: bool = False,
+) -> List[MemberChange]:
+    """
+    Diff desired merge field values against current member data.
+
+    Sources are consulted in order and the first to give a value for a
+    field wins. Only values that differ from the member's current data are
+    planned, so applying a plan never sends no-op writes.
+
+    Args:
+        members: Member dicts from the members endpoint
+        sources: Desired-state sources, highest priority first
+        overwrite: Replace fields that already have a value (by default
+            only empty fields are filled)
+
+    Returns:
+        One change per member that needs updating
+    """
+    changes = []
+    for member in members:
+        current = member.get("merge_fields") or {}
+
+        desired: Dict[str, Tuple[str, str]] = {}
+        for source in sources:
+            result = source(member)
+            if result is None:
+                continue
+            values, reason = result
+            for field, value in values.items():
+                desired.setdefault(field, (value, reason))
+
+        updates: Dict[str, str] = {}
+        reasons: List[str] = []
+        for field, (value, reason) in desired.items():
+            existing = str(current.get(field) or "").strip()
+            if (existing and not overwrite) or existing == value.strip():
+                continue
+            updates[field] = value
+            if reason not in reasons:
+                reasons.append(reason)
+
+        if updates:
+            changes.append(
+                MemberChange(
+                    id=member["id"],
+                    email=member["email_address"],
+                    merge_fields=updates,
+                    previous={field: current.get(field, "") for field in updates},
+                    reason="; ".join(reasons),
+                )
+            )
+    return changes
+
+
+def build_plan(
+    list_id: str,
+    members: Iterable[Dict],
+    sources: Sequence[Source],
+    overwrite: bool = False,
+) -> Plan:
+    """
+    Build a plan for a list. See plan_changes.
+
+    Args:
+        list_id: Mailchimp list/audience ID the members belong to
+        members: Member dicts from the members endpoint
+        sources: Desired-state sources, highest priority first
+        overwrite: Replace fields that already have a value
+
+    Returns:
+        Plan
+    """
+    return Plan(
+        list_id=list_id,
+        changes=plan_changes(members, sources, overwrite=overwrite),
+        created=datetime.now(timezone.utc).isoformat(timespec="seconds"),
+    )
+
+
+def change_operations(
+    list_id: str, changes: Iterable[MemberChange]
+) -> List[BatchOperation]:
+    """
+    Convert changes to /batches operations.
+
+    Args:
+        list_id: Mailchimp list/audience ID
+        changes: Changes to apply
+
+    Returns:
+        One PATCH operation per change, identified by member ID
+    """
+    return [
+        member_update_operation(list_id, change.id, change.body) for change in changes
+    ]
+
+
+def apply_changes(
+    client: MailchimpClient,
+    changes: Sequence[MemberChange],
+    executor: Optional[MemberWriteExecutor] = None,
+    on_result: Optional[Callable[[WriteResult], None]] = None,
+) -> List[WriteResult]:
+    """
+    Apply changes with concurrent per-member PATCH requests.
+
+    Args:
+        client: Mailchimp client for the plan's list
+        changes: Changes to apply
+        executor: Executor to run the writes on (defaults to one sized to
+            the connection limit)
+        on_result: Called with each result as it completes
+
+    Returns:
+        Results in the same order as the changes
+    """
+    executor = executor or MemberWriteExecutor()
+    return executor.run(
+        lambda change: client.update_member(change.id, change.body),
+        changes,
+        on_result=on_result,
+    )
+
+
+async def apply_changes_async(
+    client: AsyncMailchimpClient,
+    changes: Sequence[MemberChange],
+    on_result: Optional[Callable[[WriteResult], None]] = None,
+) -> List[WriteResult]:
+    """
+    Apply changes as concurrent PATCH coroutines on the asyncio client.
+
+    Every change is scheduled at once; the client's worker pool keeps at
+    most its pool size in flight.
+
+    Args:
+        client: Async Mailchimp client for the plan's list
+        changes: Changes to apply
+        on_result: Called with each result as it completes
+
+    Returns:
+        Results in the same order as the changes
+    """
+
+    async def apply(change: MemberChange) -> WriteResult:
+        try:
+            result = WriteResult(
+                item=change,
+                ok=True,
+                value=await client.update_member(change.id, change.body),
+            )
+        except Exception as error:
+            result = WriteResult(item=change, ok=False, error=error)
+        if on_result is not None:
+            on_result(result)
+        return result
+
+    return await gather_bounded(map(apply, changes), limit=client.pool_size)
@@ -0,0 +1,176 @@
+"""Compact in-memory member records."""
+
+import sys
+from typing import Dict, Iterable, Iterator, Optional, Tuple
+
+from .domains import email_domain
+
+
+def _interned(value: Optional[str]) -> str:
+    return sys.intern(value) if value else ""
+
+
+class MemberRecord:
+    """
+    The member fields the audience scripts use, without the API's nesting.
+
+    A decoded member dict holds nested merge_fields, location, tags, stats
+    and _links dicts, and a fresh copy of every string. Records keep only
+    the scalars the scripts read, in slots, and intern the low-cardinality
+    values (domain, country, region, city, country code, status and tag
+    names) so thousands of members share one copy of each.
+
+    The audience scripts get records from MemberSnapshot.member_records,
+    built from the snapshot's columns; fetched pages are streamed into the
+    snapshot as dicts and never held as records.
+    """
+
+    __slots__ = (
+        "id",
+        "email",
+        "domain",
+        "status",
+        "first_name",
+        "last_name",
+        "country",
+        "region",
+        "city",
+        "zip",
+        "country_code",
+        "tags",
+        "timestamp_opt",
+    )
+
+    def __init__(
+        self,
+        id: str,
+        email: str,
+        status: str = "",
+        first_name: str = "",
+        last_name: str = "",
+        country: str = "",
+        region: str = "",
+        city: str = "",
+        zip: str = "",
+        country_code: str = "",
+        tags: Tuple[str, ...] = (),
+        timestamp_opt: str = "",
+    ):
+        """
+        Initialize record.
+
+        Args:
+            id: Subscriber hash
+            email: Email address
+            status: Subscription status (e.g. "subscribed")
+            first_name: FNAME merge field
+            last_name: LNAME merge field
+            country: COUNTRY merge field
+            region: Predicted location region
+            city: Predicted location city
+            zip: Predicted location postal code
+            country_code: Predicted location country code
+            tags: Tag names
+            timestamp_opt: When the member opted in
+        """
+        self.id = id
+        self.email = email
+        self.domain = _interned(email_domain(email))
+        self.status = _interned(status)
+        self.first_name = first_name
+        self.last_name = last_name
+        self.country = _interned(country)
+        self.region = _interned(region)
+        self.city = _interned(city)
+        self.zip = zip
+        self.country_code = _interned(country_code)
+        self.tags = tuple(_interned(tag) for tag in tags)
+        self.timestamp_opt = timestamp_opt
+
+    @classmethod
+    def from_member(cls, member: Dict) -> "MemberRecord":
+        """
+        Build a record from a members endpoint dict.
+
+        Args:
+            member: Member dict from the members endpoint
+
+        Returns:
+            Record (the dict can be discarded)
+        """
+        merge_fields = member.get("merge_fields") or {}
+        location = member.get("location") or {}
+        return cls(
+            id=member.get("id") or "",
+            email=member["email_address"],
+            status=member.get("status") or "",
+            first_name=merge_fields.get("FNAME") or "",
+            last_name=merge_fields.get("LNAME") or "",
+            country=merge_fields.get("COUNTRY") or "",
+            region=location.get("region") or "",
+            city=location.get("city") or "",
+            zip=location.get("zip") or "",
+            country_code=location.get("country_code") or "",
+            tags=tuple(tag["name"] for tag in member.get("tags", [])),
+            timestamp_opt=member.get("timestamp_opt") or "",
+        )
+
+    def to_member(self) -> Dict:
+        """
+        Rebuild a members endpoint dict, e.g. for planner sources.
+
+        Only the fields kept in the record are filled in.
+
+        Returns:
+            Member dict
+        """
+        return {
+            "id": self.id,
+            "email_address": self.email,
+            "status": self.status,
+            "merge_fields": {
+                "FNAME": self.first_name,
+                "LNAME": self.last_name,
+                "COUNTRY": self.country,
+            },
+            "location": {
+                "region": self.region,
+                "city": self.city,
+                "zip": self.zip,
+                "country_code": self.country_code,
+            },
+            "tags": [{"name": name} for name in self.tags],
+            "timestamp_opt": self.timestamp_opt,
+        }
+
+    @property
+    def name(self) -> str:
+        """Full name from the name merge fields."""
+        return f"{self.first_name} {self.last_name}".strip()
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, MemberRecord):
+            return NotImplemented
+        return all(
+            getattr(self, slot) == getattr(other, slot) for slot in self.__slots__
+        )
+
+    def __repr__(self) -> str:
+        return f"MemberRecord(id={self.id!r}, email={self.email!r})"
+
+
+def iter_records(members: Iterable[Dict]) -> Iterator[MemberRecord]:
+    """
+    Convert member dicts to records.
+
+    No script fetches members into records; this is for callers holding
+    member dicts outside a snapshot, such as the memory benchmark.
+
+    Args:
+        members: Member dicts from the members endpoint
+
+    Yields:
+        Records
+    """
+    for member in members:
+        yield MemberRecord.from_member(member)
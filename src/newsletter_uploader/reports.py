@@ -0,0 +1,588 @@
+"""Subscriber reports computed together in a single pass over a snapshot."""
+
+from bisect import bisect_right
+from collections import defaultdict
+from datetime import date, datetime, timezone
+from operator import itemgetter
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+from .classification import DomainClassifier
+from .export import DEFAULT_BUFFER_ROWS, CSVSink
+from .planner import MemberChange, Plan, domain_rule_source, plan_changes
+from .records import MemberRecord
+from .snapshot import MemberSnapshot
+
+# Region spellings that mean Washington DC
+DC_REGIONS = {"DC", "D.C.", "DISTRICT OF COLUMBIA"}
+
+DMV_REGIONS = {"DC", "VA", "MD"}
+
+# Rows kept for console summaries when rows are streamed to a file
+SAMPLE_ROWS = 20
+
+# File suffixes by compression
+COMPRESSION_SUFFIXES = {None: "", "gzip": ".gz", "zstd": ".zst"}
+
+
+class Report:
+    """
+    Base class for reports that visit members one at a time.
+
+    Subclasses choose their candidate rows with select (usually cheap
+    column scans), then build their CSV rows in visit and pass them to
+    emit. Rows are kept in memory unless the report is streaming to a
+    sink (see stream_to), in which case only a sample is kept.
+    """
+
+    # Prefix of the CSV file name
+    name = "report"
+    fieldnames: Sequence[str] = ()
+    # Order of the CSV rows (visit order if None)
+    sort_key: Optional[Callable[[Dict], Any]] = None
+    # Rows kept in the sample, which holds the first rows in sort_key order
+    sample_rows = SAMPLE_ROWS
+
+    def __init__(self):
+        """Initialize report."""
+        self.rows: List[Dict] = []
+        self.sample: List[Dict] = []
+        self.count = 0
+        self.sink: Optional[CSVSink] = None
+        self._sample_keys: List[Any] = []
+
+    def stream_to(self, sink: CSVSink) -> None:
+        """
+        Write rows to a sink as they are produced instead of keeping them.
+
+        Args:
+            sink: Open sink (sorted by sort_key, if the report has one)
+        """
+        self.sink = sink
+
+    def emit(self, row: Dict) -> None:
+        """
+        Add an output row.
+
+        Args:
+            row: Values by column name
+        """
+        self.count += 1
+        self._keep_sample(row)
+        if self.sink is not None:
+            self.sink.write(row)
+        else:
+            self.rows.append(row)
+
+    def _keep_sample(self, row: Dict) -> None:
+        if self.sort_key is None:
+            if len(self.sample) < self.sample_rows:
+                self.sample.append(row)
+            return
+        # Keep the rows that sort first, so the sample matches the file's head
+        key = self.sort_key(row)
+        position = bisect_right(self._sample_keys, key)
+        if position >= self.sample_rows:
+            return
+        self._sample_keys.insert(position, key)
+        self.sample.insert(position, row)
+        if len(self.sample) > self.sample_rows:
+            self._sample_keys.pop()
+            self.sample.pop()
+
+    def select(self, snapshot: MemberSnapshot) -> Iterable[int]:
+        """
+        Choose the snapshot rows to visit.
+
+        Args:
+            snapshot: Snapshot being scanned
+
+        Returns:
+            Row numbers (defaults to every subscribed member)
+        """
+        return snapshot.select(status="subscribed")
+
+    def visit(self, member: MemberRecord) -> None:
+        """
+        Process one selected member.
+
+        Args:
+            member: Member record (see MemberSnapshot.member_records)
+        """
+        raise NotImplementedError
+
+    def finish(self) -> None:
+        """Called once every selected member has been visited."""
+        if self.sink is None and self.sort_key is not None:
+            self.rows.sort(key=self.sort_key)
+
+    def summary(self) -> List[str]:
+        """Lines describing the results, for console output."""
+        return [f"{self.count} rows"]
+
+    def write_csv(
+        self, path: Union[str, Path], compression: Optional[str] = None
+    ) -> None:
+        """
+        Write the kept rows to a CSV file.
+
+        Args:
+            path: Output file
+            compression: "gzip", "zstd" or None (see open_output)
+        """
+        with CSVSink(path, self.fieldnames, compression=compression) as sink:
+            sink.write_rows(self.rows)
+
+
+class ReportEngine:
+    """
+    Run several reports over one snapshot in a single pass.
+
+    Each report selects its rows with column scans; the union is then
+    materialized once, in snapshot order, and every member is handed to
+    each report that selected it. Running N reports costs one fetch and
+    one scan rather than N.
+    """
+
+    def __init__(self, reports: Sequence[Report]):
+        """
+        Initialize engine.
+
+        Args:
+            reports: Reports to run
+        """
+        self.reports = list(reports)
+
+    def run(self, snapshot: MemberSnapshot) -> None:
+        """
+        Feed the snapshot's members to every report.
+
+        Args:
+            snapshot: Snapshot to scan
+        """
+        selections = [set(report.select(snapshot)) for report in self.reports]
+        rows = sorted(set().union(*selections))
+        for row, member in zip(rows, snapshot.member_records(rows)):
+            for report, selected in zip(self.reports, selections):
+                if row in selected:
+                    report.visit(member)
+        for report in self.reports:
+            report.finish()
+
+    def write_csvs(
+        self,
+        directory: Union[str, Path] = ".",
+        day: Optional[date] = None,
+        compression: Optional[str] = None,
+    ) -> List[Tuple[Report, Path]]:
+        """
+        Write each report with rows to <name>_<YYYY-MM-DD>.csv after run.
+
+        Args:
+            directory: Output directory
+            day: Date in the file names (defaults to today)
+            compression: "gzip" or "zstd" to compress the files (adding
+                .gz or .zst to their names)
+
+        Returns:
+            (report, path) for every file written
+        """
+        written = []
+        for report in self.reports:
+            if not report.rows:
+                continue
+            path = output_path(report, directory, day, compression)
+            report.write_csv(path, compression)
+            written.append((report, path))
+        return written
+
+    def export_csvs(
+        self,
+        snapshot: MemberSnapshot,
+        directory: Union[str, Path] = ".",
+        day: Optional[date] = None,
+        compression: Optional[str] = None,
+        buffer_rows: int = DEFAULT_BUFFER_ROWS,
+    ) -> List[Tuple[Report, Path]]:
+        """
+        Run the reports, streaming their rows straight to CSV files.
+
+        Unlike run followed by write_csvs, rows are not kept in memory:
+        each is written as it is produced, and sorted reports fall back to
+        an external merge sort beyond buffer_rows (see CSVSink). Reports
+        keep their counts and a sample for their summaries.
+
+        Args:
+            snapshot: Snapshot to scan
+            directory: Output directory
+            day: Date in the file names (defaults to today)
+            compression: "gzip" or "zstd" to compress the files
+            buffer_rows: Most rows each sorted report holds in memory
+
+        Returns:
+            (report, path) for every report with rows; files of reports
+            without rows are removed
+        """
+        sinks = []
+        try:
+            for report in self.reports:
+                sink = CSVSink(
+                    output_path(report, directory, day, compression),
+                    report.fieldnames,
+                    sort_key=report.sort_key,
+                    compression=compression,
+                    buffer_rows=buffer_rows,
+                )
+                sinks.append(sink)
+                report.stream_to(sink)
+            self.run(snapshot)
+        finally:
+            for sink in sinks:
+                sink.close()
+
+        written = []
+        for report, sink in zip(self.reports, sinks):
+            if sink.rows:
+                written.append((report, sink.path))
+            else:
+                sink.path.unlink()
+        return written
+
+
+def output_path(
+    report: Report,
+    directory: Union[str, Path] = ".",
+    day: Optional[date] = None,
+    compression: Optional[str] = None,
+) -> Path:
+    """
+    File a report is written to: <name>_<YYYY-MM-DD>.csv[.gz|.zst].
+
+    Args:
+        report: Report
+        directory: Output directory
+        day: Date in the file name (defaults to today)
+        compression: "gzip", "zstd" or None
+
+    Returns:
+        Output path
+
+    Raises:
+        ValueError: If the compression is not supported
+    """
+    if compression not in COMPRESSION_SUFFIXES:
+        raise ValueError(f"Unsupported compression: {compression!r}")
+    stamp = (day or date.today()).isoformat()
+    suffix = COMPRESSION_SUFFIXES[compression]
+    return Path(directory) / f"{report.name}_{stamp}.csv{suffix}"
+
+
+class DCSubscribersReport(Report):
+    """Subscribers whose predicted location is Washington DC."""
+
+    name = "dc_subscribers"
+    fieldnames = (
+        "email",
+        "name",
+        "country",
+        "region",
+        "city",
+        "zip",
+        "subscribed_date",
+    )
+
+    def select(self, snapshot: MemberSnapshot) -> Iterable[int]:
+        """Subscribed members with a DC region."""
+        return snapshot.select(
+            status="subscribed", region=lambda region: region.upper() in DC_REGIONS
+        )
+
+    def visit(self, member: MemberRecord) -> None:
+        """Record the member's location."""
+        self.emit(
+            {
+                "email": member.email,
+                "name": member.name,
+                "country": member.country,
+                "region": member.region,
+                "city": member.city,
+                "zip": member.zip,
+                "subscribed_date": member.timestamp_opt,
+            }
+        )
+
+    def summary(self) -> List[str]:
+        """Count and sample subscribers."""
+        lines = [f"Found {self.count} DC-based subscribers"]
+        if self.sample:
+            lines.append("Sample subscribers:")
+            for sub in self.sample[:10]:
+                lines.append(f"  {sub['email']:45} | {sub['name']:30} | {sub['city']}")
+        return lines
+
+
+class OrganizationReport(Report):
+    """Subscribers at known DC-based organizations, grouped by organization."""
+
+    name = "dc_org_subscribers"
+    fieldnames = (
+        "organization",
+        "org_domain",
+        "email",
+        "name",
+        "country",
+        "country_code",
+        "region",
+    )
+    sort_key = itemgetter("organization", "name")
+    # Subscribers listed in the summary
+    sample_rows = 500
+
+    def __init__(self, classifier: DomainClassifier):
+        """
+        Initialize report.
+
+        Args:
+            classifier: Classifier that knows the DC organizations
+        """
+        super().__init__()
+        self.classifier = classifier
+        self._counts: Dict[str, int] = defaultdict(int)
+
+    def select(self, snapshot: MemberSnapshot) -> Iterable[int]:
+        """Subscribed members on a DC organization's domain."""
+        return snapshot.select(
+            status="subscribed",
+            domain=lambda domain: self.classifier.classify(domain).dmv,
+        )
+
+    def visit(self, member: MemberRecord) -> None:
+        """Record the member's organization and location."""
+        organization = self.classifier.classify(member.domain).organization
+        self._counts[organization] += 1
+        self.emit(
+            {
+                "organization": organization,
+                "org_domain": member.domain,
+                "email": member.email,
+                "name": member.name,
+                "country_code": member.country_code,
+                "region": member.region.upper(),
+                "country": member.country,
+            }
+        )
+
+    def counts(self) -> Dict[str, int]:
+        """Subscribers per organization, by organization name."""
+        return dict(sorted(self._counts.items()))
+
+    def summary(self) -> List[str]:
+        """List subscribers under each organization, then counts."""
+        counts = self.counts()
+        if not self.count:
+            return ["No subscribers from DC-based organizations found."]
+
+        lines = [
+            f"Found {self.count} subscribers from {len(counts)} "
+            "DC-based organizations"
+        ]
+        # Rows streamed to a file leave a sample of the first ones listed
+        listed = (self.rows or self.sample)[: self.sample_rows]
+        current_org = None
+        for sub in listed:
+            if sub["organization"] != current_org:
+                current_org = sub["organization"]
+                lines.append(f"\n{current_org} ({sub['org_domain']}):")
+            location = sub["region"] or sub["country_code"] or "unknown location"
+            lines.append(f"  {sub['email']:45} | {sub['name']:30} | {location}")
+        if self.count > len(listed):
+            lines.append(f"\n  ... and {self.count - len(listed)} more in the CSV")
+
+        lines.append("\nSummary by organization:")
+        for org, count in counts.items():
+            lines.append(f"  {org:50} {count:3} subscribers")
+        return lines
+
+
+class DMVReport(Report):
+    """
+    Subscribers in the DC/MD/VA area.
+
+    Includes members located in the DMV and members of DC organizations,
+    unless their location places them elsewhere in the US.
+    """
+
+    name = "dmv_subscribers"
+    fieldnames = (
+        "email",
+        "name",
+        "organization",
+        "org_domain",
+        "region",
+        "country_code",
+        "tags",
+        "dmv_reason",
+    )
+    sort_key = itemgetter("organization", "region", "name")
+
+    def __init__(self, classifier: DomainClassifier):
+        """
+        Initialize report.
+
+        Args:
+            classifier: Classifier that knows the DC organizations
+        """
+        super().__init__()
+        self.classifier = classifier
+        self._by_region: Dict[str, int] = defaultdict(int)
+        self._org_counts: Dict[str, int] = defaultdict(int)
+
+    def select(self, snapshot: MemberSnapshot) -> Iterable[int]:
+        """Subscribed members located in the DMV or at a DC organization."""
+        located = snapshot.select(
+            status="subscribed",
+            country_code="US",
+            region=lambda region: region.upper() in DMV_REGIONS,
+        )
+        at_dc_org = snapshot.select(
+            status="subscribed",
+            domain=lambda domain: self.classifier.classify(domain).dmv,
+        )
+        return set(located) | set(at_dc_org)
+
+    def visit(self, member: MemberRecord) -> None:
+        """Record the member if their location or employer puts them in the DMV."""
+        domain = member.domain
+        region = member.region.upper()
+        country_code = member.country_code
+
+        reasons = []
+        if country_code == "US" and region in DMV_REGIONS:
+            reasons.append(f"Located in {region}")
+
+        # Organization only counts if not known to be outside the DMV
+        organization = ""
+        classification = self.classifier.classify(domain)
+        if classification.dmv:
+            organization = classification.organization
+            if not (country_code == "US" and region and region not in DMV_REGIONS):
+                reasons.append(f"Works at {organization}")
+
+        if reasons:
+            self._by_region[region] += 1
+            if organization:
+                self._org_counts[organization] += 1
+            self.emit(
+                {
+                    "email": member.email,
+                    "name": member.name,
+                    "organization": organization,
+                    "org_domain": domain if organization else "",
+                    "region": region,
+                    "country_code": country_code,
+                    "tags": ", ".join(member.tags),
+                    "dmv_reason": " | ".join(reasons),
+                }
+            )
+
+    def summary(self) -> List[str]:
+        """Counts by location and organization, with a sample."""
+        by_region = self._by_region
+        org_counts = self._org_counts
+        located = sum(by_region[region] for region in DMV_REGIONS)
+
+        lines = [
+            f"Found {self.count} DMV-area subscribers",
+            "Summary:",
+            f"  By location: {located} (DC: {by_region['DC']}, "
+            f"VA: {by_region['VA']}, MD: {by_region['MD']})",
+            f"  By DC organization: {sum(org_counts.values())}",
+            f"  Total unique: {self.count}",
+            "\nSample DMV subscribers:",
+        ]
+        for sub in (self.rows or self.sample)[: self.sample_rows]:
+            org = sub["organization"][:30] if sub["organization"] else sub["org_domain"]
+            lines.append(f"  {sub['region'] or '???':3} | {sub['email']:45} | {org}")
+
+        if org_counts:
+            lines.append("\nSubscribers by DC organization:")
+            for org in sorted(org_counts):
+                lines.append(f"  {org:50} {org_counts[org]:3}")
+        return lines
+
+
+class CountryAssignmentReport(Report):
+    """Dry run of COUNTRY assignment from email domains and tags."""
+
+    name = "country_assignments"
+    fieldnames = ("id", "email", "country", "reason")
+
+    def __init__(self, classifier: DomainClassifier):
+        """
+        Initialize report.
+
+        Args:
+            classifier: Classifier with the country rules
+        """
+        super().__init__()
+        self.classifier = classifier
+        # Inference only depends on domain and tags, so the source runs it
+        # once per distinct combination instead of once per member
+        self.sources = [domain_rule_source(classifier.infer_country)]
+        self.changes: List[MemberChange] = []
+        self.unassigned = 0
+        self._counts: Dict[str, int] = defaultdict(int)
+        self._examples: Dict[str, List[Dict]] = defaultdict(list)
+
+    def select(self, snapshot: MemberSnapshot) -> Iterable[int]:
+        """Subscribed members without a country."""
+        return snapshot.select(
+            status="subscribed", country=lambda country: not country.strip()
+        )
+
+    def visit(self, member: MemberRecord) -> None:
+        """Plan the member's country, if one can be inferred."""
+        changes = plan_changes([member.to_member()], self.sources)
+        if not changes:
+            self.unassigned += 1
+            return
+        change = changes[0]
+        self.changes.append(change)
+        row = {
+            "id": change.id,
+            "email": change.email,
+            "country": change.merge_fields["COUNTRY"],
+            "reason": change.reason,
+        }
+        self._counts[row["country"]] += 1
+        if len(self._examples[row["country"]]) < 5:
+            self._examples[row["country"]].append(row)
+        self.emit(row)
+
+    def plan(self, list_id: str) -> Plan:
+        """
+        The planned changes as a plan that can be saved and applied.
+
+        Args:
+            list_id: Mailchimp list/audience ID
+
+        Returns:
+            Plan
+        """
+        return Plan(
+            list_id=list_id,
+            changes=list(self.changes),
+            created=datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        )
+
+    def summary(self) -> List[str]:
+        """Counts by country, with examples."""
+        lines = [f"Can assign country to {self.count} subscribers:"]
+        for country, count in sorted(self._counts.items()):
+            lines.append(f"  {country}: {count}")
+        lines.append(f"  Unassigned: {self.unassigned}")
+        for country in sorted(self._counts):
+            lines.append(f"\n{country} examples:")
+            for row in self._examples[country]:
+                lines.append(f"  {row['email']:45} | {row['reason']}")
+        return lines
@@ -0,0 +1,157 @@
+"""Offline evaluation of Mailchimp segment conditions against a snapshot."""
+
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional
+
+from .audience import AudienceType, get_segment_opts
+from .snapshot import Condition, MemberSnapshot
+
+# Merge field tags that have a snapshot column
+MERGE_FIELD_COLUMNS = {"COUNTRY": "country", "FNAME": "fname", "LNAME": "lname"}
+
+MATCH_TYPES = ("all", "any")
+
+# Campaigns are only sent to subscribed members
+RECIPIENT_STATUS = "subscribed"
+
+
+class SegmentCondition(NamedTuple):
+    """A compiled segment condition: a predicate over one snapshot column."""
+
+    column: str
+    predicate: Callable[[str], bool]
+
+
+def _select_merge(condition: Dict) -> SegmentCondition:
+    field = condition.get("field")
+    column = MERGE_FIELD_COLUMNS.get(field)
+    if column is None:
+        raise ValueError(f"Merge field {field!r} is not in the snapshot")
+    expected = condition.get("value") or ""
+    op = condition.get("op")
+    if op == "is":
+        return SegmentCondition(column, lambda value: value == expected)
+    if op == "not":
+        return SegmentCondition(column, lambda value: value != expected)
+    raise ValueError(f"Unsupported SelectMerge op: {op!r}")
+
+
+# Compilers by Mailchimp condition_type
+CONDITION_COMPILERS = {"SelectMerge": _select_merge}
+
+
+class Segment:
+    """
+    Segment conditions compiled for evaluation against a member snapshot.
+
+    Conditions on the same column are folded into one predicate, which the
+    snapshot evaluates once per distinct value rather than once per
+    member, so counting even a large audience is a scan of a few code
+    columns.
+    """
+
+    def __init__(self, conditions: Iterable[SegmentCondition], match: str = "all"):
+        """
+        Initialize segment.
+
+        Args:
+            conditions: Compiled conditions
+            match: "all" to require every condition, "any" for at least one
+
+        Raises:
+            ValueError: If match is not "all" or "any"
+        """
+        if match not in MATCH_TYPES:
+            raise ValueError(f"Unsupported segment match: {match!r}")
+        self.conditions = list(conditions)
+        self.match = match
+
+    @classmethod
+    def compile(cls, segment_opts: Optional[Dict]) -> "Segment":
+        """
+        Compile segment options as sent to the campaigns endpoint.
+
+        Args:
+            segment_opts: Dict with match and conditions (see
+                get_segment_opts), or None for the whole list
+
+        Returns:
+            Compiled segment
+
+        Raises:
+            ValueError: If a condition type, op or field is not supported
+        """
+        if segment_opts is None:
+            return cls([])
+        conditions = []
+        for condition in segment_opts.get("conditions", []):
+            compiler = CONDITION_COMPILERS.get(condition.get("condition_type"))
+            if compiler is None:
+                raise ValueError(
+                    f"Unsupported condition type: {condition.get('condition_type')!r}"
+                )
+            conditions.append(compiler(condition))
+        return cls(conditions, segment_opts.get("match", "all"))
+
+    def _column_predicates(self) -> Dict[str, Callable[[str], bool]]:
+        combine = all if self.match == "all" else any
+        grouped: Dict[str, List[Callable[[str], bool]]] = {}
+        for condition in self.conditions:
+            grouped.setdefault(condition.column, []).append(condition.predicate)
+        return {
+            column: (
+                lambda value, predicates=predicates: combine(
+                    predicate(value) for predicate in predicates
+                )
+            )
+            for column, predicates in grouped.items()
+        }
+
+    def select(self, snapshot: MemberSnapshot, **conditions: Condition) -> List[int]:
+        """
+        Find the members in the segment.
+
+        Args:
+            snapshot: Member snapshot
+            **conditions: Extra column conditions every member must also
+                meet (see MemberSnapshot.select)
+
+        Returns:
+            Matching row numbers in snapshot order
+        """
+        predicates = self._column_predicates()
+        if self.match == "all" or len(predicates) <= 1:
+            return snapshot.select(**conditions, **predicates)
+        rows = set()
+        for column, predicate in predicates.items():
+            rows.update(snapshot.select(**conditions, **{column: predicate}))
+        return sorted(rows)
+
+    def count(self, snapshot: MemberSnapshot, **conditions: Condition) -> int:
+        """Count the members in the segment. See select."""
+        return len(self.select(snapshot, **conditions))
+
+
+def compile_segment(segment_opts: Optional[Dict]) -> Segment:
+    """Compile segment options. See Segment.compile."""
+    return Segment.compile(segment_opts)
+
+
+def count_recipients(
+    snapshot: MemberSnapshot, audiences: Iterable[AudienceType] = AudienceType
+) -> Dict[AudienceType, int]:
+    """
+    Count the subscribed members each audience would send to.
+
+    Args:
+        snapshot: Member snapshot
+        audiences: Audiences to count (defaults to every audience)
+
+    Returns:
+        Recipient count by audience
+    """
+    return {
+        audience: compile_segment(get_segment_opts(audience)).count(
+            snapshot, status=RECIPIENT_STATUS
+        )
+        for audience in audiences
+    }
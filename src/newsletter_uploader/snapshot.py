@@ -0,0 +1,454 @@
+"""Columnar, memory-mapped member snapshots for fast audience scans."""
+
+import json
+import mmap
+import shutil
+import sys
+import tempfile
+from array import array
+from datetime import datetime, timedelta, timezone
+from itertools import compress
+from pathlib import Path
+from typing import (
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
+
+from .records import MemberRecord
+
+SNAPSHOT_VERSION = 1
+
+# One dictionary-encoded column per field
+SNAPSHOT_COLUMNS = (
+    "id",
+    "email",
+    "domain",
+    "fname",
+    "lname",
+    "country",
+    "region",
+    "city",
+    "zip",
+    "country_code",
+    "status",
+    "tags",
+    "timestamp_opt",
+)
+
+# Separates tag names within the tags column
+TAG_SEPARATOR = "\t"
+
+HEADER_FILE = "snapshot.json"
+
+# A column condition: exact value, set of values, or predicate over values
+Condition = Union[str, Iterable[str], Callable[[str], bool]]
+
+
+def flatten_member(member: Dict) -> Tuple[str, ...]:
+    """
+    Flatten a Mailchimp member dict into snapshot column values.
+
+    Args:
+        member: Member dict from the members endpoint
+
+    Returns:
+        Tuple of strings in SNAPSHOT_COLUMNS order
+    """
+    email = member["email_address"]
+    merge_fields = member.get("merge_fields") or {}
+    location = member.get("location") or {}
+    tags = TAG_SEPARATOR.join(
+        sorted(_clean(tag["name"]) for tag in member.get("tags", []))
+    )
+    return (
+        _clean(member.get("id")),
+        _clean(email),
+        _clean(email.split("@")[-1].lower()),
+        _clean(merge_fields.get("FNAME")),
+        _clean(merge_fields.get("LNAME")),
+        _clean(merge_fields.get("COUNTRY")),
+        _clean(location.get("region")),
+        _clean(location.get("city")),
+        _clean(location.get("zip")),
+        _clean(location.get("country_code")),
+        _clean(member.get("status")),
+        tags,
+        _clean(member.get("timestamp_opt")),
+    )
+
+
+def _clean(value: Optional[str]) -> str:
+    # Values files are newline-separated and tags are tab-separated
+    if not value:
+        return ""
+    return str(value).replace("\n", " ").replace(TAG_SEPARATOR, " ")
+
+
+def write_snapshot(members: Iterable[Dict], path: Union[str, Path]) -> int:
+    """
+    Write members to a snapshot directory.
+
+    Each column is stored as a dictionary of distinct values plus a file of
+    uint32 codes, one per member. Only the dictionaries are held in memory
+    while writing.
+
+    Args:
+        members: Member dicts from the members endpoint
+        path: Snapshot directory (replaced if it exists)
+
+    Returns:
+        Number of members written
+    """
+    path = Path(path)
+    lookups = [{} for _ in SNAPSHOT_COLUMNS]
+    codes = [array("I") for _ in SNAPSHOT_COLUMNS]
+
+    rows = 0
+    for member in members:
+        for lookup, column_codes, value in zip(lookups, codes, flatten_member(member)):
+            code = lookup.get(value)
+            if code is None:
+                code = lookup[value] = len(lookup)
+            column_codes.append(code)
+        rows += 1
+
+    # Write next to the destination, then swap, so readers never see a
+    # half-written snapshot
+    path.parent.mkdir(parents=True, exist_ok=True)
+    staging = Path(tempfile.mkdtemp(prefix=f".{path.name}-", dir=path.parent))
+    for name, lookup, column_codes in zip(SNAPSHOT_COLUMNS, lookups, codes):
+        with open(staging / f"{name}.codes", "wb") as f:
+            column_codes.tofile(f)
+        # newline="" keeps a "\r" inside a value from becoming a line break
+        with open(staging / f"{name}.values", "w", encoding="utf-8", newline="") as f:
+            f.write("\n".join(lookup))
+
+    header = {
+        "version": SNAPSHOT_VERSION,
+        "rows": rows,
+        "columns": list(SNAPSHOT_COLUMNS),
+        "byteorder": sys.byteorder,
+        "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+    }
+    (staging / HEADER_FILE).write_text(json.dumps(header), encoding="utf-8")
+
+    if path.exists():
+        shutil.rmtree(path)
+    staging.rename(path)
+    return rows
+
+
+class Column:
+    """A dictionary-encoded column backed by a memory-mapped code file."""
+
+    def __init__(self, name: str, values: List[str], codes: Sequence[int]):
+        """
+        Initialize column.
+
+        Args:
+            name: Column name
+            values: Distinct values, indexed by code
+            codes: One code per row
+        """
+        self.name = name
+        self.values = values
+        self.codes = codes
+
+    def __getitem__(self, row: int) -> str:
+        return self.values[self.codes[row]]
+
+    def lookup_table(self, condition: Condition) -> bytes:
+        """
+        Evaluate a condition once per distinct value.
+
+        Args:
+            condition: Exact value, collection of values, or predicate
+
+        Returns:
+            Table with a truthy byte at each matching code
+        """
+        if isinstance(condition, str):
+            condition = {condition}
+        if callable(condition):
+            return bytes(bool(condition(value)) for value in self.values)
+        wanted = set(condition)
+        return bytes(value in wanted for value in self.values)
+
+    def filter(self, condition: Condition, rows: Optional[Iterable[int]] = None):
+        """
+        Scan the column for rows matching a condition.
+
+        Args:
+            condition: Exact value, collection of values, or predicate
+            rows: Candidate rows to narrow (defaults to every row)
+
+        Returns:
+            Iterator over matching row numbers
+        """
+        table = self.lookup_table(condition)
+        if rows is None:
+            return compress(range(len(self.codes)), map(table.__getitem__, self.codes))
+        rows = list(rows)
+        return compress(rows, map(table.__getitem__, map(self.codes.__getitem__, rows)))
+
+
+class MemberSnapshot:
+    """
+    Read-only view of a snapshot directory.
+
+    Code files are memory-mapped, so opening a snapshot copies no member
+    data and several processes can share one snapshot through the page
+    cache. Conditions are evaluated once per distinct value and applied to
+    rows by scanning the code columns.
+    """
+
+    def __init__(self, path: Union[str, Path]):
+        """
+        Open a snapshot directory.
+
+        Args:
+            path: Directory written by write_snapshot
+
+        Raises:
+            ValueError: If the snapshot was written in an unsupported format
+        """
+        self.path = Path(path)
+        header = json.loads((self.path / HEADER_FILE).read_text(encoding="utf-8"))
+        if header["version"] != SNAPSHOT_VERSION:
+            raise ValueError(f"Unsupported snapshot version: {header['version']}")
+        if header["byteorder"] != sys.byteorder:
+            raise ValueError(f"Snapshot written with {header['byteorder']} byteorder")
+
+        self.rows = header["rows"]
+        self.created = header["created"]
+        self._maps = []
+        self._temporary_dir = None
+        self.columns = {name: self._open_column(name) for name in header["columns"]}
+
+    @classmethod
+    def open(cls, path: Union[str, Path]) -> "MemberSnapshot":
+        """Open a snapshot directory."""
+        return cls(path)
+
+    def _open_column(self, name: str) -> Column:
+        with open(self.path / f"{name}.values", encoding="utf-8", newline="") as f:
+            values = f.read().split("\n")
+
+        with open(self.path / f"{name}.codes", "rb") as f:
+            if self.rows == 0:
+                return Column(name, values, memoryview(array("I")))
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self._maps.append(mapped)
+        return Column(name, values, memoryview(mapped).cast("I"))
+
+    def close(self) -> None:
+        """Release the memory maps."""
+        for column in self.columns.values():
+            column.codes.release()
+        for mapped in self._maps:
+            mapped.close()
+        self._maps = []
+        if self._temporary_dir is not None:
+            shutil.rmtree(self._temporary_dir, ignore_errors=True)
+            self._temporary_dir = None
+
+    def __enter__(self) -> "MemberSnapshot":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return self.rows
+
+    @property
+    def age(self) -> timedelta:
+        """Time since the snapshot was written."""
+        return datetime.now(timezone.utc) - datetime.fromisoformat(self.created)
+
+    def select(self, **conditions: Condition) -> List[int]:
+        """
+        Find rows matching every condition.
+
+        Args:
+            **conditions: Column name to exact value, collection of values,
+                or predicate over values (e.g. region={"DC", "VA", "MD"})
+
+        Returns:
+            Matching row numbers in snapshot order
+        """
+        rows = None
+        for name, condition in conditions.items():
+            rows = self.columns[name].filter(condition, rows)
+        if rows is None:
+            return list(range(self.rows))
+        return list(rows)
+
+    def count(self, **conditions: Condition) -> int:
+        """Count rows matching every condition. See select."""
+        return len(self.select(**conditions))
+
+    def group_by(self, rows: Iterable[int], *names: str) -> Dict[Tuple, List[int]]:
+        """
+        Group rows by their values in one or more columns.
+
+        Useful for evaluating expensive logic once per distinct combination
+        (e.g. once per domain) instead of once per member.
+
+        Args:
+            rows: Row numbers to group
+            *names: Columns to group by
+
+        Returns:
+            Mapping from value tuples to row numbers
+        """
+        columns = [self.columns[name] for name in names]
+        groups = {}
+        for row in rows:
+            key = tuple(column.codes[row] for column in columns)
+            groups.setdefault(key, []).append(row)
+        return {
+            tuple(column.values[code] for column, code in zip(columns, key)): members
+            for key, members in groups.items()
+        }
+
+    def records(
+        self, rows: Iterable[int], names: Optional[Sequence[str]] = None
+    ) -> Iterator[Dict[str, str]]:
+        """
+        Materialize rows as dicts.
+
+        Args:
+            rows: Row numbers to read
+            names: Columns to include (defaults to all)
+
+        Yields:
+            Dicts mapping column names to values
+        """
+        columns = [self.columns[name] for name in names or self.columns]
+        for row in rows:
+            yield {column.name: column[row] for column in columns}
+
+    def members(self, rows: Iterable[int]) -> Iterator[Dict]:
+        """
+        Materialize rows as member dicts shaped like the members endpoint's.
+
+        Only the fields kept in the snapshot are filled in.
+
+        Args:
+            rows: Row numbers to read
+
+        Yields:
+            Member dicts
+        """
+        for record in self.records(rows):
+            yield {
+                "id": record["id"],
+                "email_address": record["email"],
+                "status": record["status"],
+                "merge_fields": {
+                    "FNAME": record["fname"],
+                    "LNAME": record["lname"],
+                    "COUNTRY": record["country"],
+                },
+                "location": {
+                    "region": record["region"],
+                    "city": record["city"],
+                    "zip": record["zip"],
+                    "country_code": record["country_code"],
+                },
+                "tags": [{"name": name} for name in tag_names(record["tags"])],
+                "timestamp_opt": record["timestamp_opt"],
+            }
+
+    def member_records(self, rows: Iterable[int]) -> Iterator[MemberRecord]:
+        """
+        Materialize rows as compact member records.
+
+        Cheaper than members when many rows are kept: records share the
+        snapshot's column values instead of building nested dicts.
+
+        Args:
+            rows: Row numbers to read
+
+        Yields:
+            Records
+        """
+        for record in self.records(rows):
+            yield MemberRecord(
+                id=record["id"],
+                email=record["email"],
+                status=record["status"],
+                first_name=record["fname"],
+                last_name=record["lname"],
+                country=record["country"],
+                region=record["region"],
+                city=record["city"],
+                zip=record["zip"],
+                country_code=record["country_code"],
+                tags=tag_names(record["tags"]),
+                timestamp_opt=record["timestamp_opt"],
+            )
+
+
+def tag_names(tags: str) -> List[str]:
+    """
+    Split a tags column value into tag names.
+
+    Args:
+        tags: Value from the tags column
+
+    Returns:
+        Tag names (empty if the member has no tags)
+    """
+    return tags.split(TAG_SEPARATOR) if tags else []
+
+
+def load_snapshot(
+    members: Callable[[], Iterable[Dict]],
+    path: Optional[Union[str, Path]] = None,
+    max_age: Optional[timedelta] = None,
+) -> MemberSnapshot:
+    """
+    Open a snapshot, building it first if it does not exist.
+
+    Args:
+        members: Function returning the members to write when building
+        path: Snapshot directory to reuse or create. Without one, the
+            snapshot is built in a temporary directory that is removed when
+            the snapshot is closed.
+        max_age: Oldest existing snapshot to accept. Pass one when the
+            snapshot is used to plan writes, so changes made since it was
+            built are not overwritten.
+
+    Returns:
+        Open snapshot
+
+    Raises:
+        ValueError: If an existing snapshot is older than max_age
+    """
+    if path is None:
+        temporary_dir = tempfile.mkdtemp(prefix="member-snapshot-")
+        write_snapshot(members(), Path(temporary_dir) / "snapshot")
+        snapshot = MemberSnapshot(Path(temporary_dir) / "snapshot")
+        snapshot._temporary_dir = temporary_dir
+        return snapshot
+
+    path = Path(path)
+    if not (path / HEADER_FILE).exists():
+        write_snapshot(members(), path)
+    snapshot = MemberSnapshot(path)
+    if max_age is not None and snapshot.age > max_age:
+        snapshot.close()
+        raise ValueError(
+            f"Snapshot at {path} was written {snapshot.created}, more than "
+            f"{max_age} ago; rebuild it before planning changes"
+        )
+    return snapshot
@@ -0,0 +1,211 @@
+"""Local SQLite store of list members kept current with delta syncs."""
+
+import json
+import sqlite3
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Dict, Iterator, NamedTuple, Optional, Union
+
+from .mailchimp_client import MEMBER_FIELDS, MailchimpClient
+
+# Stored members also carry last_changed so deltas can be inspected
+STORE_FIELDS = MEMBER_FIELDS + ("last_changed",)
+
+# Overlap between syncs to absorb clock skew with Mailchimp's servers.
+# Re-fetching a member that did not change is a harmless upsert.
+SYNC_OVERLAP = timedelta(minutes=5)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS members (
+    id TEXT PRIMARY KEY,
+    email_address TEXT NOT NULL,
+    status TEXT NOT NULL,
+    last_changed TEXT,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS members_status ON members (status);
+CREATE TABLE IF NOT EXISTS sync_state (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+
+class SyncResult(NamedTuple):
+    """Outcome of a MemberStore.sync call."""
+
+    full: bool
+    fetched: int
+    since: Optional[str]
+
+
+class MemberStore:
+    """
+    Persistent copy of list members in a SQLite database (WAL mode).
+
+    The first sync downloads every member; later syncs only ask Mailchimp
+    for members changed since the stored high-water mark.
+    """
+
+    def __init__(self, path: Union[str, Path], list_id: str):
+        """
+        Open (or create) a member store.
+
+        Args:
+            path: SQLite database file
+            list_id: Mailchimp list/audience ID the store mirrors
+
+        Raises:
+            ValueError: If the database already mirrors a different list
+        """
+        self.path = Path(path)
+        self.list_id = list_id
+        self.connection = sqlite3.connect(str(self.path))
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.executescript(SCHEMA)
+
+        stored_list_id = self._get_state("list_id")
+        if stored_list_id is None:
+            with self.connection:
+                self._set_state("list_id", list_id)
+        elif stored_list_id != list_id:
+            raise ValueError(
+                f"Member store {self.path} mirrors list {stored_list_id}, "
+                f"not {list_id}"
+            )
+
+    def close(self) -> None:
+        """Close the database connection."""
+        self.connection.close()
+
+    def __enter__(self) -> "MemberStore":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+    @property
+    def high_water_mark(self) -> Optional[str]:
+        """Timestamp the next delta sync fetches changes from, if synced."""
+        return self._get_state("high_water_mark")
+
+    def sync(self, client: MailchimpClient, full: bool = False) -> SyncResult:
+        """
+        Bring the store up to date with Mailchimp.
+
+        Args:
+            client: Mailchimp client for the same list
+            full: Re-download every member, dropping any that no longer
+                exist in the list (delta syncs cannot see deletions)
+
+        Returns:
+            Whether a full load was done, how many members were fetched and
+            the high-water mark the fetch started from
+        """
+        since = None if full else self.high_water_mark
+        started = datetime.now(timezone.utc) - SYNC_OVERLAP
+
+        fetched = 0
+        with self.connection:
+            if since is None:
+                self.connection.execute("DELETE FROM members")
+            pages = client.iter_member_pages(
+                fields=STORE_FIELDS, since_last_changed=since
+            )
+            for page in pages:
+                self.connection.executemany(
+                    "INSERT OR REPLACE INTO members "
+                    "(id, email_address, status, last_changed, data) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    [
+                        (
+                            member["id"],
+                            member["email_address"],
+                            member["status"],
+                            member.get("last_changed"),
+                            json.dumps(member),
+                        )
+                        for member in page
+                    ],
+                )
+                fetched += len(page)
+            self._set_state("high_water_mark", started.isoformat(timespec="seconds"))
+
+        return SyncResult(full=since is None, fetched=fetched, since=since)
+
+    def iter_members(self, status: Optional[str] = None) -> Iterator[Dict]:
+        """
+        Iterate over stored members.
+
+        Args:
+            status: Only return members with this status (e.g. "subscribed")
+
+        Yields:
+            Member dicts as returned by Mailchimp API
+        """
+        if status is None:
+            rows = self.connection.execute("SELECT data FROM members")
+        else:
+            rows = self.connection.execute(
+                "SELECT data FROM members WHERE status = ?", (status,)
+            )
+        for (data,) in rows:
+            yield json.loads(data)
+
+    def count(self, status: Optional[str] = None) -> int:
+        """
+        Count stored members.
+
+        Args:
+            status: Only count members with this status
+
+        Returns:
+            Number of matching members
+        """
+        if status is None:
+            row = self.connection.execute("SELECT COUNT(*) FROM members").fetchone()
+        else:
+            row = self.connection.execute(
+                "SELECT COUNT(*) FROM members WHERE status = ?", (status,)
+            ).fetchone()
+        return row[0]
+
+    def _get_state(self, key: str) -> Optional[str]:
+        row = self.connection.execute(
+            "SELECT value FROM sync_state WHERE key = ?", (key,)
+        ).fetchone()
+        return row[0] if row else None
+
+    def _set_state(self, key: str, value: str) -> None:
+        self.connection.execute(
+            "INSERT OR REPLACE INTO sync_state (key, value) VALUES (?, ?)",
+            (key, value),
+        )
+
+
+def iter_list_members(
+    client: MailchimpClient,
+    store_path: Optional[Union[str, Path]] = None,
+    status: Optional[str] = "subscribed",
+) -> Iterator[Dict]:
+    """
+    Iterate over list members, through a local store when one is given.
+
+    Args:
+        client: Mailchimp client
+        store_path: Member store to sync and read from (optional). Without
+            one, members are streamed straight from the API and decoded
+            as each page arrives.
+        status: Only return members with this status
+
+    Yields:
+        Member dicts with at least MEMBER_FIELDS
+    """
+    if store_path is None:
+        yield from client.iter_members(status=status, fields=MEMBER_FIELDS, stream=True)
+        return
+
+    with MemberStore(store_path, client.list_id) as store:
+        store.sync(client)
+        yield from store.iter_members(status=status)
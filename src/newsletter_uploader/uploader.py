@@ -1,23 +1,133 @@
 """Newsletter uploader for Mailchimp campaigns."""
 
+import functools
+import hashlib
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, Optional
+from typing import Any, Callable, Dict, Optional, Union
 
 from .audience import AudienceType, get_segment_opts
+from .cache import PersistentLRUCache, open_cache
 from .mailchimp_client import MailchimpClient
 
+CAMPAIGN_CACHE_NAME = "campaigns"
+
+# Most campaigns remembered between runs
+CAMPAIGN_CACHE_SIZE = 1000
+
+
+class CampaignContentError(Exception):
+    """Raised when a new campaign was created but its content was not."""
+
+    def __init__(self, campaign_id: str, web_id: int, error: Exception):
+        """
+        Initialize content error.
+
+        Args:
+            campaign_id: ID of the draft campaign that was created
+            web_id: Web ID of the draft campaign
+            error: Failure uploading its content
+        """
+        self.campaign_id = campaign_id
+        self.web_id = web_id
+        super().__init__(
+            f"Campaign {campaign_id} was created but its content was not "
+            f"uploaded (update the campaign to retry): {error}"
+        )
+
+
+def content_hash(html_content: str) -> str:
+    """
+    Fingerprint campaign HTML.
+
+    Args:
+        html_content: HTML content
+
+    Returns:
+        Hex SHA-256 digest of the UTF-8 encoded HTML
+    """
+    return hashlib.sha256(html_content.encode("utf-8")).hexdigest()
+
+
+def open_campaign_cache(
+    cache_dir: Optional[Union[str, Path]] = None,
+) -> PersistentLRUCache:
+    """
+    Open the record of what this machine knows about each campaign.
+
+    Args:
+        cache_dir: Cache directory (defaults to default_cache_dir())
+
+    Returns:
+        Cache from campaign ID to a dict with the web_id and the
+        content_hash of the HTML last uploaded, saved by the uploader
+    """
+    return open_cache(
+        CAMPAIGN_CACHE_NAME,
+        {"content_hash": "sha256"},
+        cache_dir=cache_dir,
+        max_size=CAMPAIGN_CACHE_SIZE,
+    )
+
+
+def _run_concurrently(calls: Dict[str, Callable[[], Any]]) -> Dict[str, Any]:
+    """
+    Run independent API calls at the same time.
+
+    Args:
+        calls: Calls by name
+
+    Returns:
+        Results by name
+
+    Raises:
+        Exception: The first failure in call order, once every call has
+            finished
+    """
+    if len(calls) <= 1:
+        return {name: call() for name, call in calls.items()}
+    with ThreadPoolExecutor(max_workers=len(calls)) as executor:
+        futures = {name: executor.submit(call) for name, call in calls.items()}
+    return {name: future.result() for name, future in futures.items()}
+
 
 class NewsletterUploader:
     """Upload newsletters to Mailchimp as draft campaigns."""
 
-    def __init__(self, client: MailchimpClient):
+    def __init__(
+        self,
+        client: MailchimpClient,
+        campaign_cache: Optional[PersistentLRUCache] = None,
+    ):
         """
         Initialize newsletter uploader.
 
         Args:
             client: Configured Mailchimp client
+            campaign_cache: Record of each campaign's web ID and last
+                uploaded content hash (see open_campaign_cache). With one,
+                updates skip re-sending unchanged HTML and looking up web
+                IDs.
         """
         self.client = client
+        self.campaign_cache = campaign_cache
+        # Several editions may be uploaded from different threads
+        self._cache_lock = threading.Lock()
+
+    def _cached(self, campaign_id: str) -> Dict:
+        if self.campaign_cache is None:
+            return {}
+        with self._cache_lock:
+            return self.campaign_cache.get(campaign_id) or {}
+
+    def _remember(self, campaign_id: str, **fields) -> None:
+        if self.campaign_cache is None:
+            return
+        with self._cache_lock:
+            record = {**(self.campaign_cache.get(campaign_id) or {}), **fields}
+            self.campaign_cache.put(campaign_id, record)
+            self.campaign_cache.save()
 
     def upload(
         self,
@@ -42,6 +152,8 @@ class NewsletterUploader:
 
         Raises:
             FileNotFoundError: If HTML file doesn't exist
+            CampaignContentError: If the campaign was created but its content
+                upload failed
             Exception: If upload fails
         """
         # Read HTML file
@@ -69,7 +181,15 @@ class NewsletterUploader:
         web_id = campaign["web_id"]
 
         # Upload HTML content
-        self.client.upload_content(campaign_id, html_content)
+        try:
+            self.client.upload_content(campaign_id, html_content)
+        except Exception as error:
+            # Report the draft, so a retry updates it rather than adding another
+            self._remember(campaign_id, web_id=web_id)
+            raise CampaignContentError(campaign_id, web_id, error) from error
+        self._remember(
+            campaign_id, web_id=web_id, content_hash=content_hash(html_content)
+        )
 
         return {
             "campaign_id": campaign_id,
@@ -84,19 +204,31 @@ class NewsletterUploader:
         preview_text: Optional[str] = None,
         title: Optional[str] = None,
         from_name: Optional[str] = None,
+        force: bool = False,
     ) -> Dict:
         """
         Update an existing Mailchimp campaign.
 
+        The settings PATCH and content PUT are independent, so they are
+        sent concurrently. The web ID comes from the PATCH response, or
+        the campaign cache, and is only fetched when neither has it.
+
+        With a campaign cache, the HTML is only re-sent if it differs from
+        the last content this uploader sent to the campaign. Edits made in
+        Mailchimp itself are not detected, so pass force to overwrite them.
+
         Args:
             campaign_id: Mailchimp campaign ID to update
             html_file: Path to HTML file to upload
             subject: Optional new email subject line
             preview_text: Optional new preview text
             title: Optional new internal campaign title
+            from_name: Optional new sender name
+            force: Re-send the HTML even if unchanged
 
         Returns:
-            Dict with campaign_id and web_id
+            Dict with campaign_id, web_id and content_uploaded (False if
+            the unchanged HTML was skipped)
 
         Raises:
             FileNotFoundError: If HTML file doesn't exist
@@ -107,23 +239,42 @@ class NewsletterUploader:
             raise FileNotFoundError(f"HTML file not found: {html_file}")
 
         html_content = html_file.read_text(encoding="utf-8")
+        digest = content_hash(html_content)
+        cached = self._cached(campaign_id)
+
+        calls: Dict[str, Callable[[], Any]] = {}
 
         # Update campaign settings if provided
-        if subject or preview_text or title:
-            self.client.update_campaign(
+        if subject or preview_text or title or from_name:
+            calls["settings"] = functools.partial(
+                self.client.update_campaign,
                 campaign_id=campaign_id,
                 subject=subject,
                 preview_text=preview_text,
                 title=title,
+                from_name=from_name,
             )
 
-        # Update HTML content
-        self.client.upload_content(campaign_id, html_content)
+        # Update HTML content unless it is known to be unchanged
+        content_uploaded = force or cached.get("content_hash") != digest
+        if content_uploaded:
+            calls["content"] = functools.partial(
+                self.client.upload_content, campaign_id, html_content
+            )
+
+        # Only look up the web ID if no other response will carry it
+        if "settings" not in calls and "web_id" not in cached:
+            calls["campaign"] = functools.partial(
+                self.client._get_campaign, campaign_id
+            )
 
-        # Get campaign info to return web_id
-        response = self.client._get_campaign(campaign_id)
+        results = _run_concurrently(calls)
+        campaign = results.get("settings") or results.get("campaign")
+        web_id = campaign["web_id"] if campaign is not None else cached["web_id"]
+        self._remember(campaign_id, web_id=web_id, content_hash=digest)
 
         return {
             "campaign_id": campaign_id,
-            "web_id": response["web_id"],
+            "web_id": web_id,
+            "content_uploaded": content_uploaded,
         }
@@ -2,6 +2,8 @@
 
 import pytest
 
+from newsletter_uploader.mailchimp_client import MailchimpClient
+
 
 @pytest.fixture
 def api_key():
@@ -13,3 +15,53 @@ def api_key():
 def list_id():
     """Sample list ID for testing."""
     return "test-list-id"
+
+
+@pytest.fixture
+def client(api_key, list_id):
+    """Create a Mailchimp client for testing."""
+    return MailchimpClient(api_key=api_key, list_id=list_id)
+
+
+@pytest.fixture
+def member():
+    """Factory for member dicts shaped like the members endpoint's."""
+
+    def build(
+        email,
+        status="subscribed",
+        first_name="First",
+        last_name="Last",
+        country="",
+        region="",
+        country_code=None,
+        city="",
+        tags=(),
+    ):
+        """
+        Build a member dict.
+
+        The subscriber ID is the email's local part, and the country code
+        defaults to "US" for members with a region.
+        """
+        if country_code is None:
+            country_code = "US" if region else ""
+        return {
+            "id": email.split("@")[0],
+            "email_address": email,
+            "status": status,
+            "merge_fields": {
+                "FNAME": first_name,
+                "LNAME": last_name,
+                "COUNTRY": country,
+            },
+            "location": {
+                "region": region,
+                "country_code": country_code,
+                "city": city,
+            },
+            "tags": [{"id": 1, "name": name} for name in tags],
+            "last_changed": "2025-01-01T00:00:00+00:00",
+        }
+
+    return build
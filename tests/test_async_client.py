@@ -0,0 +1,152 @@
+"""Tests for the asyncio Mailchimp client."""
+
+import asyncio
+import re
+
+import pytest
+import responses
+
+from newsletter_uploader.async_client import AsyncMailchimpClient, gather_bounded
+from newsletter_uploader.mailchimp_client import MailchimpAPIError, MailchimpClient
+
+
+@pytest.fixture
+def client():
+    """Create an async Mailchimp client for testing."""
+    return AsyncMailchimpClient(api_key="test-key-us5", list_id="test-list-id")
+
+
+class TestGatherBounded:
+    """Test gather_bounded function."""
+
+    def test_limits_concurrency_and_keeps_order(self):
+        """Test results keep input order and the limit is respected."""
+        running = []
+        peak = []
+
+        async def work(i):
+            running.append(i)
+            peak.append(len(running))
+            await asyncio.sleep(0.001 * (5 - i % 5))
+            running.remove(i)
+            return i * 2
+
+        results = asyncio.run(gather_bounded((work(i) for i in range(20)), limit=3))
+
+        assert results == [i * 2 for i in range(20)]
+        assert max(peak) <= 3
+
+    def test_return_exceptions(self):
+        """Test exceptions can be collected as results."""
+
+        async def fail():
+            raise ValueError("boom")
+
+        async def ok():
+            return "ok"
+
+        results = asyncio.run(
+            gather_bounded([ok(), fail()], limit=2, return_exceptions=True)
+        )
+
+        assert results[0] == "ok"
+        assert isinstance(results[1], ValueError)
+
+
+class TestAsyncMailchimpClient:
+    """Test AsyncMailchimpClient class."""
+
+    def test_wraps_sync_client(self, client):
+        """Test the wrapped client shares configuration."""
+        assert client.client.list_id == "test-list-id"
+        assert client.client.base_url == "https://us5.api.mailchimp.com/3.0"
+
+    def test_closes_own_client(self, mocker):
+        """Test close shuts down the client the wrapper created."""
+        client = AsyncMailchimpClient(api_key="test-key-us5", list_id="list")
+        close = mocker.spy(client.client, "close")
+
+        asyncio.run(client.close())
+
+        close.assert_called_once()
+
+    def test_leaves_wrapped_client_open(self, mocker):
+        """Test a client passed in is sized from and left to its owner."""
+        sync_client = MailchimpClient(
+            api_key="test-key-us5", list_id="list", pool_size=3
+        )
+        close = mocker.spy(sync_client, "close")
+        client = AsyncMailchimpClient("", "", client=sync_client)
+
+        asyncio.run(client.close())
+
+        assert client.pool_size == 3
+        close.assert_not_called()
+
+    @responses.activate
+    def test_campaign_operations(self, client):
+        """Test create, upload, update and get run through the wrapped client."""
+        base = "https://us5.api.mailchimp.com/3.0/campaigns"
+        responses.post(base, json={"id": "c1", "web_id": 1}, status=200)
+        responses.put(f"{base}/c1/content", json={}, status=200)
+        responses.patch(f"{base}/c1", json={"id": "c1", "web_id": 1}, status=200)
+        responses.get(f"{base}/c1", json={"id": "c1", "web_id": 1}, status=200)
+
+        async def run():
+            async with client:
+                campaign = await client.create_campaign(
+                    subject="S", preview_text="P", title="T"
+                )
+                await client.upload_content("c1", "<html></html>")
+                await client.update_campaign("c1", subject="New")
+                return campaign, await client.get_campaign("c1")
+
+        created, fetched = asyncio.run(run())
+
+        assert created["id"] == "c1"
+        assert fetched["web_id"] == 1
+        assert [call.request.method for call in responses.calls] == [
+            "POST",
+            "PUT",
+            "PATCH",
+            "GET",
+        ]
+
+    @responses.activate
+    def test_concurrent_member_updates(self, client):
+        """Test many member updates can be scheduled concurrently."""
+        responses.patch(
+            re.compile(
+                r"https://us5\.api\.mailchimp\.com/3\.0/lists/test-list-id/members/.*"
+            ),
+            json={"status": "subscribed"},
+            status=200,
+        )
+        emails = [f"user{i}@example.com" for i in range(25)]
+
+        async def run():
+            async with client:
+                return await gather_bounded(
+                    (
+                        client.update_member(email, {"merge_fields": {"COUNTRY": "X"}})
+                        for email in emails
+                    ),
+                    limit=100,
+                )
+
+        results = asyncio.run(run())
+
+        assert len(results) == 25
+        assert len(responses.calls) == 25
+
+    @responses.activate
+    def test_errors_propagate(self, client):
+        """Test API errors are raised from the coroutine."""
+        responses.get(
+            "https://us5.api.mailchimp.com/3.0/lists/test-list-id/members",
+            json={"detail": "Not found"},
+            status=404,
+        )
+
+        with pytest.raises(MailchimpAPIError, match="Error listing members: 404"):
+            asyncio.run(client.list_members())
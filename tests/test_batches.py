@@ -0,0 +1,165 @@
+"""Tests for batch operations."""
+
+import io
+import json
+import tarfile
+
+import pytest
+import responses
+
+from newsletter_uploader.batches import (
+    BatchOperation,
+    BatchResult,
+    iter_batch_results,
+    member_update_operation,
+    run_batch,
+    wait_for_batch,
+)
+
+BASE_URL = "https://us5.api.mailchimp.com/3.0"
+ARCHIVE_URL = "https://mailchimp-batches.s3.amazonaws.com/batch123.tar.gz"
+
+
+def make_archive(*files):
+    """Build a gzipped tar archive of batch result files."""
+    buffer = io.BytesIO()
+    with tarfile.open(fileobj=buffer, mode="w:gz") as archive:
+        for name, results in files:
+            data = json.dumps(results).encode()
+            info = tarfile.TarInfo(name)
+            info.size = len(data)
+            archive.addfile(info, io.BytesIO(data))
+    return buffer.getvalue()
+
+
+def result(operation_id, status_code, body):
+    """Build one entry of a batch result file."""
+    return {
+        "status_code": status_code,
+        "operation_id": operation_id,
+        "response": json.dumps(body),
+    }
+
+
+class TestBatchOperation:
+    """Test BatchOperation and helpers."""
+
+    def test_member_update_operation(self):
+        """Test member updates become PATCH operations with JSON bodies."""
+        operation = member_update_operation(
+            "list1", "hash1", {"merge_fields": {"COUNTRY": "United Kingdom"}}
+        )
+
+        assert operation.to_dict() == {
+            "method": "PATCH",
+            "path": "/lists/list1/members/hash1",
+            "operation_id": "hash1",
+            "body": '{"merge_fields": {"COUNTRY": "United Kingdom"}}',
+        }
+
+    def test_operation_without_body(self):
+        """Test operations without a body omit it."""
+        operation = BatchOperation("GET", "/lists/list1", "op1")
+        assert "body" not in operation.to_dict()
+
+    def test_result_error(self):
+        """Test failed results expose Mailchimp's error detail."""
+        failed = BatchResult("op1", 400, {"title": "Invalid", "detail": "Bad field"})
+        assert not failed.ok
+        assert failed.error == "Bad field"
+        assert BatchResult("op2", 200, {}).error == ""
+
+
+class TestWaitForBatch:
+    """Test wait_for_batch function."""
+
+    @responses.activate
+    def test_polls_until_finished(self, client):
+        """Test status is polled until the batch finishes."""
+        url = f"{BASE_URL}/batches/batch123"
+        responses.get(url, json={"id": "batch123", "status": "pending"})
+        responses.get(url, json={"id": "batch123", "status": "started"})
+        responses.get(url, json={"id": "batch123", "status": "finished"})
+        sleeps = []
+        seen = []
+
+        batch = wait_for_batch(
+            client,
+            "batch123",
+            poll_interval=2,
+            on_progress=seen.append,
+            sleep=sleeps.append,
+        )
+
+        assert batch["status"] == "finished"
+        assert sleeps == [2, 2]
+        assert [b["status"] for b in seen] == ["pending", "started", "finished"]
+
+    @responses.activate
+    def test_timeout(self, client):
+        """Test waiting gives up after the timeout."""
+        responses.get(
+            f"{BASE_URL}/batches/batch123",
+            json={"id": "batch123", "status": "pending"},
+        )
+
+        with pytest.raises(TimeoutError, match="still pending"):
+            wait_for_batch(
+                client, "batch123", poll_interval=1, timeout=2, sleep=lambda _: None
+            )
+
+
+class TestBatchResults:
+    """Test streaming batch results."""
+
+    @responses.activate
+    def test_iter_batch_results(self):
+        """Test results are read from every file in the archive."""
+        archive = make_archive(
+            ("batch123/", []),
+            ("batch123/0.json", [result("a", 200, {"id": "a"})]),
+            ("batch123/1.json", [result("b", 404, {"detail": "Resource Not Found"})]),
+        )
+        responses.get(ARCHIVE_URL, body=archive)
+
+        results = list(iter_batch_results(ARCHIVE_URL))
+
+        assert [(r.operation_id, r.ok) for r in results] == [("a", True), ("b", False)]
+        assert results[1].error == "Resource Not Found"
+        assert "Authorization" not in responses.calls[0].request.headers
+
+    @responses.activate
+    def test_run_batch(self, client):
+        """Test a batch is submitted, awaited and its results streamed."""
+        responses.post(
+            f"{BASE_URL}/batches", json={"id": "batch123", "status": "pending"}
+        )
+        responses.get(
+            f"{BASE_URL}/batches/batch123",
+            json={
+                "id": "batch123",
+                "status": "finished",
+                "response_body_url": ARCHIVE_URL,
+            },
+        )
+        responses.get(
+            ARCHIVE_URL,
+            body=make_archive(
+                ("batch123/0.json", [result("h1", 200, {}), result("h2", 200, {})])
+            ),
+        )
+        operations = [
+            member_update_operation("test-list-id", member_id, {"status": "x"})
+            for member_id in ("h1", "h2")
+        ]
+
+        results = list(run_batch(client, operations, sleep=lambda _: None))
+
+        assert [r.operation_id for r in results] == ["h1", "h2"]
+        submitted = json.loads(responses.calls[0].request.body)
+        assert len(submitted["operations"]) == 2
+        assert submitted["operations"][0]["path"] == "/lists/test-list-id/members/h1"
+
+    def test_run_batch_without_operations(self, client):
+        """Test an empty batch is not submitted."""
+        assert list(run_batch(client, [])) == []
@@ -0,0 +1,124 @@
+"""Tests for LRU caches."""
+
+import json
+
+import pytest
+
+from newsletter_uploader.cache import (
+    LRUCache,
+    PersistentLRUCache,
+    config_hash,
+    default_cache_dir,
+    open_cache,
+)
+
+
+class TestLRUCache:
+    """Test LRUCache class."""
+
+    def test_get_and_put(self):
+        """Test cached values are returned and misses use the default."""
+        cache = LRUCache()
+        cache.put("a", 1)
+
+        assert cache.get("a") == 1
+        assert cache.get("b", "missing") == "missing"
+        assert (cache.hits, cache.misses) == (1, 1)
+
+    def test_evicts_least_recently_used(self):
+        """Test the least recently used entry is evicted when full."""
+        cache = LRUCache(max_size=2)
+        cache.put("a", 1)
+        cache.put("b", 2)
+        cache.get("a")
+        cache.put("c", 3)
+
+        assert "b" not in cache
+        assert [key for key, _ in cache.items()] == ["a", "c"]
+        assert len(cache) == 2
+
+    def test_rejects_empty_size(self):
+        """Test max_size must be positive."""
+        with pytest.raises(ValueError, match="max_size"):
+            LRUCache(max_size=0)
+
+
+class TestPersistentLRUCache:
+    """Test PersistentLRUCache class."""
+
+    def test_round_trip(self, tmp_path):
+        """Test entries saved by one run are loaded by the next."""
+        path = tmp_path / "cache.json"
+        with PersistentLRUCache(path, "config-1") as cache:
+            cache.put("gmail.com", [None, "Unknown"])
+
+        cache = PersistentLRUCache(path, "config-1")
+
+        assert cache.get("gmail.com") == [None, "Unknown"]
+
+    def test_invalidated_by_config_change(self, tmp_path):
+        """Test entries saved under another fingerprint are discarded."""
+        path = tmp_path / "cache.json"
+        with PersistentLRUCache(path, "config-1") as cache:
+            cache.put("gmail.com", "old")
+
+        with PersistentLRUCache(path, "config-2") as cache:
+            assert len(cache) == 0
+
+        assert json.loads(path.read_text())["fingerprint"] == "config-2"
+
+    def test_preserves_recency_order(self, tmp_path):
+        """Test eviction order survives saving and loading."""
+        path = tmp_path / "cache.json"
+        with PersistentLRUCache(path, "config", max_size=2) as cache:
+            cache.put("a", 1)
+            cache.put("b", 2)
+            cache.get("a")
+
+        cache = PersistentLRUCache(path, "config", max_size=2)
+        cache.put("c", 3)
+
+        assert "b" not in cache
+        assert "a" in cache
+
+    def test_unchanged_cache_not_written(self, tmp_path):
+        """Test saving without changes does not create a file."""
+        PersistentLRUCache(tmp_path / "cache.json", "config").save()
+
+        assert not (tmp_path / "cache.json").exists()
+
+    def test_corrupt_file_ignored(self, tmp_path):
+        """Test a corrupt cache file is rebuilt."""
+        path = tmp_path / "cache.json"
+        path.write_text("{not json")
+
+        assert len(PersistentLRUCache(path, "config")) == 0
+
+
+class TestCacheHelpers:
+    """Test cache directory and fingerprint helpers."""
+
+    def test_default_cache_dir_from_env(self, monkeypatch, tmp_path):
+        """Test NEWSLETTER_CACHE_DIR overrides the default."""
+        monkeypatch.setenv("NEWSLETTER_CACHE_DIR", str(tmp_path))
+
+        assert default_cache_dir() == tmp_path
+
+    def test_default_cache_dir_xdg(self, monkeypatch, tmp_path):
+        """Test the XDG cache directory is used otherwise."""
+        monkeypatch.delenv("NEWSLETTER_CACHE_DIR", raising=False)
+        monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+
+        assert default_cache_dir() == tmp_path / "newsletter-uploader"
+
+    def test_config_hash_ignores_key_order(self):
+        """Test equal configurations have equal fingerprints."""
+        assert config_hash({"a": 1, "b": [2]}) == config_hash({"b": [2], "a": 1})
+        assert config_hash({"a": 1}) != config_hash({"a": 2})
+
+    def test_open_cache(self, tmp_path):
+        """Test named caches live in the cache directory."""
+        cache = open_cache("domains", {"rules": 1}, cache_dir=tmp_path)
+
+        assert cache.path == tmp_path / "domains.json"
+        assert cache.fingerprint == config_hash({"rules": 1})
@@ -0,0 +1,142 @@
+"""Tests for per-domain classification."""
+
+import json
+
+import pytest
+
+from newsletter_uploader.classification import (
+    DomainClassification,
+    DomainClassifier,
+    open_domain_classifier,
+)
+from newsletter_uploader.countries import UNITED_STATES, CountryClassifier
+from newsletter_uploader.organizations import OrganizationRegistry
+
+MAPPINGS = {"tags": {"us": ["SALTernative"]}}
+
+ORGANIZATIONS = {
+    "organizations": [
+        {"domain": "urban.org", "name": "Urban Institute", "country": "us", "dc": True},
+        {"domain": "ippr.org", "name": "IPPR", "country": "uk"},
+    ]
+}
+
+
+@pytest.fixture
+def registry():
+    """Registry of the sample organizations."""
+    return OrganizationRegistry.from_config(ORGANIZATIONS)
+
+
+@pytest.fixture
+def countries(registry):
+    """Country rules including the sample organizations."""
+    return CountryClassifier(MAPPINGS, registry.country_rules())
+
+
+@pytest.fixture
+def mapping_path(tmp_path):
+    """Write the sample mapping file."""
+    path = tmp_path / "mapping.json"
+    path.write_text(json.dumps(MAPPINGS))
+    return path
+
+
+@pytest.fixture
+def organizations_path(tmp_path):
+    """Write the sample organizations file."""
+    path = tmp_path / "organizations.json"
+    path.write_text(json.dumps(ORGANIZATIONS))
+    return path
+
+
+class TestDomainClassifier:
+    """Test DomainClassifier class."""
+
+    def test_classify(self, countries, registry):
+        """Test domains get a country, organization and DMV flag."""
+        classifier = DomainClassifier(countries, registry)
+
+        assert classifier.classify("urban.org") == DomainClassification(
+            country=UNITED_STATES,
+            reason="US org: urban.org",
+            organization="Urban Institute",
+            dmv=True,
+        )
+        assert classifier.classify("ippr.org").organization == "IPPR"
+        assert classifier.classify("ippr.org").dmv is False
+        assert classifier.classify("gmail.com").dmv is False
+
+    def test_classify_subdomain(self, countries, registry):
+        """Test subdomains are classified as their organization."""
+        classifier = DomainClassifier(countries, registry)
+
+        classification = classifier.classify("research.urban.org")
+
+        assert classification.organization == "Urban Institute"
+        assert classification.dmv is True
+
+    def test_domains_classified_once(self, countries, registry, mocker):
+        """Test repeated domains are served from the cache."""
+        spy = mocker.spy(countries, "classify_domain")
+        classifier = DomainClassifier(countries, registry)
+
+        for _ in range(3):
+            classifier.classify("urban.org")
+
+        assert spy.call_count == 1
+        assert classifier.cache.hits == 2
+
+    def test_infer_country_checks_tags_first(self, countries, registry):
+        """Test tag rules win over the cached domain classification."""
+        classifier = DomainClassifier(countries, registry)
+
+        assert classifier.infer_country("a@ippr.org", ["SALTernative"]) == (
+            UNITED_STATES,
+            "Tag: SALTernative",
+        )
+        assert classifier.infer_country("a@ippr.org")[1] == "UK org: ippr.org"
+
+
+class TestOpenDomainClassifier:
+    """Test open_domain_classifier function."""
+
+    def test_cache_persists_between_runs(
+        self, mapping_path, organizations_path, tmp_path
+    ):
+        """Test classifications are reused by later runs."""
+        with open_domain_classifier(
+            mapping_path, organizations_path, cache_dir=tmp_path
+        ) as classifier:
+            classifier.classify("urban.org")
+
+        classifier = open_domain_classifier(
+            mapping_path, organizations_path, cache_dir=tmp_path
+        )
+
+        assert "urban.org" in classifier.cache
+        assert classifier.classify("urban.org").organization == "Urban Institute"
+
+    def test_config_change_invalidates_cache(
+        self, mapping_path, organizations_path, tmp_path
+    ):
+        """Test editing the mapping or organizations discards the cache."""
+        with open_domain_classifier(
+            mapping_path, organizations_path, cache_dir=tmp_path
+        ) as classifier:
+            classifier.classify("urban.org")
+
+        mapping_path.write_text(json.dumps({"tags": {}}))
+        classifier = open_domain_classifier(
+            mapping_path, organizations_path, cache_dir=tmp_path
+        )
+        assert len(classifier.cache) == 0
+        classifier.classify("urban.org")
+        classifier.save()
+
+        organizations_path.write_text(json.dumps({"organizations": []}))
+        classifier = open_domain_classifier(
+            mapping_path, organizations_path, cache_dir=tmp_path
+        )
+        assert len(classifier.cache) == 0
+        assert classifier.classify("urban.org").country is None
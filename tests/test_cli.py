@@ -1,9 +1,13 @@
 """Tests for CLI interface."""
 
+import json
+
 import pytest
 from click.testing import CliRunner
 
-from newsletter_uploader.cli import main
+from newsletter_uploader.cli import main, upload_editions
+from newsletter_uploader.snapshot import write_snapshot
+from newsletter_uploader.uploader import CampaignContentError
 
 
 @pytest.fixture
@@ -198,3 +202,273 @@ class TestCLI:
         )
         # File should not exist, so Click should error before we even try to upload
         assert result.exit_code != 0
+
+    def test_cli_previews_recipients(self, runner, html_file, mocker, tmp_path):
+        """Test CLI prints recipient counts from a snapshot before creating."""
+        write_snapshot(
+            [
+                {
+                    "id": "a",
+                    "email_address": "a@gov.uk",
+                    "status": "subscribed",
+                    "merge_fields": {"COUNTRY": "United Kingdom"},
+                },
+                {"id": "b", "email_address": "b@urban.org", "status": "subscribed"},
+            ],
+            tmp_path / "snapshot",
+        )
+        mocker.patch("newsletter_uploader.cli.MailchimpClient")
+        mock_uploader = mocker.patch(
+            "newsletter_uploader.cli.NewsletterUploader"
+        ).return_value
+        mock_uploader.upload.return_value = {"campaign_id": "abc123", "web_id": 1}
+
+        result = runner.invoke(
+            main,
+            [
+                str(html_file),
+                "--audience",
+                "uk",
+                "--subject",
+                "Test",
+                "--preview",
+                "Preview",
+                "--api-key",
+                "test-key-us5",
+                "--snapshot",
+                str(tmp_path / "snapshot"),
+            ],
+        )
+
+        assert result.exit_code == 0
+        assert "Expected recipients" in result.output
+        assert "UK          1  ← this campaign" in result.output
+        assert "US          1\n" in result.output
+        assert "ALL         2\n" in result.output
+        assert result.output.index("Expected") < result.output.index(
+            "Creating campaign"
+        )
+
+    def test_cli_skips_missing_snapshot(self, runner, html_file, mocker, tmp_path):
+        """Test CLI still creates the campaign without a snapshot."""
+        mocker.patch("newsletter_uploader.cli.MailchimpClient")
+        mock_uploader = mocker.patch(
+            "newsletter_uploader.cli.NewsletterUploader"
+        ).return_value
+        mock_uploader.upload.return_value = {"campaign_id": "abc123", "web_id": 1}
+
+        result = runner.invoke(
+            main,
+            [
+                str(html_file),
+                "--audience",
+                "us",
+                "--subject",
+                "Test",
+                "--preview",
+                "Preview",
+                "--api-key",
+                "test-key-us5",
+                "--snapshot",
+                str(tmp_path / "missing"),
+            ],
+        )
+
+        assert result.exit_code == 0
+        assert "skipping recipient preview" in result.output
+        assert "CREATED SUCCESSFULLY" in result.output
+
+    def test_cli_update_force(self, runner, html_file, mocker):
+        """Test --force is passed through to the update."""
+        mocker.patch("newsletter_uploader.cli.MailchimpClient")
+        mocker.patch("newsletter_uploader.cli.open_campaign_cache")
+        mock_uploader = mocker.patch(
+            "newsletter_uploader.cli.NewsletterUploader"
+        ).return_value
+        mock_uploader.update.return_value = {
+            "campaign_id": "abc123",
+            "web_id": 1,
+            "content_uploaded": True,
+        }
+
+        result = runner.invoke(
+            main,
+            [
+                str(html_file),
+                "--campaign-id",
+                "abc123",
+                "--subject",
+                "Test",
+                "--preview",
+                "Preview",
+                "--api-key",
+                "test-key-us5",
+                "--force",
+            ],
+        )
+
+        assert result.exit_code == 0
+        assert mock_uploader.update.call_args[1]["force"] is True
+        assert "unchanged" not in result.output
+
+    def test_cli_update_reports_skipped_content(self, runner, html_file, mocker):
+        """Test CLI says when unchanged content was not re-sent."""
+        mocker.patch("newsletter_uploader.cli.MailchimpClient")
+        mocker.patch("newsletter_uploader.cli.open_campaign_cache")
+        mock_uploader = mocker.patch(
+            "newsletter_uploader.cli.NewsletterUploader"
+        ).return_value
+        mock_uploader.update.return_value = {
+            "campaign_id": "abc123",
+            "web_id": 1,
+            "content_uploaded": False,
+        }
+
+        result = runner.invoke(
+            main,
+            [
+                str(html_file),
+                "--campaign-id",
+                "abc123",
+                "--subject",
+                "Test",
+                "--preview",
+                "Preview",
+                "--api-key",
+                "test-key-us5",
+            ],
+        )
+
+        assert result.exit_code == 0
+        assert mock_uploader.update.call_args[1]["force"] is False
+        assert "Content unchanged since last upload" in result.output
+
+
+@pytest.fixture
+def manifest(tmp_path):
+    """Create a manifest listing a UK and a US edition."""
+    for name in ("uk.html", "us.html"):
+        (tmp_path / name).write_text("<html><body>Test</body></html>")
+    path = tmp_path / "manifest.json"
+    path.write_text(
+        json.dumps(
+            {
+                "editions": [
+                    {
+                        "file": "uk.html",
+                        "audience": "uk",
+                        "subject": "UK",
+                        "preview": "UK preview",
+                    },
+                    {
+                        "file": "us.html",
+                        "campaign_id": "abc123",
+                        "subject": "US",
+                        "preview": "US preview",
+                    },
+                ]
+            }
+        )
+    )
+    return path
+
+
+class TestUploadEditions:
+    """Test the manifest command."""
+
+    def test_requires_api_key(self, runner, manifest, monkeypatch):
+        """Test an API key is required."""
+        monkeypatch.delenv("MAILCHIMP_API_KEY", raising=False)
+        result = runner.invoke(upload_editions, [str(manifest)])
+        assert result.exit_code == 1
+        assert "MAILCHIMP_API_KEY not found" in result.output
+
+    def test_invalid_manifest(self, runner, tmp_path):
+        """Test manifest errors are reported before uploading."""
+        path = tmp_path / "manifest.json"
+        path.write_text(json.dumps({"editions": [{"file": "uk.html"}]}))
+        result = runner.invoke(
+            upload_editions, [str(path), "--api-key", "test-key-us5"]
+        )
+        assert result.exit_code == 1
+        assert "missing subject, preview" in result.output
+
+    def test_results_table(self, runner, manifest, mocker):
+        """Test every edition is listed in one table."""
+        mocker.patch("newsletter_uploader.cli.MailchimpClient")
+        mocker.patch("newsletter_uploader.cli.open_campaign_cache")
+        mock_uploader = mocker.patch(
+            "newsletter_uploader.cli.NewsletterUploader"
+        ).return_value
+        mock_uploader.upload.return_value = {"campaign_id": "new123", "web_id": 11}
+        mock_uploader.update.return_value = {
+            "campaign_id": "abc123",
+            "web_id": 22,
+            "content_uploaded": False,
+        }
+
+        result = runner.invoke(
+            upload_editions, [str(manifest), "--api-key", "test-key-us5"]
+        )
+
+        assert result.exit_code == 0
+        lines = result.output.splitlines()
+        header = lines.index(next(line for line in lines if line.startswith("File")))
+        assert lines[header + 1].split()[:5] == [
+            "uk.html",
+            "UK",
+            "create",
+            "new123",
+            "11",
+        ]
+        assert lines[header + 2].split()[:5] == [
+            "us.html",
+            "-",
+            "update",
+            "abc123",
+            "22",
+        ]
+        assert "content unchanged" in lines[header + 2]
+        assert "us5.admin.mailchimp.com/campaigns/edit?id=11" in result.output
+        assert "DRAFTS" in result.output
+
+    def test_partial_failure(self, runner, manifest, mocker):
+        """Test failures are reported without stopping other editions."""
+        mocker.patch("newsletter_uploader.cli.MailchimpClient")
+        mocker.patch("newsletter_uploader.cli.open_campaign_cache")
+        mock_uploader = mocker.patch(
+            "newsletter_uploader.cli.NewsletterUploader"
+        ).return_value
+        mock_uploader.upload.side_effect = Exception("API Error")
+        mock_uploader.update.return_value = {"campaign_id": "abc123", "web_id": 22}
+
+        result = runner.invoke(
+            upload_editions, [str(manifest), "--api-key", "test-key-us5"]
+        )
+
+        assert result.exit_code == 1
+        assert "❌ failed" in result.output
+        assert "1 of 2 editions failed" in result.output
+        assert "uk.html: API Error" in result.output
+        assert "edit?id=22" in result.output
+
+    def test_created_draft_reported(self, runner, manifest, mocker):
+        """Test a draft created before its content failed is listed."""
+        mocker.patch("newsletter_uploader.cli.MailchimpClient")
+        mocker.patch("newsletter_uploader.cli.open_campaign_cache")
+        mock_uploader = mocker.patch(
+            "newsletter_uploader.cli.NewsletterUploader"
+        ).return_value
+        mock_uploader.upload.side_effect = CampaignContentError(
+            "new123", 11, Exception("Upload Error")
+        )
+        mock_uploader.update.return_value = {"campaign_id": "abc123", "web_id": 22}
+
+        result = runner.invoke(
+            upload_editions, [str(manifest), "--api-key", "test-key-us5"]
+        )
+
+        assert result.exit_code == 1
+        row = next(line for line in result.output.splitlines() if "uk.html" in line)
+        assert row.split()[:5] == ["uk.html", "UK", "create", "new123", "11"]
+        assert "draft kept" in row
@@ -0,0 +1,118 @@
+"""Tests for bulk contact imports."""
+
+import json
+
+import pytest
+import responses
+
+from newsletter_uploader.contacts import chunked, import_contacts, read_contacts
+
+LIST_URL = "https://us5.api.mailchimp.com/3.0/lists/test-list-id"
+
+
+@pytest.fixture
+def csv_file(tmp_path):
+    """Create a contacts CSV file."""
+    path = tmp_path / "contacts.csv"
+    path.write_text(
+        "email,first_name\n"
+        " ada@example.co.uk ,Ada\n"
+        ",Nobody\n"
+        "bob@example.org,\n"
+    )
+    return path
+
+
+class TestReadContacts:
+    """Test read_contacts function."""
+
+    def test_reads_members(self, csv_file):
+        """Test rows become member dicts with mapped merge fields."""
+        contacts = list(
+            read_contacts(
+                csv_file,
+                merge_fields={"COUNTRY": "United Kingdom"},
+                columns={"first_name": "FNAME"},
+            )
+        )
+
+        assert contacts == [
+            {
+                "email_address": "ada@example.co.uk",
+                "status_if_new": "subscribed",
+                "merge_fields": {"COUNTRY": "United Kingdom", "FNAME": "Ada"},
+            },
+            {
+                "email_address": "bob@example.org",
+                "status_if_new": "subscribed",
+                "merge_fields": {"COUNTRY": "United Kingdom"},
+            },
+        ]
+
+
+class TestChunked:
+    """Test chunked function."""
+
+    def test_splits_into_chunks(self):
+        """Test items are split into chunks of at most the given size."""
+        assert list(chunked(range(5), 2)) == [[0, 1], [2, 3], [4]]
+
+    def test_empty(self):
+        """Test an empty iterable yields no chunks."""
+        assert list(chunked([], 2)) == []
+
+
+class TestImportContacts:
+    """Test import_contacts function."""
+
+    @responses.activate
+    def test_one_request_per_chunk(self, client):
+        """Test contacts are upserted in chunks with per-email errors."""
+        responses.post(
+            LIST_URL,
+            json={"total_created": 1, "total_updated": 1, "errors": []},
+        )
+        responses.post(
+            LIST_URL,
+            json={
+                "total_created": 0,
+                "total_updated": 0,
+                "errors": [
+                    {"email_address": "c@example.com", "error": "Invalid Resource"}
+                ],
+            },
+        )
+        contacts = (
+            {"email_address": f"{name}@example.com", "status_if_new": "subscribed"}
+            for name in "abc"
+        )
+
+        results = list(import_contacts(client, contacts, chunk_size=2))
+
+        assert [r.submitted for r in results] == [2, 1]
+        assert results[0].created == 1
+        assert results[1].errors[0]["email_address"] == "c@example.com"
+        body = json.loads(responses.calls[0].request.body)
+        assert body["update_existing"] is True
+        assert len(body["members"]) == 2
+        assert "errors" in responses.calls[0].request.params["fields"]
+
+    @responses.activate
+    def test_existing_members_keep_their_status(self, client, csv_file):
+        """Test imports only set the status of members new to the list."""
+        responses.post(LIST_URL, json={"total_created": 0, "total_updated": 2})
+        contacts = read_contacts(csv_file, merge_fields={"COUNTRY": "United Kingdom"})
+
+        list(import_contacts(client, contacts))
+
+        body = json.loads(responses.calls[0].request.body)
+        assert body["update_existing"] is True
+        for member in body["members"]:
+            assert "status" not in member
+            assert member["status_if_new"] == "subscribed"
+            assert member["merge_fields"]["COUNTRY"] == "United Kingdom"
+
+    def test_rejects_oversized_chunks(self, client):
+        """Test chunks larger than the endpoint allows are rejected."""
+        with pytest.raises(ValueError, match="chunk_size"):
+            list(import_contacts(client, [], chunk_size=501))
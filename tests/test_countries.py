@@ -0,0 +1,130 @@
+"""Tests for country inference."""
+
+import json
+
+import pytest
+
+from newsletter_uploader.countries import (
+    UNITED_KINGDOM,
+    UNITED_STATES,
+    CountryClassifier,
+    TagMatcher,
+    normalize_tag,
+)
+
+MAPPINGS = {
+    "uk_organizations": ["ippr.org"],
+    "us_organizations": ["urban.org", "brookings.edu"],
+    "tags": {"us": ["Arnold Ventures SALTernative"]},
+}
+
+
+@pytest.fixture
+def classifier():
+    """Classifier compiled from sample mappings."""
+    return CountryClassifier(MAPPINGS)
+
+
+class TestCountryClassifier:
+    """Test CountryClassifier class."""
+
+    def test_uk_tld(self, classifier):
+        """Test any .uk domain is classified as UK."""
+        assert classifier.classify("a@ox.ac.uk") == (UNITED_KINGDOM, "UK domain")
+
+    def test_us_tlds(self, classifier):
+        """Test .gov, .edu and .us domains are classified as US."""
+        assert classifier.classify("a@senate.gov")[1] == "US domain (.edu/.gov)"
+        assert classifier.classify("a@mit.edu")[0] == UNITED_STATES
+        assert classifier.classify("a@city.ny.us")[1] == "US domain (.us)"
+
+    def test_organizations(self, classifier):
+        """Test organization domains and their subdomains."""
+        assert classifier.classify("a@ippr.org") == (UNITED_KINGDOM, "UK org: ippr.org")
+        assert classifier.classify("a@research.urban.org") == (
+            UNITED_STATES,
+            "US org: urban.org",
+        )
+
+    def test_most_specific_rule(self, classifier):
+        """Test organization rules take precedence over their TLD."""
+        assert classifier.classify("a@brookings.edu")[1] == "US org: brookings.edu"
+
+    def test_no_false_substring_matches(self, classifier):
+        """Test domains merely containing an organization do not match."""
+        assert classifier.classify("a@suburban.org") == (
+            None,
+            "Unknown (generic domain)",
+        )
+        assert classifier.classify("a@mail.uk.example.com")[0] is None
+
+    def test_tags_checked_first(self, classifier):
+        """Test US tags win over the domain."""
+        country, reason = classifier.classify(
+            "a@gov.uk", ["arnold ventures saltERNATIVE"]
+        )
+
+        assert country == UNITED_STATES
+        assert reason == "Tag: Arnold Ventures SALTernative"
+
+    def test_tags_match_whole_names(self, classifier):
+        """Test tag rules do not match across tag boundaries."""
+        assert classifier.classify_tags(["Arnold Ventures", "SALTernative"]) is None
+        assert classifier.classify_tags(["Arnold Ventures SALTernative 2024"]) is None
+
+    def test_uk_tags(self):
+        """Test the tags section can assign UK."""
+        classifier = CountryClassifier({"tags": {"uk": ["UK Policy"]}})
+
+        assert classifier.classify("a@gmail.com", ["uk  policy"]) == (
+            UNITED_KINGDOM,
+            "Tag: UK Policy",
+        )
+
+    def test_unknown_tag_country(self):
+        """Test unknown countries in the tags section are rejected."""
+        with pytest.raises(ValueError, match="Unknown country in tags mapping"):
+            CountryClassifier({"tags": {"fr": ["France"]}})
+
+    def test_extra_rules(self):
+        """Test organization rules passed alongside the mapping are indexed."""
+        classifier = CountryClassifier(
+            {}, [("capuk.org", UNITED_KINGDOM, "UK org: capuk.org")]
+        )
+
+        assert classifier.classify("a@capuk.org") == (
+            UNITED_KINGDOM,
+            "UK org: capuk.org",
+        )
+
+    def test_from_file(self, tmp_path):
+        """Test rules are compiled from a mapping file."""
+        path = tmp_path / "mapping.json"
+        path.write_text(json.dumps(MAPPINGS))
+
+        classifier = CountryClassifier.from_file(path)
+
+        assert classifier.classify("a@ippr.org")[0] == UNITED_KINGDOM
+
+
+class TestTagMatcher:
+    """Test TagMatcher class."""
+
+    def test_normalize_tag(self):
+        """Test case and whitespace are ignored."""
+        assert normalize_tag("  Arnold   Ventures ") == "arnold ventures"
+
+    def test_match(self):
+        """Test member tags are looked up by exact normalized name."""
+        matcher = TagMatcher([("DC Policy", "dc")])
+
+        assert matcher.match(["Newsletter", "dc policy"]) == ("dc", "DC Policy")
+        assert matcher.match(["DC"]) is None
+        assert matcher.match([]) is None
+
+    def test_first_rule_wins(self):
+        """Test priority follows the order rules were added."""
+        matcher = TagMatcher([("first", "1"), ("second", "2"), ("FIRST", "3")])
+
+        assert matcher.match(["second", "first"]) == ("1", "first")
+        assert len(matcher) == 2
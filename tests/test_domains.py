@@ -0,0 +1,64 @@
+"""Tests for the domain suffix index."""
+
+import pytest
+
+from newsletter_uploader.domains import DomainSuffixIndex, email_domain
+
+
+class TestEmailDomain:
+    """Test email_domain function."""
+
+    def test_lowercases_domain(self):
+        """Test the domain is taken after the last @ and lowercased."""
+        assert email_domain("Ada@Research.Urban.ORG") == "research.urban.org"
+
+    def test_no_domain(self):
+        """Test addresses without an @ have no domain."""
+        assert email_domain("not-an-email") == ""
+
+
+class TestDomainSuffixIndex:
+    """Test DomainSuffixIndex class."""
+
+    @pytest.fixture
+    def index(self):
+        """Index with TLD and organization rules."""
+        return DomainSuffixIndex(
+            [("uk", "tld"), ("gov.uk", "government"), ("urban.org", "org")]
+        )
+
+    def test_exact_match(self, index):
+        """Test a domain equal to a suffix matches it."""
+        assert index.lookup("urban.org") == ("urban.org", "org")
+
+    def test_subdomain_match(self, index):
+        """Test subdomains match their parent's suffix."""
+        assert index.lookup("research.urban.org") == ("urban.org", "org")
+
+    def test_whole_labels_only(self, index):
+        """Test suffixes do not match inside a label."""
+        assert index.lookup("suburban.org") is None
+        assert "suburban.org" not in index
+
+    def test_most_specific_wins(self, index):
+        """Test the longest matching suffix is returned."""
+        assert index.lookup("hmt.gov.uk") == ("gov.uk", "government")
+        assert index.lookup("ox.ac.uk") == ("uk", "tld")
+
+    def test_no_match(self, index):
+        """Test unknown and empty domains do not match."""
+        assert index.lookup("gmail.com") is None
+        assert index.lookup("") is None
+        assert index.lookup("a..uk") == ("uk", "tld")
+
+    def test_add_replaces_value(self, index):
+        """Test re-adding a suffix replaces its value."""
+        index.add(".URBAN.org", "replaced")
+
+        assert index.lookup("urban.org") == ("urban.org", "replaced")
+        assert len(index) == 3
+
+    def test_rejects_empty_suffix(self):
+        """Test empty suffixes are rejected."""
+        with pytest.raises(ValueError, match="Invalid domain suffix"):
+            DomainSuffixIndex().add("", "value")
@@ -0,0 +1,121 @@
+"""Tests for the member write executor."""
+
+import threading
+import time
+
+import pytest
+
+from newsletter_uploader.executor import (
+    MemberWriteExecutor,
+    Progress,
+    format_progress,
+)
+
+
+class TestMemberWriteExecutor:
+    """Test MemberWriteExecutor class."""
+
+    def test_results_in_item_order(self):
+        """Test results line up with items even when they finish out of order."""
+
+        def operation(item):
+            time.sleep(0.01 * (5 - item))
+            return item * 2
+
+        results = MemberWriteExecutor(max_workers=5).run(operation, range(5))
+
+        assert [result.item for result in results] == [0, 1, 2, 3, 4]
+        assert [result.value for result in results] == [0, 2, 4, 6, 8]
+        assert all(result.ok for result in results)
+
+    def test_failures_are_recorded(self):
+        """Test a failing item does not stop the others."""
+
+        def operation(item):
+            if item == "bad":
+                raise ValueError("rejected")
+            return item
+
+        results = MemberWriteExecutor().run(operation, ["a", "bad", "b"])
+
+        assert [result.ok for result in results] == [True, False, True]
+        assert str(results[1].error) == "rejected"
+        assert results[1].value is None
+
+    def test_concurrency_is_bounded(self):
+        """Test no more than max_workers operations run at once."""
+        lock = threading.Lock()
+        running = []
+        peak = []
+
+        def operation(item):
+            with lock:
+                running.append(item)
+                peak.append(len(running))
+            time.sleep(0.01)
+            with lock:
+                running.remove(item)
+
+        MemberWriteExecutor(max_workers=3).run(operation, range(12))
+
+        assert max(peak) == 3
+
+    def test_reports_progress(self):
+        """Test progress is reported while running and once at the end."""
+        ticks = iter(range(100))
+        reports = []
+
+        executor = MemberWriteExecutor(
+            max_workers=1,
+            on_progress=reports.append,
+            progress_interval=2,
+            clock=lambda: next(ticks),
+        )
+        executor.run(lambda item: item, range(4))
+
+        assert [report.done for report in reports] == [2, 4, 4]
+        assert reports[-1] == Progress(
+            done=4, total=4, succeeded=4, failed=0, elapsed=5
+        )
+
+    def test_on_result_called_per_item(self):
+        """Test on_result sees every result as it completes."""
+        seen = []
+
+        MemberWriteExecutor().run(lambda item: item, ["a", "b"], on_result=seen.append)
+
+        assert sorted(result.item for result in seen) == ["a", "b"]
+
+    def test_empty(self):
+        """Test running with no items."""
+        assert MemberWriteExecutor().run(lambda item: item, []) == []
+
+    def test_interrupt_propagates(self):
+        """Test an error in a callback stops the run."""
+
+        def on_result(result):
+            raise KeyboardInterrupt
+
+        with pytest.raises(KeyboardInterrupt):
+            MemberWriteExecutor(max_workers=1).run(
+                lambda item: item, range(5), on_result=on_result
+            )
+
+
+class TestProgress:
+    """Test Progress throughput estimates."""
+
+    def test_rate_and_eta(self):
+        """Test rate and ETA are derived from elapsed time."""
+        progress = Progress(done=50, total=150, succeeded=49, failed=1, elapsed=10)
+
+        assert progress.rate == 5
+        assert progress.eta == 20
+        assert format_progress(progress) == "50/150 (1 failed, 5.0/s, ETA 20s)"
+
+    def test_eta_unknown_before_first_result(self):
+        """Test ETA is unknown until something has completed."""
+        progress = Progress(done=0, total=10, succeeded=0, failed=0, elapsed=0)
+
+        assert progress.eta is None
+        assert "ETA ?" in format_progress(progress)
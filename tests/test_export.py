@@ -0,0 +1,114 @@
+"""Tests for streaming CSV export."""
+
+import csv
+import gzip
+import io
+from operator import itemgetter
+
+import pytest
+
+from newsletter_uploader.export import CSVSink, compression_for, open_output
+
+FIELDNAMES = ("name", "team")
+
+
+def read_csv(path, compression=None):
+    """Read an exported CSV back as dicts."""
+    opener = gzip.open if compression == "gzip" else open
+    with opener(path, "rt", newline="", encoding="utf-8") as f:
+        return list(csv.DictReader(f))
+
+
+def rows(n):
+    """Rows with a repeating team and descending names."""
+    return [{"name": f"n{n - i:05}", "team": f"t{i % 3}"} for i in range(n)]
+
+
+class TestCompression:
+    """Test compression helpers."""
+
+    def test_compression_for(self):
+        """Test compression is inferred from the file suffix."""
+        assert compression_for("out.csv.gz") == "gzip"
+        assert compression_for("out.csv.zst") == "zstd"
+        assert compression_for("out.csv") is None
+
+    def test_unsupported(self, tmp_path):
+        """Test unknown compressions are rejected."""
+        with pytest.raises(ValueError, match="Unsupported compression"):
+            open_output(tmp_path / "out.csv", "brotli")
+
+    def test_zstd_without_zstandard(self, tmp_path, mocker):
+        """Test zstd explains how to install its optional dependency."""
+        mocker.patch.dict("sys.modules", {"zstandard": None})
+
+        with pytest.raises(ImportError, match="zstandard"):
+            open_output(tmp_path / "out.csv.zst", "zstd")
+
+
+class TestCSVSink:
+    """Test CSVSink class."""
+
+    def test_unsorted_rows_written_immediately(self, tmp_path):
+        """Test rows without a sort key are written in arrival order."""
+        path = tmp_path / "out.csv"
+        sink = CSVSink(path, FIELDNAMES)
+        sink.write_rows(rows(3))
+
+        assert sink.close() == 3
+        assert read_csv(path) == rows(3)
+
+    def test_sorted_in_memory(self, tmp_path):
+        """Test rows are sorted on close without spilling when they fit."""
+        path = tmp_path / "out.csv"
+        with CSVSink(path, FIELDNAMES, sort_key=itemgetter("name")) as sink:
+            sink.write_rows(rows(10))
+
+        assert sink.runs == []
+        assert read_csv(path) == sorted(rows(10), key=itemgetter("name"))
+
+    def test_external_sort(self, tmp_path):
+        """Test rows beyond the buffer are spilled and merged in order."""
+        path = tmp_path / "out.csv"
+        key = itemgetter("team")
+        with CSVSink(path, FIELDNAMES, sort_key=key, buffer_rows=4) as sink:
+            sink.write_rows(rows(25))
+            spilled = list(sink.runs)
+
+        assert len(spilled) == 6
+        # Stable: equal teams keep their arrival order
+        assert read_csv(path) == sorted(rows(25), key=key)
+        assert not any(run.exists() for run in spilled)
+
+    def test_gzip(self, tmp_path):
+        """Test output is gzip-compressed for .gz paths."""
+        path = tmp_path / "out.csv.gz"
+        with CSVSink(path, FIELDNAMES, sort_key=itemgetter("name")) as sink:
+            sink.write_rows(rows(5))
+
+        assert read_csv(path, "gzip") == sorted(rows(5), key=itemgetter("name"))
+
+    def test_zstd(self, tmp_path):
+        """Test output is zstd-compressed when zstandard is installed."""
+        zstandard = pytest.importorskip("zstandard")
+        path = tmp_path / "out.csv.zst"
+        with CSVSink(path, FIELDNAMES) as sink:
+            sink.write_rows(rows(5))
+
+        with open(path, "rb") as f:
+            reader = zstandard.ZstdDecompressor().stream_reader(f)
+            text = io.TextIOWrapper(reader, encoding="utf-8", newline="")
+            assert list(csv.DictReader(text)) == rows(5)
+
+    def test_empty(self, tmp_path):
+        """Test an empty sink writes just the header."""
+        path = tmp_path / "out.csv"
+        with CSVSink(path, FIELDNAMES, sort_key=itemgetter("name")):
+            pass
+
+        assert path.read_bytes() == b"name,team\r\n"
+
+    def test_invalid_buffer(self, tmp_path):
+        """Test the buffer must hold at least one row."""
+        with pytest.raises(ValueError, match="buffer_rows"):
+            CSVSink(tmp_path / "out.csv", FIELDNAMES, buffer_rows=0)
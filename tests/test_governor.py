@@ -0,0 +1,173 @@
+"""Tests for the request governor."""
+
+import threading
+import time
+
+import pytest
+import responses
+
+from newsletter_uploader.governor import RequestGovernor, parse_retry_after
+from newsletter_uploader.mailchimp_client import MailchimpAPIError, MailchimpClient
+
+
+class FakeResponse:
+    """Minimal stand-in for a requests response."""
+
+    def __init__(self, status_code, headers=None):
+        self.status_code = status_code
+        self.headers = headers or {}
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+
+@pytest.fixture
+def sleeps():
+    """Record requested sleep durations instead of sleeping."""
+    return []
+
+
+@pytest.fixture
+def governor(sleeps):
+    """Create a governor that does not actually sleep."""
+    return RequestGovernor(
+        max_concurrency=2, max_retries=3, backoff_base=0.01, sleep=sleeps.append
+    )
+
+
+class TestParseRetryAfter:
+    """Test parse_retry_after function."""
+
+    def test_seconds(self):
+        """Test delay given in seconds."""
+        assert parse_retry_after("5") == 5.0
+
+    def test_http_date_in_past(self):
+        """Test HTTP dates in the past mean no wait."""
+        assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0.0
+
+    def test_missing_or_invalid(self):
+        """Test missing or unparseable headers return None."""
+        assert parse_retry_after(None) is None
+        assert parse_retry_after("soon") is None
+
+
+class TestRequestGovernor:
+    """Test RequestGovernor class."""
+
+    def test_success_not_retried(self, governor, sleeps):
+        """Test successful responses are returned immediately."""
+        response = governor.call(lambda: FakeResponse(200))
+
+        assert response.status_code == 200
+        assert sleeps == []
+        assert governor.stats.requests == 1
+        assert governor.stats.retries == 0
+
+    def test_retries_429_using_retry_after(self, governor, sleeps):
+        """Test 429 responses are retried after the Retry-After delay."""
+        responses_iter = iter(
+            [FakeResponse(429, {"Retry-After": "0"}), FakeResponse(200)]
+        )
+
+        response = governor.call(lambda: next(responses_iter))
+
+        assert response.status_code == 200
+        assert len(sleeps) == 1
+        assert 0 <= sleeps[0] <= governor.backoff_base
+        assert governor.stats.retries == 1
+        assert governor.stats.backoff_wait == sleeps[0]
+
+    def test_retries_server_errors_with_backoff(self, governor, sleeps):
+        """Test 5xx responses back off within the exponential window."""
+        responses_iter = iter([FakeResponse(503), FakeResponse(502), FakeResponse(200)])
+
+        response = governor.call(lambda: next(responses_iter))
+
+        assert response.status_code == 200
+        assert 0 <= sleeps[0] <= 0.01
+        assert 0 <= sleeps[1] <= 0.02
+
+    def test_server_errors_not_retried_when_disabled(self, governor, sleeps):
+        """Test 5xx responses are returned as-is for non-idempotent calls."""
+        response = governor.call(lambda: FakeResponse(500), retry_server_errors=False)
+
+        assert response.status_code == 500
+        assert sleeps == []
+
+    def test_retried_responses_closed(self, governor):
+        """Test responses that are retried release their connection."""
+        throttled = FakeResponse(429, {"Retry-After": "0"})
+        responses_iter = iter([throttled, FakeResponse(200)])
+
+        response = governor.call(lambda: next(responses_iter))
+
+        assert throttled.closed
+        assert not response.closed
+
+    def test_gives_up_after_max_retries(self, governor, sleeps):
+        """Test the last error response is returned once retries run out."""
+        response = governor.call(lambda: FakeResponse(503))
+
+        assert response.status_code == 503
+        assert len(sleeps) == 3
+
+    def test_caps_concurrency(self):
+        """Test no more than max_concurrency calls are in flight at once."""
+        governor = RequestGovernor(max_concurrency=2)
+        peak = []
+
+        def send():
+            peak.append(governor.in_flight)
+            time.sleep(0.01)
+            return FakeResponse(200)
+
+        threads = [
+            threading.Thread(target=governor.call, args=(send,)) for _ in range(8)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert max(peak) <= 2
+        assert governor.in_flight == 0
+        assert governor.stats.requests == 8
+        assert governor.stats.queue_wait > 0
+
+
+class TestClientGovernance:
+    """Test MailchimpClient routes requests through the governor."""
+
+    @responses.activate
+    def test_client_retries_rate_limited_request(self, sleeps):
+        """Test the client retries a 429 and succeeds."""
+        client = MailchimpClient(
+            api_key="test-key-us5",
+            list_id="list",
+            governor=RequestGovernor(backoff_base=0.01, sleep=sleeps.append),
+        )
+        url = "https://us5.api.mailchimp.com/3.0/campaigns/campaign123"
+        responses.get(url, status=429, headers={"Retry-After": "0"})
+        responses.get(url, json={"web_id": 12345}, status=200)
+
+        campaign = client._get_campaign("campaign123")
+
+        assert campaign["web_id"] == 12345
+        assert client.stats.retries == 1
+
+    @responses.activate
+    def test_client_does_not_retry_failed_post(self, sleeps):
+        """Test a 500 on campaign creation is not resent."""
+        client = MailchimpClient(
+            api_key="test-key-us5",
+            list_id="list",
+            governor=RequestGovernor(backoff_base=0.01, sleep=sleeps.append),
+        )
+        responses.post("https://us5.api.mailchimp.com/3.0/campaigns", status=500)
+
+        with pytest.raises(MailchimpAPIError, match="Error creating campaign: 500"):
+            client.create_campaign(subject="S", preview_text="P", title="T")
+
+        assert len(responses.calls) == 1
@@ -0,0 +1,113 @@
+"""Tests for the member write journal."""
+
+import json
+
+import pytest
+
+from newsletter_uploader.journal import JournalSummary, WriteJournal
+
+UPDATES = [
+    {"id": "a", "email": "a@example.com", "country": "United Kingdom"},
+    {"id": "b", "email": "b@example.com", "country": "United Kingdom"},
+    {"id": "c", "email": "c@example.com", "country": "United States of America"},
+]
+
+
+@pytest.fixture
+def path(tmp_path):
+    """Journal file path."""
+    return tmp_path / "job.journal"
+
+
+class TestWriteJournal:
+    """Test WriteJournal class."""
+
+    def test_resume_skips_succeeded(self, path):
+        """Test only unacknowledged and failed operations are pending."""
+        with WriteJournal(path) as journal:
+            journal.begin(UPDATES)
+            journal.record("a", True)
+            journal.record("b", False, "Invalid Resource")
+
+        journal = WriteJournal(path)
+        summary = journal.load()
+
+        assert summary == JournalSummary(planned=3, succeeded=1, failed=1)
+        assert summary.pending == 2
+        assert journal.pending() == UPDATES[1:]
+        assert journal.failures() == {"b": "Invalid Resource"}
+
+    def test_retry_success_clears_failure(self, path):
+        """Test a later success replaces an earlier failure."""
+        with WriteJournal(path) as journal:
+            journal.begin(UPDATES)
+            journal.record("b", False, "timeout")
+
+        with WriteJournal(path) as journal:
+            journal.load()
+            journal.record("b", True)
+
+        journal = WriteJournal(path)
+        assert journal.load().failed == 0
+        assert [item["id"] for item in journal.pending()] == ["a", "c"]
+
+    def test_outcomes_written_immediately(self, path):
+        """Test outcomes reach the file before the journal is closed."""
+        journal = WriteJournal(path)
+        journal.begin(UPDATES)
+        journal.record("a", True)
+
+        last = path.read_text().splitlines()[-1]
+        assert json.loads(last) == {"key": "a", "ok": True}
+        journal.close()
+
+    def test_torn_line_is_skipped(self, path):
+        """Test a partially written last line does not break resuming."""
+        with WriteJournal(path) as journal:
+            journal.begin(UPDATES)
+            journal.record("a", True)
+        with open(path, "a") as f:
+            f.write('{"key": "b", "o')
+
+        with WriteJournal(path) as journal:
+            assert journal.load().succeeded == 1
+            journal.record("b", True)
+
+        journal = WriteJournal(path)
+        assert journal.load().succeeded == 2
+        assert journal.pending() == [UPDATES[2]]
+
+    def test_begin_replaces_previous_job(self, path):
+        """Test starting a job discards the previous journal."""
+        with WriteJournal(path) as journal:
+            journal.begin(UPDATES)
+            journal.record("a", True)
+            journal.begin(UPDATES[:1])
+
+        journal = WriteJournal(path)
+        assert journal.load() == JournalSummary(planned=1, succeeded=0, failed=0)
+
+    def test_custom_key(self, path):
+        """Test operations can be identified by another field."""
+        with WriteJournal(path, key="email") as journal:
+            journal.begin(UPDATES)
+            journal.record("a@example.com", True)
+
+        journal = WriteJournal(path)
+        journal.load()
+        assert journal.key == "email"
+        assert len(journal.pending()) == 2
+
+    def test_unsupported_version(self, path):
+        """Test journals in an unknown format are rejected."""
+        path.write_text(json.dumps({"version": 99}) + "\n")
+
+        with pytest.raises(ValueError, match="Unsupported journal version"):
+            WriteJournal(path).load()
+
+    def test_exists(self, path):
+        """Test exists reflects whether a journal was written."""
+        journal = WriteJournal(path)
+        assert not journal.exists()
+        journal.begin([])
+        assert journal.exists()
@@ -0,0 +1,84 @@
+"""Tests for incremental JSON array decoding."""
+
+import json
+
+import pytest
+
+from newsletter_uploader.jsonstream import iter_array
+
+DOCUMENT = {
+    "members": [
+        {"id": "a", "email_address": "a@example.com", "tags": [{"name": "Policy"}]},
+        {"id": "b", "email_address": "b@example.com", "location": {"lat": 51.5}},
+        {"id": "c", "email_address": "ü@example.com"},
+    ],
+    "list_id": "abc",
+    "total_items": 12345,
+}
+
+
+def chunked(data, size):
+    """Split bytes or text into chunks of at most size."""
+    return [data[i : i + size] for i in range(0, len(data), size)]
+
+
+class TestIterArray:
+    """Test iter_array function."""
+
+    @pytest.mark.parametrize("size", [1, 2, 7, 64, 10_000])
+    def test_any_chunking(self, size):
+        """Test items decode the same however the bytes are split."""
+        data = json.dumps(DOCUMENT, ensure_ascii=False).encode("utf-8")
+
+        items = list(iter_array(chunked(data, size), "members"))
+
+        assert items == DOCUMENT["members"]
+
+    def test_text_chunks(self):
+        """Test text chunks are accepted as well as bytes."""
+        text = json.dumps(DOCUMENT, indent=2)
+
+        assert list(iter_array(chunked(text, 5), "members")) == DOCUMENT["members"]
+
+    def test_array_after_other_keys(self):
+        """Test keys before the array, including split numbers, are skipped."""
+        document = {"total_items": 1234567, "_links": [{"rel": "self"}], "members": [1]}
+        data = json.dumps(document).encode()
+
+        assert list(iter_array(chunked(data, 3), "members")) == [1]
+
+    def test_yields_before_document_complete(self):
+        """Test items are yielded before later chunks are read."""
+        data = json.dumps(DOCUMENT).encode()
+        chunks = iter(chunked(data, 16))
+
+        items = iter_array(chunks, "members")
+        assert next(items)["id"] == "a"
+
+        assert len(list(chunks)) > 0
+
+    def test_empty_array(self):
+        """Test an empty array yields nothing."""
+        assert list(iter_array([b'{"members": [], "total_items": 0}'], "members")) == []
+
+    def test_missing_key(self):
+        """Test a document without the key yields nothing."""
+        assert list(iter_array([b'{"total_items": 0}'], "members")) == []
+        assert list(iter_array([b"{}"], "members")) == []
+
+    def test_truncated_document(self):
+        """Test a document cut off mid-item is an error."""
+        data = json.dumps(DOCUMENT).encode()[:60]
+
+        with pytest.raises(ValueError):
+            list(iter_array(chunked(data, 8), "members"))
+
+    def test_not_an_array(self):
+        """Test a key holding something other than an array is an error."""
+        with pytest.raises(ValueError, match="Expected one of"):
+            list(iter_array([b'{"members": {}}'], "members"))
+
+    def test_not_an_object(self):
+        """Test a document that is not an object is an error."""
+        with pytest.raises(ValueError, match="Expected one of"):
+            list(iter_array([b"[1, 2]"], "members"))
@@ -1,15 +1,23 @@
 """Tests for Mailchimp client."""
 
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
 import pytest
+import requests
 import responses
 
-from newsletter_uploader.mailchimp_client import MailchimpClient
-
+from newsletter_uploader.mailchimp_client import (
+    MEMBER_FIELDS,
+    MailchimpAPIError,
+    MailchimpClient,
+    member_fields_param,
+    subscriber_hash,
+)
 
-@pytest.fixture
-def client():
-    """Create a Mailchimp client for testing."""
-    return MailchimpClient(api_key="test-key-us5", list_id="test-list-id")
+MAILCHIMP_URL = "https://us5.api.mailchimp.com"
 
 
 class TestMailchimpClient:
@@ -124,3 +132,408 @@ class TestMailchimpClient:
                 title="Campaign",
                 segment_opts=None,
             )
+
+
+class TestConnectionPool:
+    """Test the pooled session shared by client requests."""
+
+    def test_session_configured_once(self, client):
+        """Test auth and pool size are set on the shared session."""
+        adapter = client.session.get_adapter("https://us5.api.mailchimp.com")
+        assert client.session.auth == ("anystring", "test-key-us5")
+        assert adapter._pool_maxsize == 10
+        assert adapter._pool_block is True
+
+    def test_custom_pool_size(self):
+        """Test pool size is configurable."""
+        client = MailchimpClient(api_key="key-us5", list_id="list", pool_size=3)
+        adapter = client.session.get_adapter("https://us5.api.mailchimp.com")
+        assert adapter._pool_maxsize == 3
+
+    def test_keep_alive_disabled(self):
+        """Test connections are closed after each request when disabled."""
+        client = MailchimpClient(api_key="key-us5", list_id="list", keep_alive=False)
+        assert client.session.headers["Connection"] == "close"
+
+    @responses.activate
+    def test_requests_share_session(self, client, mocker):
+        """Test all operations go through the pooled session."""
+        responses.patch(
+            "https://us5.api.mailchimp.com/3.0/campaigns/campaign123",
+            json={"id": "campaign123", "web_id": 12345},
+            status=200,
+        )
+        responses.get(
+            "https://us5.api.mailchimp.com/3.0/campaigns/campaign123",
+            json={"id": "campaign123", "web_id": 12345},
+            status=200,
+        )
+        spy = mocker.spy(client.session, "request")
+
+        client.update_campaign("campaign123", subject="New Subject")
+        campaign = client._get_campaign("campaign123")
+
+        assert campaign["web_id"] == 12345
+        assert spy.call_count == 2
+        assert b"New Subject" in responses.calls[0].request.body
+        assert responses.calls[1].request.headers["Authorization"].startswith("Basic")
+
+    def test_context_manager_closes_session(self, mocker):
+        """Test leaving the context closes pooled connections."""
+        with MailchimpClient(api_key="key-us5", list_id="list") as client:
+            close = mocker.spy(client.session, "close")
+        close.assert_called_once()
+
+
+class TestMembers:
+    """Test list member operations."""
+
+    def test_subscriber_hash(self):
+        """Test subscriber hash is the MD5 of the lowercased email."""
+        assert subscriber_hash("Test@Example.com") == subscriber_hash(
+            "test@example.com"
+        )
+        assert subscriber_hash("test@example.com") == (
+            "55502f40dc8b7c769880b10874abc9d0"
+        )
+
+    @responses.activate
+    def test_list_members(self, client):
+        """Test fetching a page of members."""
+        responses.get(
+            "https://us5.api.mailchimp.com/3.0/lists/test-list-id/members",
+            json={"members": [{"email_address": "a@example.com"}]},
+            status=200,
+        )
+
+        page = client.list_members(count=10, offset=20)
+
+        assert page["members"][0]["email_address"] == "a@example.com"
+        assert "count=10" in responses.calls[0].request.url
+        assert "offset=20" in responses.calls[0].request.url
+
+    @responses.activate
+    def test_update_member_by_email(self, client):
+        """Test members can be addressed by email address."""
+        member_hash = subscriber_hash("a@example.com")
+        responses.patch(
+            f"https://us5.api.mailchimp.com/3.0/lists/test-list-id/members/{member_hash}",
+            json={"merge_fields": {"COUNTRY": "United Kingdom"}},
+            status=200,
+        )
+
+        member = client.update_member(
+            "a@example.com", {"merge_fields": {"COUNTRY": "United Kingdom"}}
+        )
+
+        assert member["merge_fields"]["COUNTRY"] == "United Kingdom"
+        assert b"United Kingdom" in responses.calls[0].request.body
+
+    @responses.activate
+    def test_update_member_tags(self, client):
+        """Test tags are added and removed in one request."""
+        responses.post(
+            "https://us5.api.mailchimp.com/3.0/lists/test-list-id/members/abc/tags",
+            status=204,
+        )
+
+        client.update_member_tags("abc", add=["DC"], remove=["UK"])
+
+        assert json.loads(responses.calls[0].request.body) == {
+            "tags": [
+                {"name": "DC", "status": "active"},
+                {"name": "UK", "status": "inactive"},
+            ]
+        }
+
+    @responses.activate
+    def test_update_member_tags_error(self, client):
+        """Test tag update failures raise MailchimpAPIError."""
+        responses.post(
+            "https://us5.api.mailchimp.com/3.0/lists/test-list-id/members/abc/tags",
+            json={"detail": "Not found"},
+            status=404,
+        )
+
+        with pytest.raises(MailchimpAPIError, match="updating member tags: 404"):
+            client.update_member_tags("abc", add=["DC"])
+
+
+class TestIterMembers:
+    """Test streaming member iteration."""
+
+    MEMBERS_URL = "https://us5.api.mailchimp.com/3.0/lists/test-list-id/members"
+
+    def add_pages(self, *sizes):
+        """Register one members response per page size."""
+        start = 0
+        for size in sizes:
+            responses.get(
+                self.MEMBERS_URL,
+                json={
+                    "members": [
+                        {"email_address": f"user{i}@example.com"}
+                        for i in range(start, start + size)
+                    ]
+                },
+                status=200,
+            )
+            start += size
+
+    @responses.activate
+    def test_yields_members_across_pages(self, client):
+        """Test members from every page are yielded in order."""
+        self.add_pages(2, 2, 1)
+
+        emails = [m["email_address"] for m in client.iter_members(page_size=2)]
+
+        assert emails == [f"user{i}@example.com" for i in range(5)]
+        offsets = [call.request.params["offset"] for call in responses.calls]
+        assert offsets == ["0", "2", "4"]
+
+    @responses.activate
+    def test_stops_on_empty_page(self, client):
+        """Test an empty page after a full one ends iteration."""
+        self.add_pages(2, 0)
+
+        assert len(list(client.iter_members(page_size=2))) == 2
+        assert len(responses.calls) == 2
+
+    @responses.activate
+    def test_prefetches_next_page(self, client):
+        """Test the next page is requested before the current one is consumed."""
+        self.add_pages(2, 1)
+        pages = client.iter_member_pages(page_size=2)
+
+        first = next(pages)
+        # Wait for the background fetch of the second page
+        for _ in range(100):
+            if len(responses.calls) == 2:
+                break
+            time.sleep(0.01)
+
+        assert len(first) == 2
+        assert len(responses.calls) == 2
+        assert len(next(pages)) == 1
+
+    @responses.activate
+    def test_without_prefetch(self, client):
+        """Test pages are fetched on demand when prefetch is disabled."""
+        self.add_pages(2, 1)
+        pages = client.iter_member_pages(page_size=2, prefetch=False)
+
+        next(pages)
+        assert len(responses.calls) == 1
+        assert len(next(pages)) == 1
+        assert len(responses.calls) == 2
+
+
+class TestStreamMembers:
+    """Test incrementally decoded member pages."""
+
+    MEMBERS_URL = "https://us5.api.mailchimp.com/3.0/lists/test-list-id/members"
+
+    def add_pages(self, *sizes):
+        """Register one members response per page size."""
+        start = 0
+        for size in sizes:
+            responses.get(
+                self.MEMBERS_URL,
+                json={
+                    "members": [
+                        {"email_address": f"user{i}@example.com"}
+                        for i in range(start, start + size)
+                    ],
+                    "total_items": sum(sizes),
+                },
+                status=200,
+            )
+            start += size
+
+    @responses.activate
+    def test_stream_members(self, client):
+        """Test one page is decoded member by member with the given filters."""
+        self.add_pages(2)
+
+        members = list(client.stream_members(count=2, status="subscribed"))
+
+        assert [m["email_address"] for m in members] == [
+            "user0@example.com",
+            "user1@example.com",
+        ]
+        params = responses.calls[0].request.params
+        assert params["count"] == "2"
+        assert params["status"] == "subscribed"
+
+    def test_throttled_streams_release_connections(self):
+        """Test retried 429s on a streamed page do not exhaust the pool."""
+        throttled = []
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if len(throttled) < 3:
+                    throttled.append(self.path)
+                    body, status = b'{"detail": "Too many requests"}', 429
+                else:
+                    body, status = b'{"members": [{"email_address": "a@b.c"}]}', 200
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.send_header("Retry-After", "0")
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        client = MailchimpClient(
+            api_key="test-key-us5", list_id="test-list-id", pool_size=2, timeout=5
+        )
+        client.base_url = f"http://127.0.0.1:{server.server_port}/3.0"
+        client.session.mount("http://", client.session.get_adapter(MAILCHIMP_URL))
+        client.governor.backoff_base = 0
+        client.governor._sleep = lambda delay: None
+        members = []
+        # A leaked connection blocks the pool forever, so run off-thread
+        reader = threading.Thread(
+            target=lambda: members.extend(client.stream_members()), daemon=True
+        )
+        try:
+            reader.start()
+            reader.join(timeout=10)
+        finally:
+            server.shutdown()
+            server.server_close()
+
+        assert not reader.is_alive()
+        assert len(throttled) == 3
+        assert members == [{"email_address": "a@b.c"}]
+
+    @responses.activate
+    def test_stream_members_error(self, client):
+        """Test failed requests raise MailchimpAPIError."""
+        responses.get(self.MEMBERS_URL, json={"detail": "Not found"}, status=404)
+
+        with pytest.raises(MailchimpAPIError, match="Error listing members: 404"):
+            list(client.stream_members())
+
+    @responses.activate
+    def test_iter_members_streamed(self, client):
+        """Test streamed iteration yields every member in order."""
+        self.add_pages(2, 2, 1, 0)
+
+        members = list(client.iter_members(page_size=2, stream=True))
+
+        assert [m["email_address"] for m in members] == [
+            f"user{i}@example.com" for i in range(5)
+        ]
+        offsets = [call.request.params["offset"] for call in responses.calls]
+        # The page after the short one was requested speculatively
+        assert offsets == ["0", "2", "4", "6"]
+
+    @responses.activate
+    def test_iter_members_streamed_without_prefetch(self, client):
+        """Test only needed pages are requested when prefetch is disabled."""
+        self.add_pages(2, 1)
+
+        members = list(client.iter_members(page_size=2, prefetch=False, stream=True))
+
+        assert len(members) == 3
+        assert len(responses.calls) == 2
+
+    @responses.activate
+    def test_iter_members_streamed_ignores_failed_prefetch(self, client):
+        """Test a failed speculative request after the last page is ignored."""
+        self.add_pages(1)
+        responses.get(self.MEMBERS_URL, status=500)
+        client.governor.max_retries = 0
+
+        members = list(client.iter_members(page_size=2, stream=True))
+
+        assert len(members) == 1
+
+    @responses.activate
+    def test_iter_members_streamed_ignores_prefetch_connection_error(self, client):
+        """Test a prefetch that loses its connection is discarded quietly."""
+        self.add_pages(1)
+        responses.get(self.MEMBERS_URL, body=requests.ConnectionError("reset"))
+        client.governor.max_retries = 0
+
+        members = list(client.iter_members(page_size=2, stream=True))
+
+        assert len(members) == 1
+
+    @responses.activate
+    def test_stopping_early_discards_failed_prefetch(self, client):
+        """Test closing the iterator ignores a prefetch that failed."""
+        self.add_pages(2)
+        responses.get(self.MEMBERS_URL, body=requests.ConnectionError("reset"))
+        client.governor.max_retries = 0
+
+        members = client.iter_members(page_size=2, stream=True)
+        assert next(members)["email_address"] == "user0@example.com"
+        members.close()
+
+        assert len(responses.calls) == 2
+
+
+class TestMemberProjection:
+    """Test server-side filtering and field projection."""
+
+    MEMBERS_URL = "https://us5.api.mailchimp.com/3.0/lists/test-list-id/members"
+
+    def test_member_fields_param(self):
+        """Test member field paths are qualified with the members prefix."""
+        assert member_fields_param(["email_address", "merge_fields.COUNTRY"]) == (
+            "members.email_address,members.merge_fields.COUNTRY"
+        )
+        assert member_fields_param(["members._links"]) == "members._links"
+
+    @responses.activate
+    def test_list_members_sends_filters(self, client):
+        """Test status, fields and exclude_fields are sent as query params."""
+        responses.get(self.MEMBERS_URL, json={"members": []}, status=200)
+
+        client.list_members(
+            status="subscribed",
+            fields=["email_address", "status"],
+            exclude_fields=["_links"],
+        )
+
+        params = responses.calls[0].request.params
+        assert params["status"] == "subscribed"
+        assert params["fields"] == "members.email_address,members.status"
+        assert params["exclude_fields"] == "members._links"
+
+    @responses.activate
+    def test_list_members_omits_unset_filters(self, client):
+        """Test no filter params are sent by default."""
+        responses.get(self.MEMBERS_URL, json={"members": []}, status=200)
+
+        client.list_members()
+
+        params = responses.calls[0].request.params
+        assert "status" not in params
+        assert "fields" not in params
+        assert "exclude_fields" not in params
+
+    @responses.activate
+    def test_iter_members_applies_filters_to_every_page(self, client):
+        """Test filters are repeated on each page request."""
+        responses.get(
+            self.MEMBERS_URL,
+            json={"members": [{"email_address": "a@example.com"}]},
+            status=200,
+        )
+        responses.get(self.MEMBERS_URL, json={"members": []}, status=200)
+
+        members = list(
+            client.iter_members(page_size=1, status="subscribed", fields=MEMBER_FIELDS)
+        )
+
+        assert len(members) == 1
+        for call in responses.calls:
+            assert call.request.params["status"] == "subscribed"
+            assert "members.merge_fields.COUNTRY" in call.request.params["fields"]
@@ -0,0 +1,204 @@
+"""Tests for manifest-driven multi-edition uploads."""
+
+import json
+import threading
+
+import pytest
+
+from newsletter_uploader.audience import AudienceType
+from newsletter_uploader.manifest import (
+    ManifestEntry,
+    load_manifest,
+    upload_entry,
+    upload_manifest,
+)
+from newsletter_uploader.uploader import CampaignContentError
+
+UK_EDITION = {
+    "file": "2026-01-20-uk.html",
+    "audience": "uk",
+    "subject": "UK update",
+    "preview": "Latest UK analysis",
+}
+US_EDITION = {
+    "file": "2026-01-20-us.html",
+    "campaign_id": "abc123",
+    "subject": "US update",
+    "preview": "Latest US analysis",
+    "title": "US edition",
+}
+
+
+def write_manifest(tmp_path, editions, name="manifest.json"):
+    """Write a JSON manifest listing editions."""
+    path = tmp_path / name
+    path.write_text(json.dumps({"editions": editions}))
+    return path
+
+
+@pytest.fixture
+def mock_uploader(mocker):
+    """Create a mock uploader."""
+    uploader = mocker.MagicMock()
+    uploader.upload.return_value = {"campaign_id": "new123", "web_id": 1}
+    uploader.update.return_value = {
+        "campaign_id": "abc123",
+        "web_id": 2,
+        "content_uploaded": False,
+    }
+    return uploader
+
+
+class TestLoadManifest:
+    """Test reading manifests."""
+
+    def test_json_manifest(self, tmp_path):
+        """Test entries are read in order with files relative to the manifest."""
+        entries = load_manifest(write_manifest(tmp_path, [UK_EDITION, US_EDITION]))
+
+        assert entries == [
+            ManifestEntry(
+                html_file=tmp_path / "2026-01-20-uk.html",
+                subject="UK update",
+                preview="Latest UK analysis",
+                audience=AudienceType.UK,
+            ),
+            ManifestEntry(
+                html_file=tmp_path / "2026-01-20-us.html",
+                subject="US update",
+                preview="Latest US analysis",
+                title="US edition",
+                campaign_id="abc123",
+            ),
+        ]
+
+    def test_yaml_manifest(self, tmp_path):
+        """Test YAML manifests are read with PyYAML."""
+        pytest.importorskip("yaml")
+        path = tmp_path / "manifest.yaml"
+        path.write_text(
+            "editions:\n"
+            "  - file: 2026-01-20-uk.html\n"
+            "    audience: UK\n"
+            "    subject: UK update\n"
+            "    preview: Latest UK analysis\n"
+        )
+
+        entries = load_manifest(path)
+
+        assert len(entries) == 1
+        assert entries[0].audience == AudienceType.UK
+
+    def test_missing_keys(self, tmp_path):
+        """Test editions must give a file, subject and preview."""
+        path = write_manifest(tmp_path, [{"file": "a.html", "audience": "uk"}])
+        with pytest.raises(ValueError, match="Edition 1: missing subject, preview"):
+            load_manifest(path)
+
+    def test_unknown_keys(self, tmp_path):
+        """Test misspelled keys are rejected."""
+        path = write_manifest(tmp_path, [{**UK_EDITION, "subjet": "Typo"}])
+        with pytest.raises(ValueError, match="unknown keys subjet"):
+            load_manifest(path)
+
+    def test_audience_required_for_new_campaigns(self, tmp_path):
+        """Test editions without a campaign ID need an audience."""
+        edition = {key: value for key, value in UK_EDITION.items() if key != "audience"}
+        path = write_manifest(tmp_path, [US_EDITION, edition])
+        with pytest.raises(ValueError, match="Edition 2: audience is required"):
+            load_manifest(path)
+
+    def test_unknown_audience(self, tmp_path):
+        """Test audiences must be uk, us or all."""
+        path = write_manifest(tmp_path, [{**UK_EDITION, "audience": "eu"}])
+        with pytest.raises(ValueError, match="unknown audience 'eu'"):
+            load_manifest(path)
+
+    def test_empty_manifest(self, tmp_path):
+        """Test a manifest must list at least one edition."""
+        with pytest.raises(ValueError, match="editions list"):
+            load_manifest(write_manifest(tmp_path, []))
+
+    def test_duplicate_campaigns(self, tmp_path):
+        """Test one campaign cannot be updated twice."""
+        path = write_manifest(tmp_path, [US_EDITION, US_EDITION])
+        with pytest.raises(ValueError, match="more than once: abc123"):
+            load_manifest(path)
+
+
+class TestUploadManifest:
+    """Test uploading manifest entries."""
+
+    def test_create_and_update(self, tmp_path, mock_uploader):
+        """Test entries create or update campaigns as listed."""
+        entries = load_manifest(write_manifest(tmp_path, [UK_EDITION, US_EDITION]))
+
+        results = upload_manifest(mock_uploader, entries, force=True)
+
+        assert [result.action for result in results] == ["create", "update"]
+        assert [result.campaign_id for result in results] == ["new123", "abc123"]
+        assert [result.web_id for result in results] == [1, 2]
+        assert all(result.ok for result in results)
+        assert results[1].content_uploaded is False
+        mock_uploader.upload.assert_called_once_with(
+            html_file=tmp_path / "2026-01-20-uk.html",
+            audience=AudienceType.UK,
+            subject="UK update",
+            preview_text="Latest UK analysis",
+            title=None,
+        )
+        assert mock_uploader.update.call_args[1]["force"] is True
+
+    def test_entries_uploaded_concurrently(self, tmp_path, mock_uploader):
+        """Test editions are in flight at the same time."""
+        both_started = threading.Barrier(2, timeout=5)
+        mock_uploader.upload.side_effect = lambda **kwargs: (
+            both_started.wait(),
+            {"campaign_id": "new123", "web_id": 1},
+        )[1]
+        mock_uploader.update.side_effect = lambda **kwargs: (
+            both_started.wait(),
+            {"campaign_id": "abc123", "web_id": 2},
+        )[1]
+        entries = load_manifest(write_manifest(tmp_path, [UK_EDITION, US_EDITION]))
+
+        results = upload_manifest(mock_uploader, entries)
+
+        assert all(result.ok for result in results)
+
+    def test_partial_failure(self, tmp_path, mock_uploader):
+        """Test a failed edition does not stop the others."""
+        mock_uploader.upload.side_effect = FileNotFoundError("HTML file not found")
+        entries = load_manifest(write_manifest(tmp_path, [UK_EDITION, US_EDITION]))
+
+        results = upload_manifest(mock_uploader, entries)
+
+        assert not results[0].ok
+        assert results[0].error == "HTML file not found"
+        assert results[0].campaign_id is None
+        assert results[1].ok
+        mock_uploader.update.assert_called_once()
+
+    def test_failed_content_reports_created_campaign(self, tmp_path, mock_uploader):
+        """Test a campaign created before its content failed is reported."""
+        mock_uploader.upload.side_effect = CampaignContentError(
+            "new123", 1, Exception("Upload Error")
+        )
+        entry = load_manifest(write_manifest(tmp_path, [UK_EDITION]))[0]
+
+        result = upload_entry(mock_uploader, entry)
+
+        assert not result.ok
+        assert result.campaign_id == "new123"
+        assert result.web_id == 1
+        assert "new123 was created" in result.error
+
+    def test_failed_update_keeps_campaign_id(self, tmp_path, mock_uploader):
+        """Test a failed update still reports which campaign it was for."""
+        mock_uploader.update.side_effect = Exception("API Error")
+        entry = load_manifest(write_manifest(tmp_path, [US_EDITION]))[0]
+
+        result = upload_entry(mock_uploader, entry)
+
+        assert result.error == "API Error"
+        assert result.campaign_id == "abc123"
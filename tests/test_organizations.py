@@ -0,0 +1,207 @@
+"""Tests for the organization registry."""
+
+import json
+import os
+
+import pytest
+
+from newsletter_uploader import organizations
+from newsletter_uploader.countries import UNITED_KINGDOM, UNITED_STATES
+from newsletter_uploader.organizations import (
+    Organization,
+    OrganizationRegistry,
+    load_organizations,
+)
+
+CONFIG = {
+    "organizations": [
+        {"domain": "senate.gov", "name": "U.S. Senate", "country": "us", "dc": True},
+        {"domain": "finance.senate.gov", "name": "Senate Finance Committee"},
+        {"domain": "ippr.org", "name": "IPPR", "country": "uk"},
+    ]
+}
+
+
+@pytest.fixture
+def registry():
+    """Registry compiled from the sample config."""
+    return OrganizationRegistry.from_config(CONFIG)
+
+
+@pytest.fixture
+def config_path(tmp_path):
+    """Write the sample config to a file."""
+    path = tmp_path / "organizations.json"
+    path.write_text(json.dumps(CONFIG))
+    return path
+
+
+@pytest.fixture(autouse=True)
+def clear_loaded():
+    """Forget registries loaded by other tests."""
+    organizations._LOADED.clear()
+    yield
+    organizations._LOADED.clear()
+
+
+class TestOrganizationRegistry:
+    """Test OrganizationRegistry class."""
+
+    def test_from_config(self, registry):
+        """Test entries are parsed with countries and DC flags."""
+        assert list(registry) == [
+            Organization("senate.gov", "U.S. Senate", UNITED_STATES, True),
+            Organization("finance.senate.gov", "Senate Finance Committee", None, False),
+            Organization("ippr.org", "IPPR", UNITED_KINGDOM, False),
+        ]
+
+    def test_subdomains_match_organization(self, registry):
+        """Test unlisted subdomains match their parent organization."""
+        assert registry.lookup("warren.senate.gov").name == "U.S. Senate"
+        assert registry.lookup("senate.gov").name == "U.S. Senate"
+
+    def test_most_specific_wins(self, registry):
+        """Test a listed subdomain wins over its parent."""
+        assert registry.lookup("finance.senate.gov").name == "Senate Finance Committee"
+        assert registry.lookup("staff.finance.senate.gov").dc is False
+
+    def test_unknown_domain(self, registry):
+        """Test unregistered and lookalike domains do not match."""
+        assert registry.lookup("gmail.com") is None
+        assert registry.lookup("notsenate.gov") is None
+
+    def test_country_rules(self, registry):
+        """Test only organizations with a country produce rules."""
+        assert list(registry.country_rules()) == [
+            ("senate.gov", UNITED_STATES, "US org: senate.gov"),
+            ("ippr.org", UNITED_KINGDOM, "UK org: ippr.org"),
+        ]
+
+    def test_unknown_country(self):
+        """Test an unknown country is rejected."""
+        config = {"organizations": [{"domain": "a.fr", "name": "A", "country": "fr"}]}
+        with pytest.raises(ValueError, match="Unknown country for a.fr"):
+            OrganizationRegistry.from_config(config)
+
+    def test_duplicate_domain(self):
+        """Test a domain cannot be registered twice."""
+        config = {"organizations": [{"domain": "a.org", "name": "A"}] * 2}
+        with pytest.raises(ValueError, match="Duplicate organization domain"):
+            OrganizationRegistry.from_config(config)
+
+
+class TestLoadOrganizations:
+    """Test load_organizations function."""
+
+    def test_loaded_once_per_process(self, config_path, tmp_path, mocker):
+        """Test an unchanged file is not compiled again."""
+        spy = mocker.spy(OrganizationRegistry, "from_config")
+
+        first = load_organizations(config_path, cache_dir=tmp_path)
+        second = load_organizations(config_path, cache_dir=tmp_path)
+
+        assert first is second
+        assert spy.call_count == 1
+
+    def test_compiled_registry_reused_between_runs(self, config_path, tmp_path, mocker):
+        """Test later runs load the compiled registry."""
+        load_organizations(config_path, cache_dir=tmp_path)
+        organizations._LOADED.clear()
+        spy = mocker.spy(OrganizationRegistry, "from_config")
+
+        registry = load_organizations(config_path, cache_dir=tmp_path)
+
+        assert spy.call_count == 0
+        assert registry.lookup("warren.senate.gov").name == "U.S. Senate"
+
+    def test_touched_file_not_recompiled(self, config_path, tmp_path, mocker):
+        """Test a new modification time with the same contents is reused."""
+        first = load_organizations(config_path, cache_dir=tmp_path)
+        organizations._LOADED.clear()
+        stat = config_path.stat()
+        os.utime(config_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+        spy = mocker.spy(OrganizationRegistry, "from_config")
+
+        registry = load_organizations(config_path, cache_dir=tmp_path)
+
+        assert spy.call_count == 0
+        assert registry.fingerprint == first.fingerprint
+
+    def test_edited_file_recompiled(self, config_path, tmp_path):
+        """Test editing the file produces a new registry."""
+        first = load_organizations(config_path, cache_dir=tmp_path)
+        config_path.write_text(
+            json.dumps({"organizations": CONFIG["organizations"][:1]})
+        )
+        stat = config_path.stat()
+        os.utime(config_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+        registry = load_organizations(config_path, cache_dir=tmp_path)
+
+        assert len(registry) == 1
+        assert registry.fingerprint != first.fingerprint
+
+    def test_artifact_from_other_code_rebuilt(self, config_path, tmp_path, mocker):
+        """Test a registry pickled by other package code is not unpickled."""
+        load_organizations(config_path, cache_dir=tmp_path)
+        organizations._LOADED.clear()
+        mocker.patch.object(organizations, "_code_fingerprint", return_value="new")
+        spy = mocker.spy(OrganizationRegistry, "from_config")
+        unpickle = mocker.spy(organizations.pickle, "load")
+
+        registry = load_organizations(config_path, cache_dir=tmp_path)
+
+        assert spy.call_count == 1
+        unpickle.assert_not_called()
+        assert len(registry) == 3
+
+    def test_corrupt_artifact_rebuilt(self, config_path, tmp_path):
+        """Test an unreadable compiled registry is rebuilt."""
+        load_organizations(config_path, cache_dir=tmp_path)
+        organizations._LOADED.clear()
+        for artifact in tmp_path.glob("organizations-*.pickle"):
+            artifact.write_bytes(b"not a pickle")
+
+        assert len(load_organizations(config_path, cache_dir=tmp_path)) == 3
+
+    def test_repository_config(self):
+        """Test the shipped registry compiles."""
+        path = os.path.join(
+            os.path.dirname(__file__), "..", "config", "organizations.json"
+        )
+        with open(path) as f:
+            registry = OrganizationRegistry.from_config(json.load(f))
+
+        assert registry.lookup("mail.house.gov").name == "U.S. House of Representatives"
+        assert registry.lookup("warren.senate.gov").dc is True
+
+    def test_repository_country_rules(self):
+        """Test only the organizations that always set COUNTRY have a country."""
+        path = os.path.join(
+            os.path.dirname(__file__), "..", "config", "organizations.json"
+        )
+        with open(path) as f:
+            registry = OrganizationRegistry.from_config(json.load(f))
+
+        rules = {domain: country for domain, country, _ in registry.country_rules()}
+        assert rules == {
+            **dict.fromkeys(
+                ["capuk.org", "resolutionfoundation.org", "ippr.org"], UNITED_KINGDOM
+            ),
+            **dict.fromkeys(
+                [
+                    "arnoldventures.org",
+                    "pritzkerfoundation.org",
+                    "brookings.edu",
+                    "urban.org",
+                    "cbpp.org",
+                    "crfb.org",
+                    "nber.org",
+                    "cato.org",
+                    "heritage.org",
+                    "aei.org",
+                ],
+                UNITED_STATES,
+            ),
+        }
+        assert registry.lookup("americanprogress.org").country is None
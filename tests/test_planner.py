@@ -0,0 +1,224 @@
+"""Tests for the merge field planner."""
+
+import asyncio
+import json
+
+import pytest
+import responses
+
+from newsletter_uploader.async_client import AsyncMailchimpClient
+from newsletter_uploader.planner import (
+    MemberChange,
+    Plan,
+    apply_changes,
+    apply_changes_async,
+    build_plan,
+    change_operations,
+    csv_source,
+    domain_rule_source,
+    location_country_source,
+    plan_changes,
+)
+
+COUNTRY_NAMES = {"GB": "United Kingdom", "US": "United States of America"}
+
+
+def uk_domains(email, tags):
+    """Rule assigning UK to .uk domains."""
+    if email.endswith(".uk"):
+        return "United Kingdom", "UK domain"
+    return None, "Unknown"
+
+
+class TestPlanChanges:
+    """Test plan_changes function."""
+
+    def test_only_differences_are_planned(self, member):
+        """Test members already in the desired state produce no change."""
+        members = [
+            member("a@gov.uk"),
+            member("b@gov.uk", country="United Kingdom"),
+            member("c@gmail.com"),
+        ]
+
+        changes = plan_changes(members, [domain_rule_source(uk_domains)])
+
+        assert changes == [
+            MemberChange(
+                id="a",
+                email="a@gov.uk",
+                merge_fields={"COUNTRY": "United Kingdom"},
+                previous={"COUNTRY": ""},
+                reason="UK domain",
+            )
+        ]
+
+    def test_existing_values_kept_by_default(self, member):
+        """Test fields that already have a value are left alone."""
+        members = [member("a@gov.uk", country="France")]
+
+        assert plan_changes(members, [domain_rule_source(uk_domains)]) == []
+
+    def test_overwrite(self, member):
+        """Test overwrite replaces differing values but skips equal ones."""
+        members = [
+            member("a@gov.uk", country="France"),
+            member("b@gov.uk", country=" United Kingdom "),
+        ]
+
+        changes = plan_changes(
+            members, [domain_rule_source(uk_domains)], overwrite=True
+        )
+
+        assert [change.id for change in changes] == ["a"]
+        assert changes[0].previous == {"COUNTRY": "France"}
+
+    def test_first_source_wins(self, member):
+        """Test higher-priority sources take precedence per field."""
+        members = [
+            member("a@gov.uk", country_code="US"),
+            member("b@gmail.com", country_code="US"),
+        ]
+        sources = [
+            domain_rule_source(uk_domains),
+            location_country_source(COUNTRY_NAMES),
+        ]
+
+        changes = plan_changes(members, sources)
+
+        assert [change.merge_fields["COUNTRY"] for change in changes] == [
+            "United Kingdom",
+            "United States of America",
+        ]
+        assert [change.reason for change in changes] == ["UK domain", "Location: US"]
+
+    def test_rule_runs_once_per_domain_and_tags(self, mocker, member):
+        """Test domain rules are memoized by domain and tags."""
+        rule = mocker.Mock(return_value=("United Kingdom", "UK domain"))
+        members = [
+            member("a@gov.uk"),
+            member("b@gov.uk"),
+            member("c@gov.uk", tags=["UK"]),
+        ]
+
+        plan_changes(members, [domain_rule_source(rule)])
+
+        assert rule.call_count == 2
+
+
+class TestSources:
+    """Test desired-state sources."""
+
+    def test_location_source_ignores_unknown_codes(self, member):
+        """Test members without a mapped country code are skipped."""
+        source = location_country_source(COUNTRY_NAMES)
+
+        assert source(member("a@x.com", country_code="GB")) == (
+            {"COUNTRY": "United Kingdom"},
+            "Location: GB",
+        )
+        assert source(member("b@x.com", country_code="FR")) is None
+        assert source(member("c@x.com")) is None
+
+    def test_csv_source(self, tmp_path, member):
+        """Test CSV values are matched by email, case-insensitively."""
+        csv_path = tmp_path / "countries.csv"
+        csv_path.write_text("email,country\nA@Example.com,Canada\nb@example.com,\n")
+        source = csv_source(csv_path, {"country": "COUNTRY"})
+
+        assert source(member("a@example.com")) == (
+            {"COUNTRY": "Canada"},
+            "CSV: countries.csv",
+        )
+        assert source(member("b@example.com")) is None
+
+
+class TestPlan:
+    """Test Plan files."""
+
+    def test_save_and_load(self, tmp_path, member):
+        """Test a plan survives a round trip through its file."""
+        plan = build_plan(
+            "test-list-id", [member("a@gov.uk")], [domain_rule_source(uk_domains)]
+        )
+
+        plan.save(tmp_path / "plan.json")
+        loaded = Plan.load(tmp_path / "plan.json")
+
+        assert loaded == plan
+        assert json.loads((tmp_path / "plan.json").read_text())["version"] == 1
+
+    def test_unsupported_version(self, tmp_path):
+        """Test plans in an unknown format are rejected."""
+        (tmp_path / "plan.json").write_text(json.dumps({"version": 99}))
+
+        with pytest.raises(ValueError, match="Unsupported plan version"):
+            Plan.load(tmp_path / "plan.json")
+
+    def test_counts(self, member):
+        """Test changes are counted by the value written."""
+        members = [member("a@gov.uk"), member("b@gov.uk"), member("c@x.com")]
+        sources = [
+            domain_rule_source(uk_domains),
+            location_country_source({"": "Unknown"}),
+        ]
+
+        plan = build_plan("test-list-id", members, sources)
+
+        assert plan.counts("COUNTRY") == {"United Kingdom": 2, "Unknown": 1}
+
+
+class TestApply:
+    """Test applying planned changes."""
+
+    CHANGE = MemberChange(
+        id="abc",
+        email="a@gov.uk",
+        merge_fields={"COUNTRY": "United Kingdom"},
+        previous={"COUNTRY": ""},
+        reason="UK domain",
+    )
+
+    def test_change_operations(self):
+        """Test changes become PATCH batch operations."""
+        (operation,) = change_operations("test-list-id", [self.CHANGE])
+
+        assert operation.method == "PATCH"
+        assert operation.path == "/lists/test-list-id/members/abc"
+        assert operation.operation_id == "abc"
+        assert operation.body == {"merge_fields": {"COUNTRY": "United Kingdom"}}
+
+    @responses.activate
+    def test_apply_changes(self, client):
+        """Test changes are sent as member PATCH requests."""
+        responses.patch(
+            "https://us5.api.mailchimp.com/3.0/lists/test-list-id/members/abc",
+            json={"id": "abc"},
+            status=200,
+        )
+
+        (result,) = apply_changes(client, [self.CHANGE])
+
+        assert result.ok
+        assert json.loads(responses.calls[0].request.body) == self.CHANGE.body
+
+    @responses.activate
+    def test_apply_changes_async(self, client):
+        """Test changes are sent as PATCH coroutines, failures included."""
+        url = "https://us5.api.mailchimp.com/3.0/lists/test-list-id/members"
+        responses.patch(f"{url}/abc", json={"id": "abc"}, status=200)
+        responses.patch(f"{url}/def", json={"detail": "Invalid"}, status=400)
+        failing = MemberChange("def", "d@example.com", {"COUNTRY": "X"}, {}, "test")
+        completed = []
+
+        async def run():
+            async with AsyncMailchimpClient("", "", client=client) as async_client:
+                return await apply_changes_async(
+                    async_client, [self.CHANGE, failing], on_result=completed.append
+                )
+
+        results = asyncio.run(run())
+
+        assert [result.ok for result in results] == [True, False]
+        assert [result.item for result in results] == [self.CHANGE, failing]
+        assert len(completed) == 2
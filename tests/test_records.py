@@ -0,0 +1,84 @@
+"""Tests for compact member records."""
+
+from newsletter_uploader.records import MemberRecord, iter_records
+
+MEMBER = {
+    "id": "abc123",
+    "email_address": "Jane@Urban.org",
+    "status": "subscribed",
+    "merge_fields": {"FNAME": "Jane", "LNAME": "Doe", "COUNTRY": ""},
+    "location": {
+        "region": "DC",
+        "city": "Washington",
+        "zip": "20001",
+        "country_code": "US",
+        "latitude": 38.9,
+    },
+    "tags": [{"id": 1, "name": "Policy"}],
+    "timestamp_opt": "2024-01-01T00:00:00+00:00",
+    "stats": {"avg_open_rate": 0.5},
+    "_links": [{"rel": "self"}],
+}
+
+
+class TestMemberRecord:
+    """Test MemberRecord class."""
+
+    def test_from_member(self):
+        """Test the fields the scripts use are kept."""
+        record = MemberRecord.from_member(MEMBER)
+
+        assert record.id == "abc123"
+        assert record.email == "Jane@Urban.org"
+        assert record.domain == "urban.org"
+        assert record.name == "Jane Doe"
+        assert record.region == "DC"
+        assert record.country_code == "US"
+        assert record.tags == ("Policy",)
+
+    def test_missing_fields(self):
+        """Test members without merge fields or location get empty values."""
+        record = MemberRecord.from_member({"email_address": "a@b.org"})
+
+        assert record.name == ""
+        assert record.country == ""
+        assert record.tags == ()
+
+    def test_no_instance_dict(self):
+        """Test records use slots rather than a per-instance dict."""
+        record = MemberRecord.from_member(MEMBER)
+
+        assert not hasattr(record, "__dict__")
+
+    def test_repeated_values_shared(self):
+        """Test low-cardinality strings are interned across records."""
+        first = MemberRecord.from_member(MEMBER)
+        other = dict(MEMBER, location={"region": "".join(["D", "C"])})
+        second = MemberRecord.from_member(other)
+
+        assert first.region is second.region
+        assert first.domain is second.domain
+
+    def test_to_member_round_trip(self):
+        """Test records convert back to the members endpoint's shape."""
+        record = MemberRecord.from_member(MEMBER)
+
+        member = record.to_member()
+
+        assert member["email_address"] == "Jane@Urban.org"
+        assert member["merge_fields"]["FNAME"] == "Jane"
+        assert member["tags"] == [{"name": "Policy"}]
+        assert MemberRecord.from_member(member) == record
+
+
+class TestIterRecords:
+    """Test iter_records function."""
+
+    def test_converted_lazily(self):
+        """Test members are converted as they are consumed, in order."""
+        members = iter([MEMBER, dict(MEMBER, id="def456")])
+
+        records = iter_records(members)
+
+        assert next(records).id == "abc123"
+        assert [record.id for record in records] == ["def456"]
@@ -0,0 +1,220 @@
+"""Tests for single-pass subscriber reports."""
+
+import csv
+import gzip
+from datetime import date
+
+import pytest
+
+from newsletter_uploader.classification import DomainClassifier
+from newsletter_uploader.countries import UNITED_KINGDOM, CountryClassifier
+from newsletter_uploader.organizations import OrganizationRegistry
+from newsletter_uploader.reports import (
+    CountryAssignmentReport,
+    DCSubscribersReport,
+    DMVReport,
+    OrganizationReport,
+    Report,
+    ReportEngine,
+)
+from newsletter_uploader.snapshot import MemberSnapshot, write_snapshot
+
+ORGANIZATIONS = {
+    "organizations": [
+        {"domain": "urban.org", "name": "Urban Institute", "country": "us", "dc": True}
+    ]
+}
+
+
+@pytest.fixture
+def snapshot(tmp_path, member):
+    """Snapshot of members across DC, the DMV and elsewhere."""
+    members = [
+        member("a@urban.org", region="DC", city="City"),
+        member("b@urban.org", region="CA", country_code="US"),
+        member("c@urban.org"),
+        member("d@gmail.com", region="VA", country_code="US"),
+        member("e@gov.uk", country="United Kingdom"),
+        member("f@ox.ac.uk"),
+        member("g@urban.org", region="DC", country_code="US", status="unsubscribed"),
+    ]
+    write_snapshot(members, tmp_path / "snapshot")
+    with MemberSnapshot(tmp_path / "snapshot") as snapshot:
+        yield snapshot
+
+
+@pytest.fixture
+def classifier():
+    """Classifier with one DC organization."""
+    registry = OrganizationRegistry.from_config(ORGANIZATIONS)
+    countries = CountryClassifier({}, registry.country_rules())
+    return DomainClassifier(countries, registry)
+
+
+class CountingReport(Report):
+    """Report that records every member it visits."""
+
+    name = "counting"
+    fieldnames = ("email",)
+
+    def visit(self, member):
+        """Record the member's email."""
+        self.emit({"email": member.email})
+
+
+class TestReportEngine:
+    """Test ReportEngine class."""
+
+    def test_single_pass(self, snapshot, classifier, mocker):
+        """Test members are materialized once for all reports."""
+        spy = mocker.spy(snapshot, "member_records")
+        reports = [
+            DCSubscribersReport(),
+            OrganizationReport(classifier),
+            DMVReport(classifier),
+            CountingReport(),
+        ]
+
+        ReportEngine(reports).run(snapshot)
+
+        assert spy.call_count == 1
+        assert [len(report.rows) for report in reports] == [1, 3, 3, 6]
+
+    def test_reports_only_visit_selected_rows(self, snapshot):
+        """Test each report only sees the rows it selected."""
+        report = DCSubscribersReport()
+
+        ReportEngine([report, CountingReport()]).run(snapshot)
+
+        assert [row["email"] for row in report.rows] == ["a@urban.org"]
+
+    def test_write_csvs(self, snapshot, tmp_path):
+        """Test reports with rows are written to dated CSV files."""
+        engine = ReportEngine([CountingReport(), DCSubscribersReport()])
+        engine.run(snapshot)
+        engine.reports[1].rows.clear()
+
+        written = engine.write_csvs(tmp_path, day=date(2025, 1, 2))
+
+        assert [path.name for _, path in written] == ["counting_2025-01-02.csv"]
+        with open(written[0][1], newline="") as f:
+            assert len(list(csv.DictReader(f))) == 6
+
+    def test_export_csvs_streams_rows(self, snapshot, classifier, tmp_path):
+        """Test rows go straight to sorted files instead of being kept."""
+        reports = [DMVReport(classifier), DCSubscribersReport()]
+        engine = ReportEngine(reports)
+
+        written = engine.export_csvs(
+            snapshot, tmp_path, day=date(2025, 1, 2), buffer_rows=1
+        )
+
+        assert [path.name for _, path in written] == [
+            "dmv_subscribers_2025-01-02.csv",
+            "dc_subscribers_2025-01-02.csv",
+        ]
+        assert all(not report.rows for report in reports)
+        with open(written[0][1], newline="") as f:
+            exported = list(csv.DictReader(f))
+        assert [row["email"] for row in exported] == [
+            "d@gmail.com",
+            "c@urban.org",
+            "a@urban.org",
+        ]
+        assert reports[0].count == 3
+        assert "  Total unique: 3" in reports[0].summary()
+
+    def test_streamed_sample_is_sorted(self, snapshot, classifier, tmp_path):
+        """Test streamed reports keep the first rows in sort order."""
+        report = DMVReport(classifier)
+        report.sample_rows = 2
+
+        ReportEngine([report]).export_csvs(snapshot, tmp_path)
+
+        assert [row["email"] for row in report.sample] == [
+            "d@gmail.com",
+            "c@urban.org",
+        ]
+        sample = report.summary()[report.summary().index("\nSample DMV subscribers:") :]
+        assert "d@gmail.com" in sample[1]
+        assert "c@urban.org" in sample[2]
+
+    def test_streamed_organizations_listed(self, snapshot, classifier, tmp_path):
+        """Test streamed organization reports still list subscribers."""
+        report = OrganizationReport(classifier)
+        report.sample_rows = 2
+
+        ReportEngine([report]).export_csvs(snapshot, tmp_path)
+        summary = report.summary()
+
+        assert "\nUrban Institute (urban.org):" in summary
+        assert sum("@urban.org" in line for line in summary) == 2
+        assert "\n  ... and 1 more in the CSV" in summary
+
+    def test_export_csvs_removes_empty_files(self, snapshot, tmp_path):
+        """Test reports without rows leave no file behind."""
+        report = DCSubscribersReport()
+        report.select = lambda snapshot: []
+
+        written = ReportEngine([report]).export_csvs(snapshot, tmp_path)
+
+        assert written == []
+        assert list(tmp_path.glob("*.csv")) == []
+
+    def test_export_csvs_gzip(self, snapshot, tmp_path):
+        """Test files are compressed and named accordingly."""
+        written = ReportEngine([CountingReport()]).export_csvs(
+            snapshot, tmp_path, day=date(2025, 1, 2), compression="gzip"
+        )
+
+        ((_, path),) = written
+        assert path.name == "counting_2025-01-02.csv.gz"
+        with gzip.open(path, "rt", newline="") as f:
+            assert len(list(csv.DictReader(f))) == 6
+
+
+class TestReports:
+    """Test the built-in reports."""
+
+    def test_dc_subscribers(self, snapshot):
+        """Test DC subscribers are listed with their location."""
+        report = DCSubscribersReport()
+        ReportEngine([report]).run(snapshot)
+
+        assert report.rows[0]["name"] == "First Last"
+        assert report.rows[0]["city"] == "City"
+        assert report.summary()[0] == "Found 1 DC-based subscribers"
+
+    def test_organizations(self, snapshot, classifier):
+        """Test subscribers are grouped under their organization."""
+        report = OrganizationReport(classifier)
+        ReportEngine([report]).run(snapshot)
+
+        assert report.counts() == {"Urban Institute": 3}
+        assert {row["org_domain"] for row in report.rows} == {"urban.org"}
+
+    def test_dmv(self, snapshot, classifier):
+        """Test location and organization reasons, excluding other states."""
+        report = DMVReport(classifier)
+        ReportEngine([report]).run(snapshot)
+
+        reasons = {row["email"]: row["dmv_reason"] for row in report.rows}
+        assert reasons == {
+            "a@urban.org": "Located in DC | Works at Urban Institute",
+            "c@urban.org": "Works at Urban Institute",
+            "d@gmail.com": "Located in VA",
+        }
+
+    def test_country_assignments(self, snapshot, classifier):
+        """Test members without a country get a planned country."""
+        report = CountryAssignmentReport(classifier)
+        ReportEngine([report]).run(snapshot)
+
+        countries = {row["email"]: row["country"] for row in report.rows}
+        assert countries["f@ox.ac.uk"] == UNITED_KINGDOM
+        assert "e@gov.uk" not in countries
+        assert report.unassigned == 1
+
+        plan = report.plan("test-list-id")
+        assert plan.list_id == "test-list-id"
+        assert len(plan.changes) == len(report.rows)
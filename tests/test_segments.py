@@ -0,0 +1,129 @@
+"""Tests for offline segment evaluation."""
+
+import pytest
+
+from newsletter_uploader.audience import AudienceType, get_segment_opts
+from newsletter_uploader.segments import Segment, compile_segment, count_recipients
+from newsletter_uploader.snapshot import MemberSnapshot, write_snapshot
+
+
+@pytest.fixture
+def snapshot(tmp_path, member):
+    """Snapshot of UK, US and unlabelled members."""
+    members = [
+        member("a@gov.uk", country="United Kingdom"),
+        member("b@urban.org", country="United States of America"),
+        member("c@gmail.com", first_name="Max"),
+        member("d@ox.ac.uk", country="United Kingdom", status="unsubscribed"),
+        member("e@senate.gov", country="United States of America", first_name="Max"),
+    ]
+    write_snapshot(members, tmp_path / "snapshot")
+    with MemberSnapshot(tmp_path / "snapshot") as snapshot:
+        yield snapshot
+
+
+def select_merge(field, op, value):
+    """Build a SelectMerge condition."""
+    return {"condition_type": "SelectMerge", "field": field, "op": op, "value": value}
+
+
+class TestSegment:
+    """Test compiling and evaluating segment conditions."""
+
+    def test_uk_audience(self, snapshot):
+        """Test the UK segment selects members with COUNTRY United Kingdom."""
+        segment = compile_segment(get_segment_opts(AudienceType.UK))
+        assert segment.select(snapshot) == [0, 3]
+
+    def test_us_audience_includes_missing_country(self, snapshot):
+        """Test the US segment selects everyone not in the UK."""
+        segment = compile_segment(get_segment_opts(AudienceType.US))
+        assert segment.select(snapshot) == [1, 2, 4]
+
+    def test_all_audience(self, snapshot):
+        """Test no segment options select every member."""
+        assert compile_segment(None).count(snapshot) == 5
+
+    def test_extra_conditions(self, snapshot):
+        """Test extra column conditions narrow the segment."""
+        segment = compile_segment(get_segment_opts(AudienceType.UK))
+        assert segment.select(snapshot, status="subscribed") == [0]
+
+    def test_match_all(self, snapshot):
+        """Test match all requires every condition."""
+        segment = compile_segment(
+            {
+                "match": "all",
+                "conditions": [
+                    select_merge("COUNTRY", "not", "United Kingdom"),
+                    select_merge("FNAME", "is", "Max"),
+                ],
+            }
+        )
+        assert segment.select(snapshot) == [2, 4]
+
+    def test_match_any(self, snapshot):
+        """Test match any accepts members meeting one condition."""
+        segment = compile_segment(
+            {
+                "match": "any",
+                "conditions": [
+                    select_merge("COUNTRY", "is", "United Kingdom"),
+                    select_merge("FNAME", "is", "Max"),
+                ],
+            }
+        )
+        assert segment.select(snapshot) == [0, 2, 3, 4]
+
+    def test_match_any_same_field(self, snapshot):
+        """Test conditions on one field are combined per the match type."""
+        segment = compile_segment(
+            {
+                "match": "any",
+                "conditions": [
+                    select_merge("COUNTRY", "is", "United Kingdom"),
+                    select_merge("COUNTRY", "is", "United States of America"),
+                ],
+            }
+        )
+        assert segment.select(snapshot) == [0, 1, 3, 4]
+
+    def test_unsupported_condition_type(self):
+        """Test unsupported condition types are rejected."""
+        with pytest.raises(ValueError, match="condition type"):
+            compile_segment(
+                {"match": "all", "conditions": [{"condition_type": "Interests"}]}
+            )
+
+    def test_unsupported_op(self):
+        """Test unsupported SelectMerge ops are rejected."""
+        with pytest.raises(ValueError, match="op"):
+            compile_segment(
+                {"conditions": [select_merge("COUNTRY", "contains", "United")]}
+            )
+
+    def test_unknown_field(self):
+        """Test merge fields missing from the snapshot are rejected."""
+        with pytest.raises(ValueError, match="ADDRESS"):
+            compile_segment({"conditions": [select_merge("ADDRESS", "is", "x")]})
+
+    def test_unsupported_match(self):
+        """Test match types other than all and any are rejected."""
+        with pytest.raises(ValueError, match="match"):
+            Segment([], match="none")
+
+
+class TestCountRecipients:
+    """Test counting recipients per audience."""
+
+    def test_counts_subscribed_members(self, snapshot):
+        """Test counts per audience only include subscribed members."""
+        assert count_recipients(snapshot) == {
+            AudienceType.UK: 1,
+            AudienceType.US: 3,
+            AudienceType.ALL: 4,
+        }
+
+    def test_selected_audiences(self, snapshot):
+        """Test counting only some audiences."""
+        assert count_recipients(snapshot, [AudienceType.UK]) == {AudienceType.UK: 1}
@@ -0,0 +1,214 @@
+"""Tests for columnar member snapshots."""
+
+import json
+from datetime import timedelta
+
+import pytest
+
+from newsletter_uploader.records import MemberRecord
+from newsletter_uploader.snapshot import (
+    HEADER_FILE,
+    MemberSnapshot,
+    flatten_member,
+    load_snapshot,
+    tag_names,
+    write_snapshot,
+)
+
+
+@pytest.fixture
+def members(member):
+    """Sample members spanning regions, statuses and domains."""
+    return [
+        member("a@urban.org", region="DC"),
+        member("b@urban.org", region="CA", country="United States of America"),
+        member("c@gov.uk", country="United Kingdom", tags=["Policy", "UK"]),
+        member("d@urban.org", status="unsubscribed", region="DC"),
+        member("e@gmail.com", region="VA"),
+    ]
+
+
+@pytest.fixture
+def snapshot(members, tmp_path):
+    """Write and open a snapshot of the sample members."""
+    write_snapshot(members, tmp_path / "snapshot")
+    with MemberSnapshot.open(tmp_path / "snapshot") as snapshot:
+        yield snapshot
+
+
+class TestFlattenMember:
+    """Test flatten_member function."""
+
+    def test_flattens_nested_fields(self, member):
+        """Test merge fields, location and tags become column values."""
+        row = flatten_member(member("Jo@Example.ORG", region="DC", tags=["b", "a"]))
+
+        assert row[1] == "Jo@Example.ORG"
+        assert row[2] == "example.org"
+        assert row[6] == "DC"
+        assert tag_names(row[11]) == ["a", "b"]
+
+    def test_missing_fields_become_empty(self):
+        """Test absent or null fields are stored as empty strings."""
+        row = flatten_member({"email_address": "x@y.com", "merge_fields": None})
+
+        assert row[0] == ""
+        assert row[5] == ""
+        assert tag_names(row[11]) == []
+
+    def test_strips_separators(self):
+        """Test newlines cannot corrupt the values files."""
+        row = flatten_member(
+            {"email_address": "x@y.com", "merge_fields": {"FNAME": "A\nB"}}
+        )
+        assert row[3] == "A B"
+
+
+class TestMemberSnapshot:
+    """Test MemberSnapshot class."""
+
+    def test_row_count(self, snapshot):
+        """Test the snapshot records every member."""
+        assert len(snapshot) == 5
+
+    def test_select_exact_value(self, snapshot):
+        """Test selecting rows by an exact value."""
+        assert snapshot.select(status="unsubscribed") == [3]
+
+    def test_select_combines_conditions(self, snapshot):
+        """Test every condition must match."""
+        rows = snapshot.select(status="subscribed", region={"DC", "VA"})
+        assert rows == [0, 4]
+
+    def test_select_predicate(self, snapshot):
+        """Test predicates are applied to column values."""
+        rows = snapshot.select(domain=lambda domain: domain.endswith(".uk"))
+        assert rows == [2]
+
+    def test_select_without_conditions(self, snapshot):
+        """Test no conditions selects every row."""
+        assert snapshot.select() == [0, 1, 2, 3, 4]
+
+    def test_count(self, snapshot):
+        """Test counting matching rows."""
+        assert snapshot.count(domain="urban.org") == 3
+
+    def test_records(self, snapshot):
+        """Test rows are materialized with the requested columns."""
+        records = list(snapshot.records([2], ["email", "country", "tags"]))
+
+        assert records == [
+            {"email": "c@gov.uk", "country": "United Kingdom", "tags": "Policy\tUK"}
+        ]
+
+    def test_members(self, snapshot):
+        """Test rows are materialized in the members endpoint's shape."""
+        (member,) = snapshot.members([2])
+
+        assert member["id"] == "c"
+        assert member["email_address"] == "c@gov.uk"
+        assert member["merge_fields"]["COUNTRY"] == "United Kingdom"
+        assert member["location"]["country_code"] == ""
+        assert member["tags"] == [{"name": "Policy"}, {"name": "UK"}]
+
+    def test_member_records(self, snapshot, members):
+        """Test rows are materialized as records matching the source members."""
+        (record,) = snapshot.member_records([2])
+
+        assert record == MemberRecord.from_member(members[2])
+        assert record.tags == ("Policy", "UK")
+
+    def test_group_by(self, snapshot):
+        """Test rows are grouped by distinct column values."""
+        groups = snapshot.group_by(snapshot.select(status="subscribed"), "domain")
+
+        assert groups == {("urban.org",): [0, 1], ("gov.uk",): [2], ("gmail.com",): [4]}
+
+    def test_codes_are_memory_mapped(self, snapshot):
+        """Test code columns are views over the mapped files."""
+        codes = snapshot.columns["domain"].codes
+        assert isinstance(codes, memoryview)
+        assert codes.format == "I"
+        assert len(codes) == 5
+
+    def test_carriage_returns_round_trip(self, tmp_path):
+        """Test line breaks other than newline do not shift later values."""
+        members = [
+            {"email_address": "a@y.com", "merge_fields": {"FNAME": "A\rB"}},
+            {"email_address": "b@y.com", "merge_fields": {"FNAME": "Bob"}},
+            {"email_address": "c@y.com", "merge_fields": {"FNAME": "C\r\nD\u2028E"}},
+            {"email_address": "d@y.com", "merge_fields": {"FNAME": "Dee"}},
+        ]
+        write_snapshot(members, tmp_path / "snapshot")
+
+        with MemberSnapshot(tmp_path / "snapshot") as snapshot:
+            names = [row["fname"] for row in snapshot.records(range(4))]
+
+        assert names == ["A\rB", "Bob", "C\r D\u2028E", "Dee"]
+
+    def test_empty_snapshot(self, tmp_path):
+        """Test a snapshot with no members can be opened and queried."""
+        write_snapshot([], tmp_path / "empty")
+
+        with MemberSnapshot.open(tmp_path / "empty") as snapshot:
+            assert len(snapshot) == 0
+            assert snapshot.select(status="subscribed") == []
+
+    def test_rewrite_replaces_snapshot(self, members, tmp_path):
+        """Test writing to an existing path replaces the snapshot."""
+        write_snapshot(members, tmp_path / "snapshot")
+        write_snapshot(members[:1], tmp_path / "snapshot")
+
+        with MemberSnapshot.open(tmp_path / "snapshot") as snapshot:
+            assert len(snapshot) == 1
+
+
+class TestLoadSnapshot:
+    """Test load_snapshot function."""
+
+    def test_builds_missing_snapshot(self, members, tmp_path):
+        """Test a missing snapshot is built from the member source."""
+        with load_snapshot(lambda: members, tmp_path / "snapshot") as snapshot:
+            assert len(snapshot) == 5
+
+    def test_reuses_existing_snapshot(self, members, tmp_path):
+        """Test an existing snapshot is opened without fetching members."""
+        write_snapshot(members, tmp_path / "snapshot")
+
+        def fail():
+            raise AssertionError("members should not be fetched")
+
+        with load_snapshot(fail, tmp_path / "snapshot") as snapshot:
+            assert len(snapshot) == 5
+
+    def test_refuses_stale_snapshot(self, members, tmp_path):
+        """Test an existing snapshot older than max_age is rejected."""
+        write_snapshot(members, tmp_path / "snapshot")
+        header_path = tmp_path / "snapshot" / HEADER_FILE
+        header = json.loads(header_path.read_text())
+        header["created"] = "2020-01-01T00:00:00+00:00"
+        header_path.write_text(json.dumps(header))
+
+        with pytest.raises(ValueError, match="rebuild it"):
+            load_snapshot(lambda: members, tmp_path / "snapshot", timedelta(hours=1))
+
+        # Without a max age (e.g. for reports) the snapshot is still used
+        with load_snapshot(lambda: members, tmp_path / "snapshot") as snapshot:
+            assert snapshot.age > timedelta(days=365)
+
+    def test_accepts_fresh_snapshot(self, members, tmp_path):
+        """Test a snapshot within max_age is reused."""
+        write_snapshot(members, tmp_path / "snapshot")
+        with load_snapshot(
+            lambda: members, tmp_path / "snapshot", timedelta(hours=1)
+        ) as snapshot:
+            assert len(snapshot) == 5
+            assert snapshot.age < timedelta(hours=1)
+
+    def test_builds_temporary_snapshot(self, members):
+        """Test a snapshot is built in a temporary directory by default."""
+        with load_snapshot(lambda: members) as snapshot:
+            assert snapshot.count(status="subscribed") == 4
+            path = snapshot.path
+
+        assert not path.exists()
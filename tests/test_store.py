@@ -0,0 +1,150 @@
+"""Tests for the local member store."""
+
+import pytest
+import responses
+
+from newsletter_uploader.store import MemberStore, iter_list_members
+
+MEMBERS_URL = "https://us5.api.mailchimp.com/3.0/lists/test-list-id/members"
+
+
+@pytest.fixture
+def store(tmp_path):
+    """Create a member store in a temporary directory."""
+    with MemberStore(tmp_path / "members.sqlite", "test-list-id") as store:
+        yield store
+
+
+class TestMemberStore:
+    """Test MemberStore class."""
+
+    def test_uses_wal_mode(self, store):
+        """Test the database is opened in WAL mode."""
+        mode = store.connection.execute("PRAGMA journal_mode").fetchone()[0]
+        assert mode == "wal"
+
+    def test_rejects_other_list(self, store):
+        """Test a store cannot be reused for a different list."""
+        with pytest.raises(ValueError, match="mirrors list test-list-id"):
+            MemberStore(store.path, "other-list")
+
+    @responses.activate
+    def test_first_sync_is_full(self, store, client, member):
+        """Test the first sync loads every member and records a mark."""
+        responses.get(
+            MEMBERS_URL,
+            json={
+                "members": [
+                    member("a@example.com"),
+                    member("b@example.com", status="unsubscribed"),
+                ]
+            },
+            status=200,
+        )
+
+        result = store.sync(client)
+
+        assert result.full is True
+        assert result.fetched == 2
+        assert store.count() == 2
+        assert store.count(status="subscribed") == 1
+        assert store.high_water_mark is not None
+        assert "since_last_changed" not in responses.calls[0].request.params
+        assert "members.last_changed" in responses.calls[0].request.params["fields"]
+
+    @responses.activate
+    def test_second_sync_fetches_delta(self, store, client, member):
+        """Test later syncs only request changed members and upsert them."""
+        responses.get(
+            MEMBERS_URL,
+            json={"members": [member("a@example.com"), member("b@example.com")]},
+            status=200,
+        )
+        store.sync(client)
+        mark = store.high_water_mark
+
+        responses.replace(
+            responses.GET,
+            MEMBERS_URL,
+            json={"members": [member("a@example.com", country="United Kingdom")]},
+            status=200,
+        )
+        result = store.sync(client)
+
+        assert result.full is False
+        assert result.since == mark
+        assert responses.calls[1].request.params["since_last_changed"] == mark
+        members = {m["id"]: m for m in store.iter_members()}
+        assert len(members) == 2
+        assert members["a"]["merge_fields"]["COUNTRY"] == "United Kingdom"
+
+    @responses.activate
+    def test_full_sync_drops_deleted_members(self, store, client, member):
+        """Test a forced full sync removes members no longer in the list."""
+        responses.get(
+            MEMBERS_URL,
+            json={"members": [member("a@example.com"), member("b@example.com")]},
+            status=200,
+        )
+        store.sync(client)
+
+        responses.replace(
+            responses.GET,
+            MEMBERS_URL,
+            json={"members": [member("a@example.com")]},
+            status=200,
+        )
+        store.sync(client, full=True)
+
+        assert [m["id"] for m in store.iter_members()] == ["a"]
+
+    @responses.activate
+    def test_failed_sync_keeps_previous_state(self, store, client, member):
+        """Test an API error leaves members and the mark untouched."""
+        responses.get(
+            MEMBERS_URL, json={"members": [member("a@example.com")]}, status=200
+        )
+        store.sync(client)
+        mark = store.high_water_mark
+
+        responses.replace(responses.GET, MEMBERS_URL, status=404)
+        with pytest.raises(Exception, match="Error listing members"):
+            store.sync(client, full=True)
+
+        assert store.count() == 1
+        assert store.high_water_mark == mark
+
+
+class TestIterListMembers:
+    """Test iter_list_members function."""
+
+    @responses.activate
+    def test_streams_from_api_without_store(self, client, member):
+        """Test members come straight from the API when no store is given."""
+        responses.get(
+            MEMBERS_URL, json={"members": [member("a@example.com")]}, status=200
+        )
+
+        members = list(iter_list_members(client))
+
+        assert [m["id"] for m in members] == ["a"]
+        assert responses.calls[0].request.params["status"] == "subscribed"
+
+    @responses.activate
+    def test_reads_from_synced_store(self, client, tmp_path, member):
+        """Test members are synced into and read from the store."""
+        responses.get(
+            MEMBERS_URL,
+            json={
+                "members": [
+                    member("a@example.com"),
+                    member("b@example.com", status="cleaned"),
+                ]
+            },
+            status=200,
+        )
+
+        members = list(iter_list_members(client, tmp_path / "members.sqlite"))
+
+        assert [m["id"] for m in members] == ["a"]
+        assert "status" not in responses.calls[0].request.params
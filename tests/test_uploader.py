@@ -1,11 +1,17 @@
 """Tests for newsletter uploader."""
 
+import threading
 from pathlib import Path
 
 import pytest
 
 from newsletter_uploader.audience import AudienceType
-from newsletter_uploader.uploader import NewsletterUploader
+from newsletter_uploader.uploader import (
+    CampaignContentError,
+    NewsletterUploader,
+    content_hash,
+    open_campaign_cache,
+)
 
 
 @pytest.fixture
@@ -20,6 +26,14 @@ def uploader(mock_client):
     return NewsletterUploader(mock_client)
 
 
+@pytest.fixture
+def cached_uploader(mock_client, tmp_path):
+    """Create a newsletter uploader that remembers campaigns."""
+    mock_client._get_campaign.return_value = {"web_id": 12345}
+    mock_client.update_campaign.return_value = {"web_id": 12345}
+    return NewsletterUploader(mock_client, open_campaign_cache(tmp_path / "cache"))
+
+
 @pytest.fixture
 def html_file(tmp_path):
     """Create a temporary HTML file for testing."""
@@ -156,10 +170,197 @@ class TestNewsletterUploader:
         }
         mock_client.upload_content.side_effect = Exception("Upload Error")
 
-        with pytest.raises(Exception, match="Upload Error"):
+        with pytest.raises(CampaignContentError, match="Upload Error") as error:
             uploader.upload(
                 html_file=html_file,
                 audience=AudienceType.UK,
                 subject="Test",
                 preview_text="Preview",
             )
+
+        # The created draft is reported so it can be updated, not recreated
+        assert error.value.campaign_id == "campaign123"
+        assert error.value.web_id == 12345
+
+
+class TestContentCache:
+    """Test skipping unchanged content on update."""
+
+    def test_update_without_cache_always_uploads(
+        self, uploader, mock_client, html_file
+    ):
+        """Test updates re-send content when no cache is configured."""
+        mock_client._get_campaign.return_value = {"web_id": 12345}
+
+        uploader.update("campaign123", html_file)
+        result = uploader.update("campaign123", html_file)
+
+        assert mock_client.upload_content.call_count == 2
+        assert result["content_uploaded"] is True
+
+    def test_update_skips_unchanged_content(
+        self, cached_uploader, mock_client, html_file
+    ):
+        """Test a second update with the same HTML skips the content PUT."""
+        first = cached_uploader.update("campaign123", html_file, subject="One")
+        second = cached_uploader.update("campaign123", html_file, subject="Two")
+
+        mock_client.upload_content.assert_called_once()
+        assert first["content_uploaded"] is True
+        assert second["content_uploaded"] is False
+        assert second["web_id"] == 12345
+        assert mock_client.update_campaign.call_count == 2
+        mock_client._get_campaign.assert_not_called()
+
+    def test_update_uploads_changed_content(
+        self, cached_uploader, mock_client, html_file
+    ):
+        """Test edited HTML is uploaded again."""
+        cached_uploader.update("campaign123", html_file)
+        html_file.write_text("<html><body>Edited</body></html>")
+        result = cached_uploader.update("campaign123", html_file)
+
+        assert mock_client.upload_content.call_count == 2
+        assert result["content_uploaded"] is True
+
+    def test_update_force(self, cached_uploader, mock_client, html_file):
+        """Test force re-sends unchanged content."""
+        cached_uploader.update("campaign123", html_file)
+        result = cached_uploader.update("campaign123", html_file, force=True)
+
+        assert mock_client.upload_content.call_count == 2
+        assert result["content_uploaded"] is True
+
+    def test_cache_is_per_campaign(self, cached_uploader, mock_client, html_file):
+        """Test the same HTML is still uploaded to a different campaign."""
+        cached_uploader.update("campaign123", html_file)
+        cached_uploader.update("campaign456", html_file)
+
+        assert mock_client.upload_content.call_count == 2
+
+    def test_upload_records_content(self, cached_uploader, mock_client, html_file):
+        """Test updating a freshly created campaign skips identical HTML."""
+        mock_client.create_campaign.return_value = {
+            "id": "campaign123",
+            "web_id": 12345,
+        }
+        cached_uploader.upload(
+            html_file=html_file,
+            audience=AudienceType.UK,
+            subject="Test",
+            preview_text="Preview",
+        )
+        result = cached_uploader.update("campaign123", html_file)
+
+        mock_client.upload_content.assert_called_once()
+        assert result["content_uploaded"] is False
+
+    def test_cache_persists_between_runs(self, mock_client, html_file, tmp_path):
+        """Test uploaded hashes are saved for later runs."""
+        mock_client._get_campaign.return_value = {"web_id": 12345}
+        first = NewsletterUploader(mock_client, open_campaign_cache(tmp_path))
+        first.update("campaign123", html_file)
+
+        cache = open_campaign_cache(tmp_path)
+        assert cache.get("campaign123") == {
+            "web_id": 12345,
+            "content_hash": content_hash(html_file.read_text()),
+        }
+
+        second = NewsletterUploader(mock_client, cache)
+        assert second.update("campaign123", html_file)["content_uploaded"] is False
+
+    def test_failed_upload_is_not_recorded(
+        self, cached_uploader, mock_client, html_file
+    ):
+        """Test content is re-sent after a failed upload."""
+        mock_client.upload_content.side_effect = [Exception("Upload Error"), None]
+
+        with pytest.raises(Exception, match="Upload Error"):
+            cached_uploader.update("campaign123", html_file)
+        result = cached_uploader.update("campaign123", html_file)
+
+        assert result["content_uploaded"] is True
+
+
+class TestUpdateRoundTrips:
+    """Test the calls an update makes."""
+
+    def test_settings_and_content_sent_concurrently(
+        self, uploader, mock_client, html_file
+    ):
+        """Test the PATCH and PUT are in flight at the same time."""
+        both_started = threading.Barrier(2, timeout=5)
+        mock_client.update_campaign.side_effect = lambda **kwargs: (
+            both_started.wait(),
+            {"web_id": 12345},
+        )[1]
+        mock_client.upload_content.side_effect = lambda *args: both_started.wait()
+
+        result = uploader.update("campaign123", html_file, subject="New")
+
+        assert result["web_id"] == 12345
+        mock_client._get_campaign.assert_not_called()
+
+    def test_web_id_from_patch_response(self, uploader, mock_client, html_file):
+        """Test the web ID is read from the PATCH response."""
+        mock_client.update_campaign.return_value = {"web_id": 777}
+
+        result = uploader.update(
+            "campaign123", html_file, subject="New", from_name="PolicyEngine UK"
+        )
+
+        assert result["web_id"] == 777
+        assert mock_client.update_campaign.call_args[1]["from_name"] == (
+            "PolicyEngine UK"
+        )
+        mock_client._get_campaign.assert_not_called()
+
+    def test_content_only_update_fetches_web_id(self, uploader, mock_client, html_file):
+        """Test the campaign is fetched when nothing else returns the web ID."""
+        mock_client._get_campaign.return_value = {"web_id": 888}
+
+        result = uploader.update("campaign123", html_file)
+
+        assert result["web_id"] == 888
+        mock_client.update_campaign.assert_not_called()
+        mock_client.upload_content.assert_called_once()
+
+    def test_content_only_update_uses_cached_web_id(
+        self, cached_uploader, mock_client, html_file
+    ):
+        """Test a cached web ID saves the campaign lookup."""
+        cached_uploader.update("campaign123", html_file, subject="New")
+        html_file.write_text("<html><body>Edited</body></html>")
+        result = cached_uploader.update("campaign123", html_file)
+
+        assert result["web_id"] == 12345
+        mock_client._get_campaign.assert_not_called()
+        assert mock_client.upload_content.call_count == 2
+
+    def test_unchanged_update_makes_no_calls(
+        self, cached_uploader, mock_client, html_file
+    ):
+        """Test re-running an update with nothing new sends no requests."""
+        cached_uploader.update("campaign123", html_file)
+        mock_client.reset_mock()
+
+        result = cached_uploader.update("campaign123", html_file)
+
+        assert result == {
+            "campaign_id": "campaign123",
+            "web_id": 12345,
+            "content_uploaded": False,
+        }
+        assert mock_client.method_calls == []
+
+    def test_failure_raised_after_other_calls_finish(
+        self, uploader, mock_client, html_file
+    ):
+        """Test a failed PATCH is raised once the PUT has completed."""
+        mock_client.update_campaign.side_effect = Exception("Patch Error")
+
+        with pytest.raises(Exception, match="Patch Error"):
+            uploader.update("campaign123", html_file, subject="New")
+
+        mock_client.upload_content.assert_called_once()